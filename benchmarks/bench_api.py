@@ -0,0 +1,85 @@
+"""Measures the requests per second the HTTP API serves to concurrent clients.
+
+Starts the API server on a temporary SQLite save store. Each client thread
+keeps its own connection and plays its own life: it ages it up a year, reads
+its state and, every few years, its actions, starting a new life when one
+dies. Run with several client counts to see how the server scales.
+
+Run from the repository root with: python -m benchmarks.bench_api
+"""
+
+import argparse, http.client, json, os, socket, subprocess, sys, tempfile, threading, time
+
+
+class Client:
+    def __init__(self, port):
+        self.conn = http.client.HTTPConnection("127.0.0.1", port)
+        self.conn.connect()
+        # http.client sends the body after the headers, which Nagle's algorithm would delay
+        self.conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.requests = 0
+
+    def request(self, method, path, body=None):
+        data = None if body is None else json.dumps(body)
+        self.conn.request(method, path, body=data)
+        response = self.conn.getresponse()
+        result = json.loads(response.read())
+        self.requests += 1
+        if response.status >= 400:
+            raise RuntimeError(f"{method} {path}: {result['error']}")
+        return result
+
+    def play(self, until):
+        ID = None
+        while time.perf_counter() < until:
+            if ID is None:
+                ID = self.request("POST", "/lives", {})["ID"]
+            result = self.request("POST", f"/lives/{ID}/age_up", {"years": 1})
+            if not result["state"]["alive"]:
+                ID = None
+                continue
+            state = self.request("GET", f"/lives/{ID}")
+            if state["age"] % 5 == 0:
+                self.request("GET", f"/lives/{ID}/actions")
+
+
+def run(port, clients, duration):
+    clients = [Client(port) for _ in range(clients)]
+    until = time.perf_counter() + duration
+    threads = [threading.Thread(target=c.play, args=(until,)) for c in clients]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return sum(c.requests for c in clients) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-c", "--clients", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--duration", type=float, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as saves:
+        env = dict(os.environ, LIFESIM_SAVE_PATH=saves, LIFESIM_SAVE_BACKEND="sqlite")
+        server = subprocess.Popen(
+            [sys.executable, "-m", "src.engine.api", "--port", "0", "--lang", "en"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            env=env,
+            text=True,
+        )
+        try:
+            port = int(server.stdout.readline().rsplit(":", 1)[1])
+            for clients in args.clients:
+                rate = run(port, clients, args.duration)
+                print(f"{clients:4} clients: {rate:8.0f} requests/s")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
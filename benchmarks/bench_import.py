@@ -0,0 +1,69 @@
+"""Measures how long a fresh Python process takes to import the game, and fails if that is over budget.
+
+Each module is imported in its own interpreter with stdin closed, so an import
+that prompts fails instead of hanging. The time of starting an empty
+interpreter is subtracted. Importing must not load a translation catalog or a
+name list either; those are loaded on first use.
+
+Run from the repository root with: python -m benchmarks.bench_import
+"""
+
+import argparse, statistics, subprocess, sys, time
+
+MODULES = [
+    "src.lifesim_lib.lifesim_lib",
+    "src.people.classes.player",
+    "src.menus.main",
+    "src.menus.start",
+    "src.engine.headless",
+]
+
+CHECK = """
+import {module}
+from src.lifesim_lib import const, translation
+assert translation.catalog is None, "a translation catalog was loaded at import"
+assert const.load_names.cache_info().currsize == 0, "a name list was read at import"
+"""
+
+
+def time_process(code, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", code], stdin=subprocess.DEVNULL, check=True
+        )
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--runs", type=int, default=10)
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=100,
+        help="milliseconds each import may add to an empty interpreter's start",
+    )
+    args = parser.parse_args()
+    base = time_process("pass", args.runs)
+    print(f"{'empty interpreter':32}{base * 1000:8.1f} ms")
+    over = []
+    for module in MODULES:
+        try:
+            cost = time_process(CHECK.format(module=module), args.runs) - base
+        except subprocess.CalledProcessError:
+            print(f"{module:32}  failed")
+            over.append(module)
+            continue
+        print(f"{module:32}{cost * 1000:8.1f} ms")
+        if cost * 1000 > args.budget:
+            over.append(module)
+    if over:
+        print(f"Over the {args.budget:g} ms budget: {', '.join(over)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Measures how many bytes each character takes in memory.
+
+Run from the repository root with: python -m benchmarks.bench_memory
+"""
+
+import argparse, tracemalloc
+
+from src.lifesim_lib.const import *
+from src.lifesim_lib.lifesim_lib import Gender, RNG
+from src.people.classes.parent import Parent
+from src.people.classes.sibling import Sibling
+
+
+class DictCharacter:
+    "Same attributes as a character before slots were added, including the name string built in Person.__init__."
+
+    def __init__(self, character):
+        for key, value in character.get_state().items():
+            setattr(self, key, value)
+        self.name = self.firstname + " " + self.lastname
+
+
+def make_family(rng, count):
+    people = []
+    for i in range(count // 2):
+        people.append(Parent("Smith", 40, Gender.random(rng), rng))
+        people.append(Sibling("Smith", 10, Gender.random(rng), 50, 50, rng))
+    return people
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--count", type=int, default=100000)
+    args = parser.parse_args()
+    rng = RNG(1)
+    people, slotted = measure(lambda: make_family(rng, args.count))
+    legacy, with_dict = measure(lambda: [DictCharacter(p) for p in people])
+    print(f"characters: {len(people)}")
+    print(f"bytes per character (dict): {with_dict / len(people):.1f}")
+    print(f"bytes per character (slots): {slotted / len(people):.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Times the mortality table against the draws it replaced.
+
+The old and new checks are timed for one character at a time and, with
+NumPy, for whole arrays. tests/test_mortality.py checks that the table
+matches the old draws.
+
+Run from the repository root with: python -m benchmarks.bench_mortality
+"""
+
+import argparse, time
+
+from src.lifesim_lib import mortality
+from src.lifesim_lib.rng import RNG, get_numpy
+
+
+def sampled_death(age, health, rng):
+    "Person.death_check as it was before the mortality table."
+    return (age >= rng.randint(95, 122)) or (
+        age > rng.randint(70 + health // 12, 90 + health // 3)
+        and rng.randint(1, 100) <= 65
+    )
+
+
+def best_of(func, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    argparse.ArgumentParser(description=__doc__.splitlines()[0]).parse_args()
+    rng = RNG(2)
+    people = [(age, health) for age in range(0, 110) for health in (10, 50, 90)] * 30
+    n = len(people)
+    old = best_of(lambda: [sampled_death(a, h, rng) for a, h in people])
+    new = best_of(lambda: [mortality.dies(a, h, rng) for a, h in people])
+    print(f"old check:   {old / n * 1e9:8.0f} ns per character")
+    print(f"table check: {new / n * 1e9:8.0f} ns per character")
+    np = get_numpy()
+    if np is not None:
+        generator = np.random.default_rng(3)
+        ages = generator.integers(0, 110, 1000000, dtype=np.int16)
+        healths = generator.integers(0, 101, 1000000, dtype=np.int16)
+
+        def drawn():
+            lo = 70 + healths // 12
+            hi = 90 + healths // 3
+            old_age = ages >= generator.integers(95, 123, len(ages))
+            frail = ages > generator.integers(lo, hi + 1)
+            return old_age | (frail & (generator.integers(1, 101, len(ages)) <= 65))
+
+        old = best_of(drawn)
+        new = best_of(lambda: mortality.death_mask(ages, healths, generator))
+        print(f"old arrays:  {old * 1e3:8.1f} ms per million")
+        print(f"death_mask:  {new * 1e3:8.1f} ms per million")
+
+
+if __name__ == "__main__":
+    main()
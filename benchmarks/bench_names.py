@@ -0,0 +1,57 @@
+"""Compares loading and drawing names from the text files and from the precompiled corpus.
+
+Run from the repository root with: python -m benchmarks.bench_names
+"""
+
+import argparse, time
+
+from src.lifesim_lib import names
+from src.lifesim_lib.rng import RNG, get_numpy
+
+
+def parse_text():
+    "How the name lists were loaded before the corpus."
+    return {
+        kind: open(f"{names.ASSETS_PATH}/{kind}_names.txt").read().splitlines()
+        for kind in names.KINDS
+    }
+
+
+def best_of(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--draws", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"parse text files:   {best_of(parse_text, args.repeat) * 1e3:8.3f} ms")
+    print(
+        f"open corpus:        {best_of(names.open_corpus, args.repeat) * 1e3:8.3f} ms"
+    )
+
+    text = parse_text()["female"]
+    corpus = names.open_corpus()["female"]
+    rng = RNG(1)
+    n = args.draws
+    elapsed = best_of(lambda: [rng.choice(text) for _ in range(n)], 3)
+    print(f"rng.choice(list):   {n / elapsed / 1e6:8.2f} M names/s")
+    elapsed = best_of(lambda: [corpus.sample(rng) for _ in range(n)], 3)
+    print(f"NameList.sample:    {n / elapsed / 1e6:8.2f} M names/s")
+    np = get_numpy()
+    if np is not None:
+        generator = np.random.default_rng(1)
+        elapsed = best_of(lambda: corpus.sample_indices(n, generator), 3)
+        print(f"sample_indices:     {n / elapsed / 1e6:8.2f} M indices/s")
+
+
+if __name__ == "__main__":
+    main()
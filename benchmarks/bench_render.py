@@ -0,0 +1,107 @@
+"""Compares drawing the main menu with the clear command and with the frame renderer.
+
+Output goes to os.devnull, so this measures the cost on the game's side: the
+clear process, the writes and the bytes sent. Between frames one stat changes,
+as when the player does something in a menu.
+
+Run from the repository root with: python -m benchmarks.bench_render
+"""
+
+import argparse, io, os, sys, time
+
+from src.lifesim_lib import translation
+from src.lifesim_lib.rng import RNG
+from src.lifesim_lib.screen import Screen
+from src.menus.main import MAIN_MENU
+from src.people.classes.player import Player
+from src.lifesim_lib.lifesim_lib import display_data
+
+
+class CountingFile(io.RawIOBase):
+    "A raw file that counts its writes and bytes."
+
+    def __init__(self, f):
+        self.f = f
+        self.writes = 0
+        self.bytes = 0
+
+    def writable(self):
+        return True
+
+    def isatty(self):
+        return True  # Lets the renderer diff frames, as it does in a terminal
+
+    def write(self, b):
+        self.writes += 1
+        self.bytes += len(b)
+        return self.f.write(b)
+
+
+def draw_menu(player, i):
+    "Prints what main_menu prints, without asking."
+    player.happiness = i * 7 % 100
+    print()
+    display_data(translation._("Your name"), player.name)
+    display_data(translation._("Gender"), player.get_gender_str())
+    print(translation._("Money") + f": ${player.money:,}")
+    player.display_stats()
+    print()
+    for n, action in enumerate(MAIN_MENU.available(player)):
+        print(f"{n + 1}. {action.text()}")
+
+
+def clear_command():
+    "How the screen was cleared before the renderer."
+    os.system("cls" if sys.platform == "win32" else "clear")
+
+
+def run(frames, player, renderer):
+    counter = CountingFile(open(os.devnull, "wb", buffering=0))
+    # A terminal's stdout is line buffered
+    stream = io.TextIOWrapper(counter, line_buffering=True)
+    saved_stdout = sys.stdout
+    saved_fd = os.dup(1)
+    os.dup2(counter.f.fileno(), 1)  # Where the clear command writes
+    try:
+        if renderer:
+            sys.stdout = screen = Screen(stream)
+            start = time.perf_counter()
+            for i in range(frames):
+                screen.clear()
+                draw_menu(player, i)
+                screen.flush()  # What input() does
+        else:
+            sys.stdout = stream
+            start = time.perf_counter()
+            for i in range(frames):
+                clear_command()
+                draw_menu(player, i)
+                stream.flush()
+        elapsed = time.perf_counter() - start
+    finally:
+        sys.stdout = saved_stdout
+        os.dup2(saved_fd, 1)
+        os.close(saved_fd)
+    return frames / elapsed, counter.writes / frames, counter.bytes / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--frames", type=int, default=2000)
+    args = parser.parse_args()
+    os.environ.setdefault("TERM", "xterm")
+    os.environ["COLUMNS"], os.environ["LINES"] = "120", "50"
+    translation.set_language("en")
+    player = Player(rng=RNG(1))
+
+    print(f"{'':18}{'frames/s':>10}{'writes/frame':>14}{'bytes/frame':>13}")
+    for name, renderer, frames in [
+        ("clear command", False, max(1, args.frames // 20)),
+        ("frame renderer", True, args.frames),
+    ]:
+        rate, writes, size = run(frames, player, renderer)
+        print(f"{name:18}{rate:10.0f}{writes:14.1f}{size:13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Compares the binary save format with pickled saves: size and time to save and load.
+
+Loading a binary save includes building the Player from its data; loading a
+pickle only unpickles it, which already builds the objects.
+
+Run from the repository root with: python -m benchmarks.bench_save_format
+"""
+
+import argparse, pickle, time
+
+from src.lifesim_lib.const import *
+from src.lifesim_lib import save_format
+from src.lifesim_lib.frontend import HeadlessFrontend
+from src.lifesim_lib.lifesim_lib import PlayerDied
+from src.lifesim_lib.rng import RNG
+from src.engine.headless import new_random_life
+from src.people.classes.player import Player
+
+
+def make_players(count, age):
+    players = []
+    for i in range(count):
+        player = new_random_life(RNG(i))
+        player.frontend = HeadlessFrontend()
+        while player.age < age and player.alive:
+            try:
+                player.age_up()
+            except PlayerDied:
+                break
+        players.append(player)
+    return players
+
+
+def timed(func, items, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = [func(item) for item in items]
+    return result, (time.perf_counter() - start) / (repeat * len(items))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--count", type=int, default=200)
+    parser.add_argument("--age", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    players = make_players(args.count, args.age)
+
+    pickled, pickle_dump = timed(
+        lambda p: pickle.dumps(p.get_state()), players, args.repeat
+    )
+    _, pickle_load = timed(pickle.loads, pickled, args.repeat)
+    encoded, encode_time = timed(
+        lambda p: save_format.encode(p.to_data()), players, args.repeat
+    )
+    _, decode_time = timed(
+        lambda b: Player.load(save_format.decode(b)), encoded, args.repeat
+    )
+
+    print(f"saves: {len(players)}")
+    print(f"{'':10}{'bytes':>10}{'save us':>10}{'load us':>10}")
+    for label, saves, dump, load in (
+        ("pickle", pickled, pickle_dump, pickle_load),
+        ("binary", encoded, encode_time, decode_time),
+    ):
+        size = sum(map(len, saves)) / len(saves)
+        print(f"{label:10}{size:10.0f}{dump * 1e6:10.1f}{load * 1e6:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Load test for the TCP server: memory per idle session and response latency under many connections.
+
+Starts a server (or uses --connect HOST:PORT), opens the connections and lets
+them sit on their first screen to measure the server's memory per idle
+session (on Linux), then has every connection play, answering each screen
+after a random think time, and reports the latency from sending a line to
+the end of the next screen. A server started here saves to a temporary
+folder, in SQLite unless --backend says otherwise.
+
+Run from the repository root with: python -m benchmarks.bench_server
+"""
+
+import argparse, asyncio, os, random, statistics, subprocess, sys, tempfile, time
+
+from src.engine.server import GO_AHEAD, raise_file_limit
+
+
+def rss(pid):
+    "Resident memory of a process in bytes, or None if it can't be read."
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+
+
+def answer(screen, rng):
+    "Picks what to type on a screen: mostly the first option, which ages the life up."
+    if "Load Game" in screen:
+        return "2"  # Start a new life rather than all playing the same save
+    return "1" if rng.random() < 0.7 else str(rng.randint(1, 9))
+
+
+class Client:
+    def __init__(self, host, port, rng):
+        self.host = host
+        self.port = port
+        self.rng = rng
+        self.latencies = []
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.screen = await self.reader.readuntil(GO_AHEAD)
+
+    async def play(self, until, think):
+        while time.perf_counter() < until:
+            await asyncio.sleep(self.rng.uniform(0, 2 * think))
+            line = answer(self.screen.decode(errors="replace"), self.rng)
+            start = time.perf_counter()
+            self.writer.write(line.encode() + b"\n")
+            try:
+                self.screen = await self.reader.readuntil(GO_AHEAD)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                self.writer.close()
+                await self.connect()  # The session ended; start another
+                continue
+            self.latencies.append(time.perf_counter() - start)
+
+    def close(self):
+        self.writer.close()
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+async def run(args, host, port, pid):
+    rng = random.Random(args.seed)
+    warmup = Client(host, port, rng)
+    await warmup.connect()
+    await warmup.play(time.perf_counter() + 1, 0)
+    warmup.close()
+    await asyncio.sleep(0.5)
+    before = rss(pid)
+
+    clients = [Client(host, port, random.Random(rng.random())) for _ in range(args.n)]
+    start = time.perf_counter()
+    for i in range(0, args.n, 100):
+        await asyncio.gather(*(c.connect() for c in clients[i : i + 100]))
+    print(f"{args.n} connections open in {time.perf_counter() - start:.2f} s")
+    await asyncio.sleep(1)
+    after = rss(pid)
+    if before is not None and after is not None:
+        print(f"memory per idle session: {(after - before) / args.n / 1024:.0f} KiB")
+
+    until = time.perf_counter() + args.duration
+    await asyncio.gather(*(c.play(until, args.think) for c in clients))
+    latencies = [t for c in clients for t in c.latencies]
+    for c in clients:
+        c.close()
+    if not latencies:
+        print("no responses")
+        return
+    print(
+        f"{len(latencies)} responses, {len(latencies) / args.duration:.0f}/s; latency "
+        f"p50 {percentile(latencies, 50) * 1e3:.1f} ms, "
+        f"p99 {percentile(latencies, 99) * 1e3:.1f} ms, "
+        f"max {max(latencies) * 1e3:.1f} ms, mean {statistics.mean(latencies) * 1e3:.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=1000, help="number of connections")
+    parser.add_argument("--duration", type=float, default=20, help="seconds of play")
+    parser.add_argument(
+        "--think", type=float, default=1, help="mean seconds between answers"
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--backend", choices=["files", "sqlite"], default="sqlite")
+    parser.add_argument("--connect", metavar="HOST:PORT", help="use a running server")
+    args = parser.parse_args()
+    raise_file_limit()
+
+    if args.connect:
+        host, port = args.connect.rsplit(":", 1)
+        asyncio.run(run(args, host, int(port), None))
+        return
+    with tempfile.TemporaryDirectory() as saves:
+        env = dict(
+            os.environ, LIFESIM_SAVE_PATH=saves, LIFESIM_SAVE_BACKEND=args.backend
+        )
+        server = subprocess.Popen(
+            [sys.executable, "-m", "src.engine.server", "--port", "0", "--lang", "en"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            env=env,
+            text=True,
+        )
+        try:
+            host, port = server.stdout.readline().split()[-1].rsplit(":", 1)
+            asyncio.run(run(args, host, int(port), server.pid))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
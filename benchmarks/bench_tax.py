@@ -0,0 +1,95 @@
+"""Checks the tax engine against walking the brackets, and times both.
+
+Every whole salary up to twice the top bracket's bound, and a sample of
+fractional and larger ones, is taxed by walking the brackets as
+calculate_tax did before the engine, by TaxRegime.tax and, with NumPy, by
+TaxRegime.taxes; any difference fails the check (exit status 1). Then each
+is timed.
+
+Run from the repository root with: python -m benchmarks.bench_tax
+"""
+
+import argparse, random, sys, time
+
+from src.lifesim_lib.const import SALARY_TAX_BRACKETS
+from src.lifesim_lib.rng import get_numpy
+from src.lifesim_lib.tax import TaxRegime, load_regimes
+
+
+def walked_tax(salary, brackets=SALARY_TAX_BRACKETS):
+    "calculate_tax as it was before the tax engine."
+    tax = 0
+    prev = 0
+    for i in range(len(brackets) - 1):
+        bound, perc = brackets[i]
+        if salary <= bound:
+            tax += (salary - prev) * perc
+            break
+        else:
+            tax += (bound - prev) * perc
+        prev = bound
+    else:
+        tax += (salary - prev) * brackets[-1]
+    return round(tax)
+
+
+def salaries(brackets):
+    top = brackets[-2][0] * 2 if len(brackets) > 1 else 10**6
+    rng = random.Random(1)
+    extra = [rng.uniform(0, top) for _ in range(10000)]
+    extra += [rng.randint(top, 10**9) for _ in range(10000)]
+    return list(range(top + 1)) + extra
+
+
+def check(name, brackets):
+    regime = TaxRegime(name, brackets)
+    values = salaries(brackets)
+    expected = [walked_tax(s, brackets) for s in values]
+    wrong = sum(regime.tax(s) != e for s, e in zip(values, expected))
+    np = get_numpy()
+    if np is not None:
+        wrong += int((regime.taxes(np.array(values)) != np.array(expected)).sum())
+    print(f"{name:24}{len(values):>10} salaries{wrong:>8} wrong")
+    return wrong == 0
+
+
+def best_of(func, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--salaries", type=int, default=1000000)
+    args = parser.parse_args()
+
+    ok = check("default", SALARY_TAX_BRACKETS)
+    for name, regime in load_regimes().items():
+        brackets = [[b, r] for b, r in zip(regime.bounds, regime.rates)]
+        ok = check(name, brackets + [regime.rates[-1]]) and ok
+
+    regime = TaxRegime("default", SALARY_TAX_BRACKETS)
+    rng = random.Random(2)
+    values = [rng.randint(0, 10**6) for _ in range(100000)]
+    n = len(values)
+    old = best_of(lambda: [walked_tax(s) for s in values])
+    new = best_of(lambda: [regime.tax(s) for s in values])
+    print(f"walking brackets: {old / n * 1e9:8.0f} ns per salary")
+    print(f"TaxRegime.tax:    {new / n * 1e9:8.0f} ns per salary")
+    np = get_numpy()
+    if np is not None:
+        array = np.random.default_rng(3).integers(0, 10**6, args.salaries)
+        elapsed = best_of(lambda: regime.taxes(array))
+        print(f"TaxRegime.taxes:  {elapsed / len(array) * 1e9:8.1f} ns per salary")
+    if not ok:
+        print("The tax engine doesn't match walking the brackets")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
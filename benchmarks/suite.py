@@ -0,0 +1,392 @@
+"""Times the game's hot paths on fixed, seeded workloads and compares them with a baseline.
+
+Covers making players, one age_up in each phase of a life, whole lives,
+calculate_tax (one salary at a time and, with NumPy, arrays of them), saving
+and loading with 10, 1,000 and 10,000 saves, and drawing stat bars. Each
+benchmark is run several times, between calibration runs, and its median time
+per operation kept. The results are compared with benchmarks/baseline.json,
+and a benchmark slower than the baseline by more than the threshold and by
+more than its noise is flagged as a regression (see compare), which makes the
+exit status 1. Times only compare between runs on the same machine:
+after changing machines, record a new baseline with --update-baseline.
+
+The suite runs in a child process with PYTHONHASHSEED=0, so set iteration
+order is the same every run, and saves go to a temporary folder, in the
+backend LIFESIM_SAVE_BACKEND picks.
+
+Run from the repository root with: python -m benchmarks.suite
+"""
+
+import argparse, contextlib, io, json, os, platform, statistics, subprocess, sys, tempfile, time
+
+from src.engine.headless import new_random_life, save_lives, simulate_life
+from src.lifesim_lib import translation
+from src.lifesim_lib.const import SAVE_BACKEND, SAVE_PATH, SALARY_TAX_BRACKETS
+from src.lifesim_lib.frontend import HeadlessFrontend
+from src.lifesim_lib.lifesim_lib import (
+    PlayerDied,
+    calculate_tax,
+    get_save_files,
+    get_saves,
+    print_align_bars,
+)
+from src.lifesim_lib.rng import RNG, get_numpy
+from src.lifesim_lib.save_store import atomic_write
+from src.lifesim_lib.tax import tax_regime
+from src.people.classes.player import Player
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+# A change has to be this many times the noise of the runs compared to count
+NOISE_FLOOR = 3
+CALIBRATION_FILE = os.path.join(SAVE_PATH, "calibration")
+WORKER = "LIFESIM_BENCH_WORKER"
+
+BENCHMARKS = {}
+DISK_BOUND = (
+    set()
+)  # Benchmarks that mostly wait for the disk, calibrated by writing files
+
+
+def benchmark(name):
+    """Registers a benchmark: a function that runs its workload once and returns (seconds, operations).
+
+    Setup the function does before starting its timer isn't counted."""
+
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+
+    return register
+
+
+def timed(func, items):
+    "Calls func on every item; returns (seconds, number of items)."
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return time.perf_counter() - start, len(items)
+
+
+def headless(player):
+    player.frontend = HeadlessFrontend()
+    return player
+
+
+def age_to(player, age):
+    "Ages a player up to age; returns None if it dies first."
+    try:
+        while player.age < age:
+            player.age_up()
+    except PlayerDied:
+        return None
+    return player
+
+
+def lives_at(age, count, prepare=None):
+    """The saved data of count seeded lives that reached age.
+
+    prepare(player) can change each one first, as long as it stays alive."""
+    lives = []
+    seed = 0
+    while len(lives) < count:
+        player = age_to(headless(new_random_life(RNG(seed))), age)
+        seed += 1
+        if player is None:
+            continue
+        if prepare:
+            prepare(player)
+        lives.append(player.to_data())
+    return lives
+
+
+def age_up_once(player):
+    try:
+        player.age_up()
+    except PlayerDied:
+        pass
+
+
+@benchmark("player.new")
+def bench_new_player():
+    def make(seed):
+        Player(rng=RNG(seed)).randomize_traits()
+
+    return timed(make, range(1000))
+
+
+def bench_age_up(age, prepare=None):
+    lives = []
+
+    def run():
+        if not lives:
+            lives.extend(lives_at(age, 200, prepare))
+        players = [headless(Player.load(data)) for data in lives]
+        return timed(age_up_once, players)
+
+    return run
+
+
+def working(player):
+    player.get_job(60000)
+
+
+def retired(player):
+    player.lose_job()
+
+
+# There are no retirement rules; an old player without a job stands in for a retiree
+for name, age, prepare in [
+    ("childhood", 4, None),
+    ("school", 12, None),
+    ("job", 35, working),
+    ("retirement", 70, retired),
+]:
+    BENCHMARKS[f"player.age_up.{name}"] = bench_age_up(age, prepare)
+
+
+@benchmark("player.life")
+def bench_life():
+    players = [headless(new_random_life(RNG(seed))) for seed in range(20)]
+    return timed(simulate_life, players)
+
+
+def tax_salaries():
+    "Salaries in every bracket, from none to well past the top one."
+    top = SALARY_TAX_BRACKETS[-2][0] * 2
+    return range(0, top, top // 10000)
+
+
+@benchmark("calculate_tax")
+def bench_tax():
+    return timed(calculate_tax, tax_salaries())
+
+
+if get_numpy() is not None:
+
+    @benchmark("calculate_tax.batch")
+    def bench_tax_batch():
+        "TaxRegime.taxes on an array of the same salaries; operations are salaries."
+        np = get_numpy()
+        salaries = np.array(tax_salaries())
+        regime = tax_regime()
+        elapsed, calls = timed(lambda _: regime.taxes(salaries), range(20))
+        return elapsed, calls * len(salaries)
+
+
+@benchmark("print_align_bars")
+def bench_bars():
+    bars = [
+        ("Happiness", 72),
+        ("Health", 100),
+        ("Smarts", 0),
+        ("Looks", 45, "(+3)"),
+        ("Karma", 61),
+    ]
+    with contextlib.redirect_stdout(io.StringIO()):
+        return timed(lambda _: print_align_bars(*bars, show_percent=True), range(2000))
+
+
+def fill_store(count):
+    "Adds seeded lives to the save store until it holds count saves."
+    have = len(get_save_files())
+    save_lives(new_random_life(RNG(10**6 + i)) for i in range(have, count))
+
+
+def bench_saves(count):
+    def save_game():
+        fill_store(count)
+        player = headless(new_random_life(RNG(count)))
+        player.save_game(wait=True)
+
+        def save(i):
+            player.money += 1  # An unchanged player isn't written again
+            player.save_game(wait=True)
+
+        return timed(save, range(50))
+
+    def load_all():
+        fill_store(count)
+        return timed(lambda _: get_saves(), range(max(1, 1000 // count)))
+
+    return save_game, load_all
+
+
+# Smallest first: each adds to the saves the one before made
+for count in (10, 1000, 10000):
+    save_game, load_all = bench_saves(count)
+    BENCHMARKS[f"save_game.{count}"] = save_game
+    DISK_BOUND.add(f"save_game.{count}")
+    BENCHMARKS[f"get_saves.{count}"] = load_all
+
+
+def calibrate(disk=False):
+    """Seconds a fixed piece of plain Python takes, or with disk, writing a small file as saves are; median of five.
+
+    How fast a machine runs changes from minute to minute with its load and clock
+    speed, and its disk even more, so each run of a benchmark is timed between
+    two of these as well."""
+    times = []
+    for _ in range(5):
+        start = time.perf_counter()
+        if disk:
+            for i in range(10):
+                atomic_write(CALIBRATION_FILE, bytes(1024))
+        else:
+            table = {}
+            total = 0
+            for i in range(20000):
+                table[i & 255] = str(i)
+                total += len(table[i & 127])
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def spread(values):
+    "Half the interquartile range of values over their median: how much runs of a benchmark differ."
+    if len(values) < 2:
+        return 0.0
+    low, mid, high = statistics.quantiles(values, n=4)
+    return (high - low) / 2 / statistics.median(values)
+
+
+def run(names, repeat):
+    """Runs the benchmarks.
+
+    Each run of a benchmark is timed between two calibrations, of the disk for
+    those in DISK_BOUND. Returns, for each,
+    the median seconds per operation, the median of those relative to the
+    calibrations around them and the noise of the relative times (see spread)."""
+    results = {}
+    for name in names:
+        seconds, relative = [], []
+        disk = name in DISK_BOUND
+        for _ in range(repeat):
+            before = calibrate(disk)
+            elapsed, ops = BENCHMARKS[name]()
+            after = calibrate(disk)
+            seconds.append(elapsed / ops)
+            relative.append(elapsed / ops / ((before + after) / 2))
+        results[name] = {
+            "seconds": statistics.median(seconds),
+            "relative": statistics.median(relative),
+            "noise": spread(relative),
+        }
+        print(
+            f"{name:28}{format_time(results[name]['seconds']):>12}",
+            file=sys.stderr,
+            flush=True,
+        )
+    return results
+
+
+def format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "numpy": get_numpy() is not None,
+        "save_backend": SAVE_BACKEND,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Prints each result against the baseline; returns the names of the regressions.
+
+    A benchmark regressed if both its time and its time relative to the
+    calibration went up by more than the threshold, and by more than NOISE_FLOOR
+    times the noise of it and its baseline. A machine that is busier than when
+    the baseline was recorded slows down the time alone, and a calibration that
+    happened to be fast the relative time alone; neither is a regression."""
+    regressions = []
+    print(f"{'benchmark':28}{'time':>12}{'baseline':>12}{'change':>9}{'noise':>8}")
+    for name, result in results.items():
+        seconds = result["seconds"]
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:28}{format_time(seconds):>12}{'-':>12}")
+            continue
+        change = result["relative"] / base["relative"] - 1
+        wall_change = seconds / base["seconds"] - 1
+        noise = result["noise"] + base.get("noise", 0)
+        limit = max(threshold, NOISE_FLOOR * noise)
+        flag = ""
+        if change > limit and wall_change > limit:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:28}{format_time(seconds):>12}{format_time(base['seconds']):>12}"
+            f"{change:>+9.1%}{noise:>8.1%}{flag}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-k", dest="pattern", help="only run benchmarks whose name contains this"
+    )
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="slowdown over the baseline flagged as a regression (default 0.25, 25%%)",
+    )
+    parser.add_argument("--json", metavar="FILE", help="write the results to FILE")
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="record the results as the baseline",
+    )
+    args = parser.parse_args()
+
+    if WORKER not in os.environ:
+        with tempfile.TemporaryDirectory() as saves:
+            env = dict(os.environ, PYTHONHASHSEED="0", LIFESIM_SAVE_PATH=saves)
+            env[WORKER] = "1"
+            command = [sys.executable, "-m", "benchmarks.suite", *sys.argv[1:]]
+            sys.exit(subprocess.run(command, env=env).returncode)
+
+    translation.set_language("en")
+    names = [name for name in BENCHMARKS if not args.pattern or args.pattern in name]
+    results = run(names, args.repeat)
+    report = {"environment": environment(), "results": results}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        baseline = {"environment": environment(), "results": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline["environment"] = environment()
+        baseline["results"].update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; record one with --update-baseline")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("environment") != environment():
+        print("The baseline was recorded elsewhere:", baseline.get("environment"))
+    regressions = compare(results, baseline["results"], args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
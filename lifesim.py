@@ -1,10 +1,16 @@
-import gettext, os
+import argparse
 
 from src.lifesim_lib.const import *
-from src.menus.main import main_menu
-from src.menus.start import start_menu
-from src.lifesim_lib.translation import _
-from src.lifesim_lib.lifesim_lib import PlayerDied, yes_no, clear_screen
+from src.menus.start import play
+from src.lifesim_lib.translation import (
+    LANGUAGE_NAMES,
+    available_languages,
+    configured_language,
+    save_language,
+    set_language,
+)
+from src.lifesim_lib.lifesim_lib import choice_input
+from src.lifesim_lib.screen import Screen
 
 """
 TODO List:
@@ -13,15 +19,24 @@ TODO List:
 - Add social media
 """
 
-while True:
-    clear_screen()
-    try:
-        player = start_menu()
-        player.print_traits()
-        print(_("Age {age}").format(age=player.age))
-        while True:
-            main_menu(player)
-            player.save_game()
-    except PlayerDied:
-        if not yes_no(_("Would you like to start a new life?")):
-            break
+parser = argparse.ArgumentParser(description="A life simulator.")
+parser.add_argument(
+    "--lang",
+    choices=available_languages(),
+    help="language to play in (default: $LIFESIM_LANG, then the saved choice)",
+)
+parser.add_argument(
+    "--choose-lang", action="store_true", help="ask for the language again"
+)
+args = parser.parse_args()
+
+language = args.lang or (not args.choose_lang and configured_language())
+if language not in available_languages():
+    # Asked only here, so the rest of the game can be imported and run without a terminal
+    codes = available_languages()
+    language = codes[choice_input(*(LANGUAGE_NAMES.get(c, c) for c in codes)) - 1]
+    save_language(language)
+set_language(language)
+Screen.install()
+
+play()
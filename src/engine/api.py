@@ -0,0 +1,374 @@
+"""JSON over HTTP interface for playing lives from other programs.
+
+  POST /lives                        create a life: {} for a random one, or
+                                     {"first", "last", "gender", "traits"} like a custom life
+  GET  /lives/ID                     the life's stats, traits, illnesses and relations
+  GET  /lives/ID/actions             the IDs of the actions each menu offers now
+  POST /lives/ID/actions/ACTION      perform an action: {"relation": index for relationship
+                                     actions, "input": [lines to answer its questions with]}
+  POST /lives/ID/age_up              age up: {"years": N}
+  GET  /cache                        hits, misses and evictions of the session cache
+
+Decisions made while ageing up are random unless the body gives
+{"choices": {decision: [keys in order of preference]}}. Responses to actions
+and age_up hold what the game printed ("output") and the events of the years
+("events"), along with the new state. An action that asks more questions than
+"input" answers stops with status 409. Only actions marked api (see
+actions.py) are listed or performed; the save browser and debug menu aren't.
+
+Recently used lives are kept in memory, up to --cache-entries lives or
+--cache-mb (see SessionCache), and saved to the save store after every
+change. Run with: python -m src.engine.api
+"""
+
+import argparse, json, re, sys, traceback
+from contextlib import ExitStack, contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.engine.headless import new_random_life
+from src.engine.sessions import SessionCache
+from src.lifesim_lib.frontend import FixedPolicy, HeadlessFrontend
+from src.lifesim_lib.lifesim_lib import (
+    Gender,
+    PlayerDied,
+    Trait,
+    mask_conflicts,
+    trait_mask,
+)
+from src.lifesim_lib.screen import ThreadOutput, use_screen
+from src.lifesim_lib.translation import configured_language, set_language
+from src.menus.actions import (
+    ACTIONS,
+    MENUS,
+    api_action,
+    available_actions,
+    menu_available,
+    perform,
+)
+import src.menus.main  # Registers the actions
+from src.people.classes.player import Player
+
+MAX_YEARS = 200
+
+
+class APIError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Transcript:
+    """Stands in for the screen while the API runs part of the game.
+
+    Keeps what is printed and answers questions from a list of lines; pauses
+    don't take a line. Runs out with EOFError."""
+
+    def __init__(self, inputs=()):
+        self.parts = []
+        self.inputs = iter(inputs)
+
+    def write(self, text):
+        self.parts.append(text)
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def clear(self):
+        pass
+
+    def echoed(self):
+        pass
+
+    def read(self):
+        return next(self.inputs, None)
+
+    def read_line(self, prompt="", pause=False):
+        self.write(prompt)
+        if pause:
+            line = ""
+        else:
+            line = self.read()
+            if line is None:
+                raise EOFError("The action needs more input")
+        self.write(line + "\n")
+        return line
+
+    def text(self):
+        return "".join(self.parts)
+
+
+def person_state(person):
+    data = person.to_data()
+    data.pop("rng", None)
+    data["name"] = person.name
+    data["gender"] = person.gender.name
+    return data
+
+
+def life_state(player):
+    data = person_state(player)
+    data.pop("parents", None)
+    data["cause_of_death"] = getattr(player, "cause_of_death", None)
+    data["relations"] = [person_state(r) for r in player.relations]
+    return data
+
+
+def api_actions(player, menu_ID, *args):
+    return [
+        ID
+        for ID in available_actions(player, menu_ID, *args)
+        if api_action(ACTIONS[ID])
+    ]
+
+
+def menu_actions(player):
+    "The actions each menu the player can get to offers, by menu ID. Relationship actions are listed per relation."
+    actions = {}
+    for ID in MENUS:
+        if not menu_available(player, ID):
+            continue
+        if not any(api_action(action) for action in MENUS[ID].actions):
+            continue
+        if ID == "relationship":
+            actions[ID] = [api_actions(player, ID, r) for r in player.relations]
+        else:
+            actions[ID] = api_actions(player, ID)
+    return actions
+
+
+def new_life(body):
+    "Makes a life the way the start menu does, from a POST /lives body."
+    if not any(key in body for key in ("first", "last", "gender", "traits")):
+        return new_random_life()
+    first = str(body.get("first") or "").strip()
+    last = str(body.get("last") or "").strip()
+    gender = body.get("gender")
+    try:
+        gender = gender and Gender[str(gender).capitalize()]
+    except KeyError:
+        raise APIError(400, f"Unknown gender {gender!r}") from None
+    player = Player(first or None, last or None, gender or None)
+    if body.get("traits") is None:
+        player.randomize_traits()
+    else:
+        try:
+            traits = trait_mask(Trait[str(name).upper()] for name in body["traits"])
+        except KeyError as e:
+            raise APIError(400, f"Unknown trait {e.args[0]!r}") from None
+        if mask_conflicts(traits):
+            raise APIError(400, "Conflicting traits")
+        player.traits = traits
+    return player
+
+
+class API:
+    def __init__(self, cache=None):
+        self.cache = cache or SessionCache()
+
+    @contextmanager
+    def player(self, ID):
+        "Context manager giving the player with this ID, locked; 404 if there is none."
+        with ExitStack() as stack:
+            try:
+                player = stack.enter_context(self.cache.use(ID))
+            except KeyError:
+                raise APIError(404, f"No life {ID!r}") from None
+            yield player
+
+    def create(self, body):
+        player = new_life(body)
+        player.frontend = HeadlessFrontend()
+        player.save_game()
+        state = life_state(player)
+        self.cache.add(player)
+        return state
+
+    def state(self, ID):
+        with self.player(ID) as player:
+            return life_state(player)
+
+    def actions(self, ID):
+        with self.player(ID) as player:
+            return {"actions": menu_actions(player)}
+
+    def cache_stats(self):
+        return self.cache.stats()
+
+    def run(self, player, body, func):
+        "Calls func() with the game's output and decisions going to the response."
+        if not player.alive:
+            raise APIError(409, "This life is over")
+        ID = player.ID
+        events = []
+        policy = FixedPolicy(body.get("choices") or {})
+        player.frontend = HeadlessFrontend(events.append, policy)
+        transcript = Transcript(map(str, body.get("input") or ()))
+        use_screen(transcript)
+        try:
+            func()
+        except PlayerDied:
+            pass
+        except BaseException as e:
+            # Don't keep half an action: the life is reloaded from its last save
+            self.cache.drop(ID)
+            if isinstance(e, EOFError):
+                raise APIError(409, str(e)) from None
+            raise
+        finally:
+            use_screen(None)
+            player.frontend = HeadlessFrontend()  # Don't keep the events
+        if player.ID != ID:
+            # Became another life, which has a session of its own; reload this one from its save
+            self.cache.drop(ID)
+            raise APIError(409, "The action switched to another life")
+        if player.alive:
+            player.save_game()
+        return {
+            "output": transcript.text(),
+            "events": [event._asdict() for event in events],
+            "state": life_state(player),
+        }
+
+    def perform(self, ID, action_ID, body):
+        if action_ID not in ACTIONS or not api_action(ACTIONS[action_ID]):
+            raise APIError(404, f"No action {action_ID!r}")
+        with self.player(ID) as player:
+            args = ()
+            if action_ID.startswith("relationship."):
+                try:
+                    args = (player.relations[int(body.get("relation"))],)
+                except (TypeError, ValueError, IndexError):
+                    raise APIError(400, "relation must be the index of a relation")
+            action = ACTIONS[action_ID]
+            if player.alive and not (
+                action.available(player, *args)
+                and menu_available(player, action.menu.ID)
+            ):
+                raise APIError(409, f"Action {action_ID!r} isn't available")
+            return self.run(player, body, lambda: perform(player, action_ID, *args))
+
+    def age_up(self, ID, body):
+        years = body.get("years", 1)
+        if not isinstance(years, int) or not 1 <= years <= MAX_YEARS:
+            raise APIError(400, f"years must be from 1 to {MAX_YEARS}")
+        with self.player(ID) as player:
+
+            def age():
+                for _ in range(years):
+                    player.age_up()
+
+            return self.run(player, body, age)
+
+
+LIFE_ID = r"/lives/([0-9a-fA-F-]+)"
+ROUTES = [
+    ("POST", re.compile(r"/lives"), "create", True),
+    ("GET", re.compile(LIFE_ID), "state", False),
+    ("GET", re.compile(LIFE_ID + r"/actions"), "actions", False),
+    ("POST", re.compile(LIFE_ID + r"/actions/([\w.]+)"), "perform", True),
+    ("POST", re.compile(LIFE_ID + r"/age_up"), "age_up", True),
+    ("GET", re.compile(r"/cache"), "cache_stats", False),
+]
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keeps connections open between requests
+    # Headers and body go out in separate writes; don't hold the body back
+    disable_nagle_algorithm = True
+    api = None
+
+    def route(self, method, body):
+        path = self.path.split("?", 1)[0].rstrip("/")
+        for route_method, pattern, name, has_body in ROUTES:
+            match = pattern.fullmatch(path)
+            if match and route_method == method:
+                args = match.groups()
+                if has_body:
+                    args += (body,)
+                return getattr(self.api, name)(*args)
+        raise APIError(404, f"No such endpoint: {method} {path}")
+
+    def read_body(self):
+        # Read even if it isn't used, or it would be taken for the next request
+        length = int(self.headers.get("Content-Length") or 0)
+        data = self.rfile.read(length)
+        if not data:
+            return {}
+        try:
+            body = json.loads(data)
+        except ValueError:
+            raise APIError(400, "The body isn't valid JSON") from None
+        if not isinstance(body, dict):
+            raise APIError(400, "The body must be a JSON object")
+        return body
+
+    def respond(self, method):
+        try:
+            body = self.read_body()
+            status, result = 200, self.route(method, body)
+            if method == "POST" and self.path.rstrip("/") == "/lives":
+                status = 201
+        except APIError as e:
+            status, result = e.status, {"error": str(e)}
+        except Exception:
+            traceback.print_exc()
+            status, result = 500, {"error": "Internal error"}
+        data = json.dumps(result).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self.respond("GET")
+
+    def do_POST(self):
+        self.respond("POST")
+
+    def log_message(self, format, *args):
+        pass  # Don't write a line for every request
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def make_server(host, port, api=None):
+    handler = type("Handler", (Handler,), {"api": api or API()})
+    return Server((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve lives over HTTP as JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--lang", help="language of the game's text")
+    parser.add_argument(
+        "--cache-entries",
+        type=int,
+        default=10000,
+        help="most lives to keep in memory (0 for no limit)",
+    )
+    parser.add_argument(
+        "--cache-mb", type=float, help="memory the kept lives may take, roughly"
+    )
+    args = parser.parse_args()
+    set_language(args.lang or configured_language() or "en")
+    sys.stdout = ThreadOutput(sys.stdout)
+    cache = SessionCache(
+        args.cache_entries or None,
+        args.cache_mb and int(args.cache_mb * 1024 * 1024),
+    )
+    server = make_server(args.host, args.port, API(cache))
+    print(f"Listening on {args.host}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+from src.people.classes.player import Player
+from src.lifesim_lib.lifesim_lib import PlayerDied
+from src.lifesim_lib.frontend import HeadlessFrontend
+from src.lifesim_lib.manifest import make_entry
+from src.lifesim_lib.save_format import encode
+from src.lifesim_lib.save_store import get_store
+
+
+def new_random_life(rng=None):
+    """Creates a life the same way the "Random Life" option of the start menu does."""
+    player = Player(rng=rng)
+    player.generate_sibling()
+    player.randomize_traits()
+    return player
+
+
+def simulate_life(player=None, policy=None, sink=None, max_age=None, each_year=None):
+    """Ages a life up year by year until it dies (or reaches max_age) without any terminal I/O.
+
+    Events are sent to sink and decisions are made by policy; see HeadlessFrontend.
+    each_year, if given, is called with the player after every year it lives through.
+    Returns the player, whose alive, cause_of_death and lifetime_happiness() describe how it ended.
+    """
+    if player is None:
+        player = new_random_life()
+    player.frontend = HeadlessFrontend(sink, policy)
+    try:
+        while max_age is None or player.age < max_age:
+            player.age_up()
+            if each_year is not None:
+                each_year(player)
+    except PlayerDied:
+        pass
+    return player
+
+
+def save_lives(players, store=None, batch_size=1000):
+    """Stores finished or unfinished lives in the save store, batch_size saves per transaction.
+
+    Dead lives are kept too, with alive set to False in their entries."""
+    store = store or get_store()
+    batch = []
+    for player in players:
+        data = player.to_data()
+        batch.append((make_entry(data), encode(data)))
+        if len(batch) >= batch_size:
+            store.put_many(batch)
+            batch = []
+    if batch:
+        store.put_many(batch)
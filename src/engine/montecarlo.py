@@ -0,0 +1,148 @@
+import argparse, json, os, random
+from collections import Counter, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from src.engine.headless import new_random_life, simulate_life
+from src.engine.stats import LifeStats, track_life
+from src.lifesim_lib.rng import RNG
+
+CHUNK_SIZE = 1000
+
+LifeSummary = namedtuple(
+    "LifeSummary", ["age", "cause", "happiness", "karma", "money", "illnesses"]
+)
+
+
+def summarize(player):
+    return LifeSummary(
+        player.age,
+        player.cause_of_death,
+        player.lifetime_happiness(),
+        player.karma,
+        player.money,
+        tuple(player.illnesses),
+    )
+
+
+def worker_seed(master_seed, worker):
+    "Returns the seed of a worker's random stream; the same for the same master seed and worker number."
+    return random.Random(f"{master_seed}:{worker}").getrandbits(64)
+
+
+def run_chunk(seed, count, policy=None):
+    "Simulates count lives in this process; each life gets its own RNG seeded from the given seed's stream."
+    stream = random.Random(seed)
+    return [
+        summarize(simulate_life(new_random_life(RNG(stream.getrandbits(64))), policy))
+        for _ in range(count)
+    ]
+
+
+def split(count, parts):
+    base, extra = divmod(count, parts)
+    return [base + (i < extra) for i in range(parts)]
+
+
+def run_lives(count, workers=None, seed=None, policy=None):
+    """Simulates count complete lives across a pool of worker processes.
+
+    Worker i always simulates the i-th share of the lives from worker_seed(seed, i),
+    so the same seed and number of workers give the same results in the same order.
+    policy must be picklable (a module-level function or a FixedPolicy)."""
+    workers = workers or os.cpu_count() or 1
+    if seed is None:
+        seed = random.randrange(2**32)
+    chunks = split(count, workers)
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [
+            executor.submit(run_chunk, worker_seed(seed, i), n, policy)
+            for i, n in enumerate(chunks)
+        ]
+        results = []
+        for future in futures:
+            results.extend(future.result())
+    return results
+
+
+def run_stats_chunk(seed, count, policy=None):
+    "Simulates count lives like run_chunk, returning only their LifeStats."
+    stream = random.Random(seed)
+    stats = LifeStats()
+    for _ in range(count):
+        stats.add(track_life(new_random_life(RNG(stream.getrandbits(64))), policy))
+    return stats
+
+
+def run_stats(
+    count, workers=None, seed=None, policy=None, chunk_size=CHUNK_SIZE, progress=None
+):
+    """Simulates count complete lives across a pool of worker processes and returns their LifeStats.
+
+    Memory doesn't grow with count: lives are simulated in chunks of chunk_size,
+    each summarized by a worker, and the summaries merged as they come back, in
+    order. Chunk i always simulates the same lives from worker_seed(seed, i), so
+    the same seed and chunk size give the same results whatever the number of
+    workers. progress, if given, is called with the stats so far after each chunk."""
+    workers = workers or os.cpu_count() or 1
+    if seed is None:
+        seed = random.randrange(2**32)
+    chunks = split(count, max(1, -(-count // chunk_size)))
+    stats = LifeStats()
+    with ProcessPoolExecutor(workers) as executor:
+        futures = deque(
+            executor.submit(run_stats_chunk, worker_seed(seed, i), n, policy)
+            for i, n in enumerate(chunks)
+        )
+        while futures:
+            # Dropped once merged, so the chunks' stats don't pile up
+            stats.merge(futures.popleft().result())
+            if progress:
+                progress(stats)
+    return stats
+
+
+def aggregate(summaries):
+    n = len(summaries)
+    if n == 0:
+        return {"lives": 0}
+    illnesses = Counter()
+    for s in summaries:
+        illnesses.update(s.illnesses)
+    return {
+        "lives": n,
+        "mean_age": sum(s.age for s in summaries) / n,
+        "mean_happiness": sum(s.happiness for s in summaries) / n,
+        "mean_karma": sum(s.karma for s in summaries) / n,
+        "mean_money": sum(s.money for s in summaries) / n,
+        "causes": dict(Counter(s.cause for s in summaries).most_common()),
+        "illnesses": dict(illnesses.most_common()),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate many lives in parallel.")
+    parser.add_argument("lives", type=int)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--progress", action="store_true", help="print the lives done after each chunk"
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="print the full report as JSON"
+    )
+    args = parser.parse_args()
+
+    def progress(stats):
+        print(f"{stats.lives} lives, mean age {stats.age.moments.mean:.1f}", flush=True)
+
+    stats = run_stats(
+        args.lives, args.workers, args.seed, progress=args.progress and progress
+    )
+    report = stats.report()
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for key, value in report.items():
+            if isinstance(value, dict):
+                value = {k: v for k, v in value.items() if k != "histogram"}
+            print(f"{key}: {value}")
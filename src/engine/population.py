@@ -0,0 +1,127 @@
+import numpy as np
+
+from src.lifesim_lib.mortality import death_mask
+from src.lifesim_lib.rules import load_rules
+
+STATS = ("happiness", "health", "smarts", "looks")
+
+
+class Population:
+    """Struct-of-arrays store that ages a whole population of characters at once.
+
+    Each attribute of Person (and relationship, for Relationship instances, and the
+    mask of traits, for players) is kept as one NumPy column, so a year passes for every character with a handful of
+    batched random draws and np.clip calls instead of one Python call chain each.
+    """
+
+    def __init__(self, size, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.age = np.zeros(size, dtype=np.int16)
+        self.happiness = np.zeros(size, dtype=np.int16)
+        self.health = np.zeros(size, dtype=np.int16)
+        self.smarts = np.zeros(size, dtype=np.int16)
+        self.looks = np.zeros(size, dtype=np.int16)
+        self.relationship = np.zeros(size, dtype=np.int16)
+        self.is_relation = np.zeros(size, dtype=bool)
+        self.alive = np.ones(size, dtype=bool)
+        self.traits = np.zeros(size, dtype=np.uint16)  # Masks of Trait bits
+        self.illnesses = {}  # Name -> mask of the characters who have it
+
+    def __len__(self):
+        return len(self.age)
+
+    @classmethod
+    def from_people(cls, people, seed=None):
+        pop = cls(len(people), seed)
+        for i, person in enumerate(people):
+            pop.age[i] = person.age
+            for stat in STATS:
+                getattr(pop, stat)[i] = getattr(person, stat)
+            if hasattr(person, "relationship"):
+                pop.is_relation[i] = True
+                pop.relationship[i] = person.relationship
+            pop.traits[i] = getattr(person, "traits", 0)
+            pop.alive[i] = person.alive
+        return pop
+
+    @classmethod
+    def random(cls, size, seed=None, min_age=0, max_age=90):
+        """Creates a population of characters with random ages and stats."""
+        pop = cls(size, seed)
+        rng = pop.rng
+        pop.age[:] = rng.integers(min_age, max_age + 1, size)
+        for stat in STATS:
+            getattr(pop, stat)[:] = rng.integers(0, 51, size) + rng.integers(
+                0, 51, size
+            )
+        return pop
+
+    def write_back(self, people):
+        """Copies the columns back into the Person objects this population was made from."""
+        for i, person in enumerate(people):
+            person.age = int(self.age[i])
+            for stat in STATS:
+                setattr(person, stat, int(getattr(self, stat)[i]))
+            if self.is_relation[i]:
+                person.relationship = int(self.relationship[i])
+            if hasattr(person, "traits"):
+                person.traits = int(self.traits[i])
+            person.alive = bool(self.alive[i])
+
+    def age_up(self):
+        """Same as calling age_up on every living character."""
+        rng = self.rng
+        n = len(self)
+        alive = self.alive
+        self.age += alive
+        draws = rng.integers(-3, 4, (len(STATS), n), dtype=np.int16)
+        draws *= alive
+        for stat, draw in zip(STATS, draws):
+            col = getattr(self, stat)
+            col += draw
+            np.clip(col, 0, 100, out=col)
+        draw = rng.integers(-4, 5, n, dtype=np.int16)
+        draw *= alive & self.is_relation
+        self.relationship += draw
+        np.clip(self.relationship, 0, 100, out=self.relationship)
+
+    def death_check(self):
+        """Vectorized Person.death_check; returns a mask of the living characters that die this year."""
+        return self.alive & death_mask(self.age, self.health, self.rng)
+
+    def kill(self, mask):
+        self.alive &= ~mask
+
+    def illness(self, name):
+        column = self.illnesses.get(name)
+        if column is None:
+            column = self.illnesses[name] = np.zeros(len(self), dtype=bool)
+        return column
+
+    def set_illness(self, name, mask, value):
+        self.illness(name)[mask & self.alive] = value
+
+    def change(self, stat, mask, amount):
+        "Changes a stat of the living characters in mask by amount (a number or a column), within 0 to 100."
+        col = getattr(self, stat)
+        col[:] = np.clip(col + np.where(mask & self.alive, amount, 0), 0, 100)
+
+    def run_rules(self, hook):
+        """Runs the rules of assets/rules.json at this hook on everyone at once (see rules.py).
+
+        Rules that need what a population doesn't keep are skipped; returns their names.
+        """
+        skipped = []
+        for rule in load_rules().hooks[hook]:
+            if rule.batch_source is None:
+                skipped.append(rule.name)
+            else:
+                rule.batch(self)
+        return skipped
+
+    def step(self):
+        """Ages everyone up a year and removes those who died. Returns the mask of deaths."""
+        self.age_up()
+        died = self.death_check()
+        self.kill(died)
+        return died
@@ -0,0 +1,137 @@
+"""Hosts lives for many users at once over TCP.
+
+Every connection plays the same game as lifesim.py. The game asks for input
+with blocking calls, so each session runs it on a thread of its own and draws
+on a Screen of its own; the asyncio loop only moves lines between the sockets
+and the sessions. Ageing up stays on the session's thread, so a slow step
+never holds up the loop. Sessions save their lives to the shared save store
+(with many users, set LIFESIM_SAVE_BACKEND=sqlite) but only play new ones:
+the save store isn't scoped by user, so the saves aren't listed, loaded or
+deleted from a session.
+
+Once a session waits for input, the server sends the telnet Go Ahead command
+(IAC GA) after the screen so clients can tell the screen is complete. telnet
+hides it. Run with: python -m src.engine.server, then: telnet localhost 4000
+"""
+
+import argparse, asyncio, os, queue, sys, threading, traceback
+
+from src.lifesim_lib.screen import Screen, ThreadOutput, use_screen
+from src.lifesim_lib.translation import configured_language, set_language
+from src.menus.start import play
+
+GO_AHEAD = b"\xff\xf9"
+SESSION_SIZE = os.terminal_size((80, 24))
+# Sessions spend their time waiting for a line; they don't need a full-size stack
+STACK_SIZE = 512 * 1024
+
+
+class SessionOutput:
+    "Where a session's Screen writes: each frame is handed to the event loop to send."
+
+    def __init__(self, loop, writer):
+        self.loop = loop
+        self.writer = writer
+        self.parts = []
+
+    def isatty(self):
+        return True  # The client is a terminal
+
+    def write(self, text):
+        self.parts.append(text)
+
+    def flush(self):
+        data = "".join(self.parts).encode() + GO_AHEAD
+        self.parts = []
+        self.loop.call_soon_threadsafe(self.send, data)
+
+    def send(self, data):
+        if not self.writer.is_closing():
+            self.writer.write(data)
+
+
+class Session:
+    def __init__(self, loop, writer):
+        self.loop = loop
+        self.lines = queue.Queue()
+        self.screen = Screen(
+            SessionOutput(loop, writer), read=self.lines.get, size=SESSION_SIZE
+        )
+        self.done = loop.create_future()
+
+    def run(self):
+        "Plays the game on the current thread until the user quits or disconnects."
+        use_screen(self.screen)
+        try:
+            play(browse_saves=False)
+        except EOFError:
+            pass  # Disconnected
+        except Exception:
+            traceback.print_exc()
+        finally:
+            self.screen.flush()
+            use_screen(None)
+            self.loop.call_soon_threadsafe(self.done.set_result, None)
+
+    async def feed(self, reader):
+        "Passes the lines the client sends to the game; None tells it the client is gone."
+        try:
+            while line := await reader.readline():
+                self.lines.put(line.decode(errors="replace").rstrip("\r\n"))
+        except (ConnectionError, ValueError):
+            pass
+        self.lines.put(None)
+
+
+async def handle(reader, writer):
+    session = Session(asyncio.get_running_loop(), writer)
+    threading.Thread(target=session.run, name="Session", daemon=True).start()
+    feeder = asyncio.create_task(session.feed(reader))
+    await session.done
+    feeder.cancel()
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except ConnectionError:
+        pass
+
+
+async def serve(host, port):
+    server = await asyncio.start_server(handle, host, port, backlog=1024)
+    port = server.sockets[0].getsockname()[1]
+    print(f"Listening on {host}:{port}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def raise_file_limit():
+    "Allows as many open sockets as the system lets this process have."
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host lives over TCP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4000)
+    parser.add_argument(
+        "--lang", help="language of every session (default: the configured one)"
+    )
+    args = parser.parse_args()
+    set_language(args.lang or configured_language() or "en")
+    raise_file_limit()
+    threading.stack_size(STACK_SIZE)
+    sys.stdout = ThreadOutput(sys.stdout)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+import sys, threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from enum import Enum
+from types import FunctionType, MethodType, ModuleType
+
+from src.lifesim_lib.lifesim_lib import load_save
+from src.lifesim_lib.save_writer import SAVE_WRITER
+from src.people.classes.player import Player
+
+SHARED = (type, Enum, ModuleType, FunctionType, MethodType)
+SCALARS = {str, bytes, int, float, bool, type(None)}
+# Measuring a life takes about as long as a request; lives grow slowly, so
+# they're only measured when loaded and then every RESIZE_EVERY uses
+RESIZE_EVERY = 16
+
+
+def deep_size(obj, seen=None):
+    """Approximate bytes taken by obj and everything it refers to.
+
+    Classes, enum members, functions and methods are shared with the rest of the
+    program and aren't counted."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen or isinstance(obj, SHARED):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += items_size(obj.keys(), seen) + items_size(obj.values(), seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += items_size(obj, seen)
+    elif type(obj) not in SCALARS:
+        if hasattr(obj, "__dict__"):
+            size += deep_size(vars(obj), seen)
+        values = []
+        for cls in type(obj).__mro__:
+            slots = getattr(cls, "__slots__", ())
+            for name in (slots,) if isinstance(slots, str) else slots:
+                if name != "__dict__" and hasattr(obj, name):
+                    values.append(getattr(obj, name))
+        size += items_size(values, seen)
+    return size
+
+
+def items_size(items, seen):
+    if len(items) > 100 and set(map(type, items)) <= SCALARS:
+        return sum(map(sys.getsizeof, items))  # Such as an RNG's pool of numbers
+    size = 0
+    for item in items:
+        if type(item) in SCALARS:
+            size += sys.getsizeof(item)  # Can't refer to anything else
+        else:
+            size += deep_size(item, seen)
+    return size
+
+
+def player_size(player):
+    "Approximate bytes a cached player takes, relations included."
+    return deep_size(player, {id(player.frontend)})
+
+
+class Life:
+    """A life held in memory. Hold lock while using player."""
+
+    def __init__(self, player=None):
+        self.player = player
+        self.size = 0
+        self.uses = 0
+        self.evicted = False
+        self.lock = threading.Lock()
+
+
+class SessionCache:
+    """The lives a server is playing, by ID, loaded from the save store on first use.
+
+    At most max_entries lives taking about max_bytes (see player_size) are kept;
+    either can be None for no limit. Past that, the least recently used lives
+    are evicted, and those that changed since they were saved are saved first.
+    Lives being used are never evicted.
+
+    The cache's own lock is only held to look lives up; each life has a lock of
+    its own, so requests for different lives never wait for each other."""
+
+    def __init__(self, max_entries=None, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.lives = OrderedDict()  # Least recently used first
+        self.bytes = 0
+        self.lock = threading.Lock()
+        # Evicted lives whose saves may still be waiting in the SaveWriter
+        self.written_back = set()
+        self.hits = self.misses = self.evictions = self.writebacks = 0
+
+    def __len__(self):
+        return len(self.lives)
+
+    def stats(self):
+        return {
+            "entries": len(self.lives),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "writebacks": self.writebacks,
+        }
+
+    def add(self, player):
+        life = Life(player)
+        with life.lock:
+            with self.lock:
+                self.lives[player.ID] = life
+            self.resize(life)
+        self.evict()
+        return life
+
+    def lookup(self, ID):
+        "Returns the Life with this ID, adding an empty one to load if it isn't cached."
+        with self.lock:
+            life = self.lives.get(ID)
+            if life is None:
+                self.misses += 1
+                life = self.lives[ID] = Life()
+            else:
+                self.hits += 1
+                self.lives.move_to_end(ID)
+            return life
+
+    def load(self, ID, life):
+        try:
+            if ID in self.written_back:
+                SAVE_WRITER.flush(ID)  # Don't read a save older than the evicted life
+                self.written_back.discard(ID)
+            life.player = Player.load(load_save(ID))
+        except BaseException:  # Whatever failed, an empty Life would never be evicted
+            with self.lock:
+                if self.lives.get(ID) is life:
+                    del self.lives[ID]
+            life.evicted = True
+            raise
+        self.resize(life)
+
+    @contextmanager
+    def use(self, ID):
+        """Context manager giving the player with this ID, locked for the current thread.
+
+        Raises KeyError if it is neither cached nor saved."""
+        while True:
+            life = self.lookup(ID)
+            with life.lock:
+                if life.evicted:
+                    continue  # Evicted before we got the lock
+                if life.player is None:
+                    self.load(ID, life)
+                try:
+                    yield life.player
+                finally:
+                    life.uses += 1
+                    if life.uses % RESIZE_EVERY == 0 and not life.evicted:
+                        self.resize(life)
+                break
+        self.evict()
+
+    def drop(self, ID):
+        "Forgets the life with this ID without saving it, so its next use loads it from its save. Hold its lock."
+        with self.lock:
+            life = self.lives.pop(ID, None)
+            if life is not None:
+                self.bytes -= life.size
+                life.evicted = True
+            self.written_back.add(
+                ID
+            )  # Its last save may still be waiting in the SaveWriter
+
+    def resize(self, life):
+        "Updates the size of a life. Hold its lock."
+        size = player_size(life.player)
+        with self.lock:
+            self.bytes += size - life.size
+        life.size = size
+
+    def over_budget(self):
+        return (
+            self.max_entries is not None and len(self.lives) > self.max_entries
+        ) or (self.max_bytes is not None and self.bytes > self.max_bytes)
+
+    def evict(self):
+        "Evicts least recently used lives until the cache is within its budget."
+        if not self.over_budget():
+            return
+        with self.lock:
+            candidates = list(self.lives.items())
+        for ID, life in candidates:
+            if not self.over_budget():
+                break
+            if not life.lock.acquire(blocking=False):
+                continue  # In use
+            try:
+                player = life.player
+                if player is None:
+                    continue  # Not loaded yet
+                dirty = player.alive and player.is_dirty()
+                if dirty:
+                    player.save_game()
+                    self.written_back.add(ID)
+                with self.lock:
+                    if self.lives.get(ID) is life:
+                        del self.lives[ID]
+                    self.bytes -= life.size
+                    self.evictions += 1
+                    self.writebacks += dirty
+                life.player = None
+                life.evicted = True
+            finally:
+                life.lock.release()
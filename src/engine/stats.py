@@ -0,0 +1,317 @@
+"""Statistics of simulated lives gathered as they finish, in constant memory.
+
+Every accumulator here takes values one at a time with add() and can merge()
+another of its kind, so workers can each summarize their own lives and the
+results be combined. None of them keeps the values themselves: Moments keeps
+a running mean and variance, QuantileSketch counts values in logarithmic
+buckets (quantiles within 1% of the true value) and Histogram counts them in
+fixed bins. LifeStats puts them together for the outcomes of whole lives and
+can report at any point.
+"""
+
+import math
+from collections import Counter, namedtuple
+
+from src.engine.headless import simulate_life
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+LifeRecord = namedtuple(
+    "LifeRecord",
+    [
+        "age",
+        "cause",
+        "happiness",
+        "karma",
+        "money",
+        "illnesses",  # Every illness the player had at the end of some year
+        "university",  # "none", "enrolled", "dropped out" or "graduated"
+        "job",  # "never", "worked" or "employed" (at death)
+        "first_job_age",  # None if the player never had a job
+    ],
+)
+
+
+class Moments:
+    """Count, mean, variance, minimum and maximum of numbers (Welford's algorithm)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of squared differences from the mean
+        self.min = None
+        self.max = None
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if self.min is None or x < self.min:
+            self.min = x
+        if self.max is None or x > self.max:
+            self.max = x
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.__dict__.update(other.__dict__)
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def stddev(self):
+        return math.sqrt(self.variance())
+
+    def report(self):
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "stddev": self.stddev(),
+            "min": self.min,
+            "max": self.max,
+        }
+
+
+class QuantileSketch:
+    """Estimates quantiles of numbers, positive or negative, to within relative_accuracy.
+
+    Values go into buckets whose bounds grow geometrically (as in DDSketch), so a
+    quantile is off by at most relative_accuracy times its value. Past max_buckets
+    on either side of zero, the buckets nearest zero are combined, which only
+    makes the smallest values less accurate."""
+
+    def __init__(self, relative_accuracy=0.01, max_buckets=2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.positive = {}  # Bucket index -> count
+        self.negative = {}  # The same, of -x
+        self.zeros = 0
+        self.count = 0
+
+    def bucket(self, x):
+        return math.ceil(math.log(x) / self.log_gamma)
+
+    def add(self, x):
+        self.count += 1
+        if x > 0:
+            self.add_to(self.positive, self.bucket(x), 1)
+        elif x < 0:
+            self.add_to(self.negative, self.bucket(-x), 1)
+        else:
+            self.zeros += 1
+
+    def add_to(self, buckets, index, count):
+        buckets[index] = buckets.get(index, 0) + count
+        if len(buckets) > self.max_buckets:
+            lowest, second = sorted(buckets)[:2]
+            buckets[second] += buckets.pop(lowest)
+
+    def merge(self, other):
+        if other.gamma != self.gamma:
+            raise ValueError("Can't merge sketches of different accuracy")
+        for buckets, others in (
+            (self.positive, other.positive),
+            (self.negative, other.negative),
+        ):
+            for index, count in others.items():
+                self.add_to(buckets, index, count)
+        self.zeros += other.zeros
+        self.count += other.count
+
+    def value(self, index):
+        "A value that is within relative_accuracy of every value in the bucket."
+        return 2 * self.gamma**index / (self.gamma + 1)
+
+    def quantile(self, q):
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.negative, reverse=True):
+            seen += self.negative[index]
+            if seen > rank:
+                return -self.value(index)
+        seen += self.zeros
+        if seen > rank:
+            return 0
+        for index in sorted(self.positive):
+            seen += self.positive[index]
+            if seen > rank:
+                return self.value(index)
+        return self.value(max(self.positive))
+
+    def report(self, quantiles=QUANTILES):
+        return {f"p{q * 100:g}": self.quantile(q) for q in quantiles}
+
+
+class Histogram:
+    """Counts of numbers in bins of the given width starting at lo; values under lo or from hi on get a bin each."""
+
+    def __init__(self, lo, hi, width):
+        self.lo = lo
+        self.hi = hi
+        self.width = width
+        self.bins = [0] * math.ceil((hi - lo) / width)
+        self.under = self.over = 0
+
+    def add(self, x):
+        if x < self.lo:
+            self.under += 1
+        elif x >= self.hi:
+            self.over += 1
+        else:
+            self.bins[int((x - self.lo) // self.width)] += 1
+
+    def merge(self, other):
+        if (other.lo, other.hi, other.width) != (self.lo, self.hi, self.width):
+            raise ValueError("Can't merge histograms with different bins")
+        self.bins = [a + b for a, b in zip(self.bins, other.bins)]
+        self.under += other.under
+        self.over += other.over
+
+    def report(self):
+        result = {}
+        if self.under:
+            result[f"<{self.lo}"] = self.under
+        for i, count in enumerate(self.bins):
+            start = self.lo + i * self.width
+            result[f"{start}-{min(start + self.width, self.hi)}"] = count
+        if self.over:
+            result[f">={self.hi}"] = self.over
+        return result
+
+
+class Distribution:
+    """Moments and quantiles of numbers, and a histogram if bins are given as (lo, hi, width)."""
+
+    def __init__(self, bins=None):
+        self.moments = Moments()
+        self.sketch = QuantileSketch()
+        self.histogram = bins and Histogram(*bins)
+
+    def add(self, x):
+        self.moments.add(x)
+        self.sketch.add(x)
+        if self.histogram:
+            self.histogram.add(x)
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        if self.histogram:
+            self.histogram.merge(other.histogram)
+
+    def report(self):
+        result = self.moments.report()
+        result.update(self.sketch.report())
+        if self.histogram:
+            result["histogram"] = self.histogram.report()
+        return result
+
+
+class LifeStats:
+    """Distributions of how simulated lives turned out. Add LifeRecords (see track_life)."""
+
+    def __init__(self):
+        self.lives = 0
+        self.age = Distribution((0, 125, 5))
+        self.happiness = Distribution((0, 101, 10))
+        self.karma = Distribution((0, 101, 10))
+        self.money = Distribution()
+        self.first_job_age = Distribution((0, 100, 5))
+        self.causes = Counter()
+        self.illnesses = Counter()  # Lives that had each illness
+        self.university = Counter()
+        self.job = Counter()
+
+    def add(self, record):
+        self.lives += 1
+        self.age.add(record.age)
+        self.happiness.add(record.happiness)
+        self.karma.add(record.karma)
+        self.money.add(record.money)
+        if record.first_job_age is not None:
+            self.first_job_age.add(record.first_job_age)
+        self.causes[record.cause] += 1
+        self.illnesses.update(record.illnesses)
+        self.university[record.university] += 1
+        self.job[record.job] += 1
+
+    def merge(self, other):
+        self.lives += other.lives
+        for name in ("age", "happiness", "karma", "money", "first_job_age"):
+            getattr(self, name).merge(getattr(other, name))
+        for name in ("causes", "illnesses", "university", "job"):
+            getattr(self, name).update(getattr(other, name))
+
+    def report(self):
+        def shares(counter):
+            return {key: count / self.lives for key, count in counter.most_common()}
+
+        return {
+            "lives": self.lives,
+            "age_at_death": self.age.report(),
+            "lifetime_happiness": self.happiness.report(),
+            "karma": self.karma.report(),
+            "money": self.money.report(),
+            "first_job_age": self.first_job_age.report(),
+            "causes_of_death": shares(self.causes),
+            "illness_incidence": shares(self.illnesses),
+            "university": shares(self.university),
+            "job": shares(self.job),
+        }
+
+
+def track_life(player, policy=None):
+    "Simulates a life to its end and returns its LifeRecord."
+    illnesses = set()
+    first_job_age = None
+    uv_years = player.uv_years
+    university = "enrolled" if uv_years > 0 else "none"
+
+    def track_university(player):
+        nonlocal uv_years, university
+        if player.uv_years > 0:
+            university = "enrolled"
+        elif uv_years > 0:
+            # The last year ends at one to go; dropping out can end it at any
+            university = "graduated" if uv_years == 1 else "dropped out"
+        uv_years = player.uv_years
+
+    def each_year(player):
+        nonlocal first_job_age
+        illnesses.update(player.illnesses)
+        if first_job_age is None and player.has_job:
+            first_job_age = player.age
+        track_university(player)
+
+    simulate_life(player, policy, each_year=each_year)
+    illnesses.update(player.illnesses)
+    track_university(player)  # The year the player died in
+    if player.has_job:
+        job = "employed"
+    else:
+        job = "never" if first_job_age is None else "worked"
+    return LifeRecord(
+        player.age,
+        player.cause_of_death,
+        player.lifetime_happiness(),
+        player.karma,
+        player.money,
+        tuple(sorted(illnesses)),
+        university,
+        job,
+        first_job_age,
+    )
@@ -1,18 +1,23 @@
-import os as _os
+import functools as _functools, os as _os
+
+from src.lifesim_lib.names import load_corpus as _load_corpus
+from src.lifesim_lib.translation import N_
 
 DEBUG = False
 
-MALE_NAMES = open("assets/male_names.txt").read().splitlines()
-FEMALE_NAMES = open("assets/female_names.txt").read().splitlines()
-LAST_NAMES = open("assets/last_names.txt").read().splitlines()
+SAVE_PATH = filename = _os.environ.get(
+    "LIFESIM_SAVE_PATH", _os.getcwd() + "/game_saves"
+)  # + "/gamedata.pickle"
 
-SAVE_PATH = filename = _os.getcwd() + "/game_saves"  # + "/gamedata.pickle"
+# "files" keeps one file per save; "sqlite" keeps them all in SAVE_DB
+SAVE_BACKEND = _os.environ.get("LIFESIM_SAVE_BACKEND", "files")
+SAVE_DB = SAVE_PATH + "/saves.db"
 
-LANGUAGES = [
-    dir
-    for dir in _os.listdir("./locale")
-    if _os.path.isdir(_os.path.abspath("./locale/" + dir))
-]
+# Set to 1 or a file path to time the phases of each year (see profiler.py)
+PROFILE = _os.environ.get("LIFESIM_PROFILE", "")
+
+# Set to the name of a regime in assets/tax_regimes.json to tax salaries by it (see tax.py)
+TAX_REGIME = _os.environ.get("LIFESIM_TAX_REGIME", "")
 
 SALARY_TAX_BRACKETS = [
     [9950, 0.1],
@@ -24,67 +29,85 @@ SALARY_TAX_BRACKETS = [
     0.37,
 ]
 
-from src.lifesim_lib.translation import _
 
+@_functools.lru_cache(maxsize=None)
+def load_names(kind):
+    "Returns the NameList of male, female or last names, which is only opened the first time."
+    return _load_corpus()[kind]
+
+
+def male_names():
+    return load_names("male")
+
+
+def female_names():
+    return load_names("female")
+
+
+def last_names():
+    return load_names("last")
+
+
+# These are only marked for translation; translate them with _ where they are shown
 ILLNESSES_TRANSLATIONS = {
-	"Depression": _("Depression"),
-	"High Blood Pressure": _("High Blood Pressure"),
+    "Depression": N_("Depression"),
+    "High Blood Pressure": N_("High Blood Pressure"),
 }
 
 COMPLIMENTS = [
-	_("a bubbly personality"),
-	_("a champion"),
-	_("a gem"),
-	_("a genius"),
-	_("a jewel"),
-	_("a legend"),
-	_("a player"),
-	_("a revolutionary"),
-	_("a smart cookie"),
-	_("a treasure"),
-	_("a winner"),
-	_("a wizard"),
-	_("a visionary"),
-	_("adorable"),
-	_("admirable"),
-	_("an OG")
-	_("brave"),
-	_("bright"),
-	_("brilliant"),
-	_("charming"),
-	_("clever"),
-	_("cool")
-	_("courageous"),
-	_("delightful"),
-	_("dope")
-	_("elite"),
-	_("fascinating"),
-	_("fearless"),
-	_("fresh"),
-	_("gorgeous"),
-	_("golden"),
-	_("groovy"),
-	_("inspiring"),
-	_("intelligent"),
-	_("magnificent"),
-	_("motivating"),
-	_("neat"),
-	_("nifty"),
-	_("one-of-a-kind")
-	_("a perfect 10"),
-	_("phenomenal"),
-	_("rad"),
-	_("smart"),
-	_("spectatular"),
-	_("stellar"),
-	_("strong"),
-	_("stunning"),
-	_("stylish"),
-	_("swell"),
-	_("the best"),
-	_("the greatest"),
-	_("the life of the party"),
-	_("unparalled"),
-	_("wise"),
-	_("wonderful")
-]
\ No newline at end of file
+    N_("a bubbly personality"),
+    N_("a champion"),
+    N_("a gem"),
+    N_("a genius"),
+    N_("a jewel"),
+    N_("a legend"),
+    N_("a player"),
+    N_("a revolutionary"),
+    N_("a smart cookie"),
+    N_("a treasure"),
+    N_("a winner"),
+    N_("a wizard"),
+    N_("a visionary"),
+    N_("adorable"),
+    N_("admirable"),
+    N_("an OG"),
+    N_("brave"),
+    N_("bright"),
+    N_("brilliant"),
+    N_("charming"),
+    N_("clever"),
+    N_("cool"),
+    N_("courageous"),
+    N_("delightful"),
+    N_("dope"),
+    N_("elite"),
+    N_("fascinating"),
+    N_("fearless"),
+    N_("fresh"),
+    N_("gorgeous"),
+    N_("golden"),
+    N_("groovy"),
+    N_("inspiring"),
+    N_("intelligent"),
+    N_("magnificent"),
+    N_("motivating"),
+    N_("neat"),
+    N_("nifty"),
+    N_("one-of-a-kind"),
+    N_("a perfect 10"),
+    N_("phenomenal"),
+    N_("rad"),
+    N_("smart"),
+    N_("spectatular"),
+    N_("stellar"),
+    N_("strong"),
+    N_("stunning"),
+    N_("stylish"),
+    N_("swell"),
+    N_("the best"),
+    N_("the greatest"),
+    N_("the life of the party"),
+    N_("unparalled"),
+    N_("wise"),
+    N_("wonderful"),
+]
@@ -0,0 +1,103 @@
+from collections import namedtuple
+
+from src.lifesim_lib.lifesim_lib import (
+    choice_input,
+    clear_screen,
+    display_event,
+    press_enter,
+    print_align_bars,
+)
+from src.lifesim_lib.translation import _
+
+Event = namedtuple("Event", ["age", "kind", "text"])
+
+
+class TerminalFrontend:
+    """Shows a life's events on the terminal and asks the user for decisions."""
+
+    def message(self, player, text):
+        print(text)
+
+    def event(self, player, text):
+        display_event(text)
+
+    def show_stats(self, player):
+        player.display_stats()
+
+    def pause(self, player):
+        press_enter()
+
+    def choose(self, player, decision, prompt, options):
+        """Asks the user to pick one of the (key, label) options and returns its key."""
+        print(prompt)
+        choice = choice_input(*(label for key, label in options))
+        clear_screen()
+        return options[choice - 1][0]
+
+    def death(self, player, message, lifetime_happiness):
+        print(message)
+        print_align_bars(
+            (_("Lifetime Happiness"), lifetime_happiness), (_("Karma"), player.karma)
+        )
+        press_enter()
+
+
+class HeadlessFrontend:
+    """Sends a life's events to a sink and lets a policy make its decisions.
+
+    sink is called with an Event for everything the terminal would show; it can
+    be None to throw events away. policy is called as policy(player, decision, keys)
+    and returns one of the keys."""
+
+    def __init__(self, sink=None, policy=None):
+        self.sink = sink
+        self.policy = policy or random_policy
+
+    def emit(self, player, kind, text):
+        if self.sink is not None:
+            self.sink(Event(player.age, kind, text))
+
+    def message(self, player, text):
+        self.emit(player, "message", text)
+
+    def event(self, player, text):
+        self.emit(player, "event", text)
+
+    def show_stats(self, player):
+        pass
+
+    def pause(self, player):
+        pass
+
+    def choose(self, player, decision, prompt, options):
+        key = self.policy(player, decision, [key for key, label in options])
+        self.emit(player, "decision", f"{decision}={key}")
+        return key
+
+    def death(self, player, message, lifetime_happiness):
+        self.emit(player, "death", message)
+
+
+def random_policy(player, decision, keys):
+    return player.rng.choice(keys)
+
+
+class FixedPolicy:
+    """Decision policy that always picks the same options.
+
+    choices maps a decision name to a list of keys in order of preference; the
+    first one that is available is picked. Decisions that aren't listed fall
+    back to the default policy."""
+
+    def __init__(self, choices, default=random_policy):
+        self.choices = choices
+        self.default = default
+
+    def __call__(self, player, decision, keys):
+        for key in self.choices.get(decision, ()):
+            if key in keys:
+                return key
+        return self.default(player, decision, keys)
+
+
+TERMINAL = TerminalFrontend()
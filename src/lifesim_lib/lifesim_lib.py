@@ -1,9 +1,14 @@
 from enum import Enum
-import math, os, random, pickle
-from sys import platform
+from types import SimpleNamespace
+import bisect, math, os, random, sys, threading
 
 from src.lifesim_lib.const import *
-from src.lifesim_lib.translation import _
+from src.lifesim_lib.translation import N_, _
+from src.lifesim_lib.rng import DEFAULT_RNG, RNG
+from src.lifesim_lib.save_format import decode
+from src.lifesim_lib.save_store import atomic_write, get_store
+from src.lifesim_lib.screen import clear_screen, read_line
+from src.lifesim_lib.tax import tax_regime
 
 
 class PlayerDied(Exception):
@@ -11,58 +16,94 @@ class PlayerDied(Exception):
 
 
 def get_save_files():
-    return os.listdir(SAVE_PATH)
+    "Returns the IDs of all saves."
+    return get_store().list_ids()
 
 
 def get_saves(saves=None):
+    "Loads every save, or the saves with the given IDs. Use list_saves() when only the names and stats are needed."
     if saves is None:
         saves = get_save_files()
-    players = []
-    for filename in saves:
-        p = SAVE_PATH + "/" + filename
-        players.append(pickle.load(open(p, "rb")))
-    return players
+    store = get_store()
+    result = []
+    for ID in saves:
+        try:
+            result.append(decode(store.load(ID)))
+        except Exception as e:  # Skipped like list_saves() skips it
+            print(f"Skipping save {ID}: {e!r}", file=sys.stderr)
+    return result
+
+
+def list_saves():
+    "Returns the entries of all saves, most recently modified first."
+    return get_store().list_entries()
+
+
+def load_save(ID):
+    "Returns the plain data of a save (see save_format); pass it to Player.load."
+    return decode(get_store().load(ID))
+
+
+def delete_save_file(ID):
+    get_store().delete(ID)
+
+
+# Lives being played in this process; two sessions playing one life would save over each other
+open_lives = set()
+open_lives_lock = threading.Lock()
+session = threading.local()
+
+
+def open_life(ID):
+    "Marks a life as being played. Returns False if a session already has it open."
+    with open_lives_lock:
+        if ID in open_lives:
+            return False
+        open_lives.add(ID)
+        return True
+
+
+def close_life(ID):
+    with open_lives_lock:
+        open_lives.discard(ID)
+
+
+def life_is_open(ID):
+    return ID in open_lives
+
+
+def can_browse_saves():
+    "Whether the current session may list, load and delete saves (see play)."
+    return getattr(session, "browse_saves", True)
 
 
 def clamp(val, lo, hi):
     return max(lo, min(val, hi))
 
 
-def randexpo(lo, avg):
+def randexpo(lo, avg, rng=DEFAULT_RNG):
     "Returns a random number exponentially distributed, with a minimum of 'lo', averaging around 'avg'."
     assert lo < avg, "lo must be less than avg"
-    return lo + random.expovariate(1 / (avg - lo))
-
-
-def calculate_tax(salary):
-    tax = 0
-    prev = 0
-    brackets = SALARY_TAX_BRACKETS
-    for i in range(len(brackets) - 1):
-        bound, perc = brackets[i]
-        if salary <= bound:
-            tax += (salary - prev) * perc
-            break
-        else:
-            tax += (bound - prev) * perc
-        prev = bound
-    else:
-        tax += (salary - prev) * brackets[-1]
-    return round(tax)
+    return lo + rng.expovariate(1 / (avg - lo))
+
+
+def calculate_tax(salary, regime=None):
+    "Income tax on a salary, by the game's tax regime unless given another (see tax.py)."
+    return (regime or tax_regime()).tax(salary)
 
 
-def round_stochastic(value):
+def round_stochastic(value, rng=DEFAULT_RNG):
     """Randomly rounds a number up or down, based on its decimal part
     For example, 5.3 has a 70% chance to be rounded to 5, 30% chance to be rounded to 6
     And 2.8 has a 80% chance to be rounded to 3, 20% chance to be rounded to 2"""
     low = math.floor(value)
     high = math.ceil(value)
     if value < 0:
-        if random.random() < high - value:
+        if rng.random() < high - value:
             return low
         return high
     else:
-        if random.random() < value - low:
+        if rng.random() < value - low:
             return high
         return low
 
@@ -96,25 +137,33 @@ class Gender(Enum):
     Female = 1
 
     @staticmethod
-    def random():
-        return Gender.Male if random.uniform(0, 100) < 51.2 else Gender.Female
+    def random(rng=DEFAULT_RNG):
+        return Gender.Male if rng.uniform(0, 100) < 51.2 else Gender.Female
 
 
 class Trait(Enum):
     def __init__(self, name, desc, val, conflicts=None):
         assert type(val) is int, "Trait value must be an integer"
-        self.name_ = name
-        self.desc = desc
+        self.label = name
+        self.description = desc
         self.val = val
         self.conflicts = conflicts or []
 
+    @property
+    def name_(self):
+        return _(self.label)
+
+    @property
+    def desc(self):
+        return _(self.description)
+
     def conflicts_with(self, other):
-        return other.name in self.conflicts
+        return bool(self.conflict_mask & other.bit)
 
-    def roll_selection(self):
+    def roll_selection(self, rng=DEFAULT_RNG):
         if self.val == 0:
             return True
-        return random.randint(1, abs(self.val)) == 1
+        return rng.randint(1, abs(self.val)) == 1
 
     def get_color(self):
         if self.val > 0:
@@ -125,38 +174,38 @@ class Trait(Enum):
 
     # Name, description, value (1 if positive, -1 if negative, 0 if mixed), conflicts
     CHEERFUL = (
-        _("Cheerful"),
-        _("It is easier to increase your happiness by doing activities."),
+        N_("Cheerful"),
+        N_("It is easier to increase your happiness by doing activities."),
         1,
         ["GRUMPY"],
     )
     NERD = (
-        _("Nerd"),
-        _("You gain more smarts by going to the library and doing other activities."),
+        N_("Nerd"),
+        N_("You gain more smarts by going to the library and doing other activities."),
         1,
     )
     FAST_WORKER = (
-        _("Fast Worker"),
-        _("You tend to work faster, improving your performance over time."),
+        N_("Fast Worker"),
+        N_("You tend to work faster, improving your performance over time."),
         1,
         ["SLOW_WORKER"],
     )
 
     GRUMPY = (
-        _("Grumpy"),
-        _("It is difficult for you to be in a good mood."),
+        N_("Grumpy"),
+        N_("It is difficult for you to be in a good mood."),
         -1,
         ["CHEERFUL"],
     )
     SLOW_WORKER = (
-        _("Slow Worker"),
-        _("You tend to work slowly, lowering your performance."),
+        N_("Slow Worker"),
+        N_("You tend to work slowly, lowering your performance."),
         -1,
         ["FAST_WORKER"],
     )
     LAZY = (
-        _("Lazy"),
-        _(
+        N_("Lazy"),
+        N_(
             "You are often lazy on the job. Your stress and performance decrease over time, and you gain more stress when working harder."
         ),
         -1,
@@ -164,18 +213,92 @@ class Trait(Enum):
     )
 
     MOODY = (
-        _("Moody"),
-        _(
+        N_("Moody"),
+        N_(
             "Your mood can change more easily. All changes to your Happiness are more intense."
         ),
         0,
     )
 
 
+# A player's traits are kept as a mask of the bits of Trait members
+for index, trait in enumerate(Trait):
+    trait.bit = 1 << index
+for trait in Trait:  # Two traits conflict if either lists the other
+    trait.conflict_mask = sum(
+        other.bit
+        for other in Trait
+        if other.name in trait.conflicts or trait.name in other.conflicts
+    )
+del index, trait
+
+# The bits as plain ints, for hot paths: "player.traits & TraitBit.MOODY" takes a
+# fraction of the time looking up Trait.MOODY does
+TraitBit = SimpleNamespace(**{trait.name: trait.bit for trait in Trait})
+
+# How much a trait multiplies changes to happiness by (see Player.change_happiness)
+HAPPINESS_SCALES = {Trait.MOODY: 1.5}
+
+
+def traits_of(mask):
+    "The traits in a mask, in the order of Trait."
+    return [trait for trait in Trait if mask & trait.bit]
+
+
+def trait_mask(traits):
+    mask = 0
+    for trait in traits:
+        mask |= trait.bit
+    return mask
+
+
+def mask_conflicts(mask):
+    "Whether any two traits in a mask conflict."
+    return any(mask & trait.conflict_mask for trait in traits_of(mask))
+
+
+def mask_table(func):
+    "func(mask) for every mask of traits, indexed by mask."
+    return [func(mask) for mask in range(1 << len(Trait))]
+
+
+HAPPINESS_SCALE = mask_table(
+    lambda mask: math.prod(HAPPINESS_SCALES.get(t, 1) for t in traits_of(mask))
+)
+
+
+def trait_combinations():
+    """The masks of traits that don't conflict by number of traits, each with cumulative weights.
+
+    A combination is as likely as Trait.roll_selection passing for each of its traits.
+    """
+    combinations = []
+    for mask in range(1 << len(Trait)):
+        if mask_conflicts(mask):
+            continue
+        size = bin(mask).count("1")
+        while len(combinations) <= size:
+            combinations.append(([], []))
+        weight = math.prod(1 / abs(t.val) for t in traits_of(mask) if t.val)
+        masks, cumulative = combinations[size]
+        masks.append(mask)
+        cumulative.append((cumulative[-1] if cumulative else 0) + weight)
+    return combinations
+
+
+TRAIT_COMBINATIONS = trait_combinations()
+
+
+def random_traits(count, rng=DEFAULT_RNG):
+    "A random mask of count traits that don't conflict, or as many as can be if that is too many."
+    masks, cumulative = TRAIT_COMBINATIONS[min(count, len(TRAIT_COMBINATIONS) - 1)]
+    return masks[bisect.bisect(cumulative, rng.random() * cumulative[-1])]
+
+
 def int_input_range(lo, hi):
     while True:
         try:
-            val = int(input())
+            val = int(read_line())
         except ValueError:
             print(_("Invalid input; try again."))
             continue
@@ -188,7 +311,7 @@ def int_input_range(lo, hi):
 def int_input_range_optional(lo, hi):
     while True:
         try:
-            val = input()
+            val = read_line()
             if val is None:
                 return None
             val = int(val)
@@ -215,15 +338,15 @@ def yes_no(message):
     return choice_input(_("Yes"), _("No")) == 1
 
 
-def random_name(gender):
+def random_name(gender, rng=DEFAULT_RNG):
     if gender == Gender.Male:
-        return random.choice(MALE_NAMES)
+        return male_names().sample(rng)
     else:
-        return random.choice(FEMALE_NAMES)
+        return female_names().sample(rng)
 
 
 def press_enter():
-    input(_("Press Enter to continue..."))
+    read_line(_("Press Enter to continue..."), pause=True)
 
 
 def display_event(message):
@@ -263,7 +386,3 @@ def print_align_bars(*name_pairs, show_percent=False):
 def draw_bar(val, max_val, width):
     num = round(width * val / max_val)
     return "[" + "|" * num + " " * (width - num) + "]"
-
-
-def clear_screen():
-    os.system("cls" if platform == "win32" else "clear")
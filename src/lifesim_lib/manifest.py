@@ -0,0 +1,156 @@
+"""The manifest lists every save with just what the load screen shows, so the
+saves themselves only have to be read when one is loaded.
+
+It is a journal of JSON lines: {"op": "put", ...entry} when a save is written
+and {"op": "del", "ID": ...} when one is deleted. Appending a line is all a save
+or delete costs; the journal is rewritten without the old lines once they
+outnumber the live entries. If the manifest is lost or out of date, it is
+repaired from the save files.
+"""
+
+import json, os, sys, threading, time
+
+from src.lifesim_lib.const import SAVE_PATH
+from src.lifesim_lib.save_format import decode
+
+MANIFEST_NAME = "manifest.jsonl"
+SAVE_SUFFIX = ".sav"
+LEGACY_SUFFIX = ".pickle"  # Pickled saves from before the binary format
+
+# Saves are recorded from the background save writer while the menus may be listing them
+LOCK = threading.Lock()
+
+
+def manifest_path():
+    return SAVE_PATH + "/" + MANIFEST_NAME
+
+
+def save_file_path(ID):
+    "Returns the path of a save, which may still be a legacy pickle."
+    path = SAVE_PATH + "/" + ID + SAVE_SUFFIX
+    legacy = SAVE_PATH + "/" + ID + LEGACY_SUFFIX
+    if not os.path.exists(path) and os.path.exists(legacy):
+        return legacy
+    return path
+
+
+def save_file_id(name):
+    "Returns the ID of the save with the given filename, or None if it isn't a save."
+    for suffix in (SAVE_SUFFIX, LEGACY_SUFFIX):
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return None
+
+
+def make_entry(state, modified=None):
+    "Returns what the load screen shows of a save, from the plain data of the player."
+    return {
+        "ID": state["ID"],
+        "name": state["firstname"] + " " + state["lastname"],
+        "age": state["age"],
+        "alive": state["alive"],
+        "money": state["money"],
+        "modified": modified,
+    }
+
+
+def append_records(records):
+    with LOCK, open(manifest_path(), "a", encoding="utf-8") as f:
+        f.write("".join(json.dumps(r) + "\n" for r in records))
+
+
+def put_record(entry):
+    if entry["modified"] is None:
+        entry = {**entry, "modified": time.time()}
+    return {"op": "put", **entry}
+
+
+def record_save(entry):
+    append_records([put_record(entry)])
+
+
+def record_delete(ID):
+    append_records([{"op": "del", "ID": ID}])
+
+
+def read_manifest():
+    "Returns (entries by ID, number of journal lines), or None if there is no readable manifest."
+    entries = {}
+    lines = 0
+    try:
+        with open(manifest_path(), encoding="utf-8") as f:
+            for line in f:
+                lines += 1
+                try:
+                    record = json.loads(line)
+                    op = record.pop("op")
+                    if op == "put":
+                        entries[record["ID"]] = record
+                    elif op == "del":
+                        entries.pop(record["ID"], None)
+                except (ValueError, KeyError):
+                    continue  # A line cut short by a crash; the repair step fills it back in
+    except FileNotFoundError:
+        return None
+    return entries, lines
+
+
+def write_manifest(entries):
+    path = manifest_path()
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for entry in entries.values():
+            f.write(json.dumps({"op": "put", **entry}) + "\n")
+    os.replace(tmp, path)
+
+
+def entry_from_file(ID):
+    path = save_file_path(ID)
+    with open(path, "rb") as f:
+        data = decode(f.read())
+    return make_entry(data, os.path.getmtime(path))
+
+
+def list_saves():
+    """Returns the manifest entries of all saves, sorted by most recently modified.
+
+    Only saves missing from the manifest are read from disk, so a full rebuild
+    happens only if the manifest itself is gone."""
+    with LOCK:
+        return sorted(
+            repair_manifest().values(), key=lambda e: e["modified"], reverse=True
+        )
+
+
+def repair_manifest():
+    "Brings the manifest in line with the save files and returns its entries. LOCK must be held."
+    files = {save_file_id(name) for name in os.listdir(SAVE_PATH)} - {None}
+    result = read_manifest()
+    entries, lines = result or ({}, 0)
+    changed = result is None
+    for ID in list(entries):
+        if ID not in files:
+            del entries[ID]
+            changed = True
+    for ID in files - entries.keys():
+        try:
+            entries[ID] = entry_from_file(ID)
+        except (
+            Exception
+        ) as e:  # One unreadable save shouldn't keep the others from listing
+            print(f"Skipping save {ID}: {e!r}", file=sys.stderr)
+            continue
+        changed = True
+    if changed or lines > 2 * len(entries) + 100:
+        write_manifest(entries)
+    return entries
+
+
+def rebuild_manifest():
+    "Throws the manifest away and recreates it from the save files."
+    with LOCK:
+        try:
+            os.remove(manifest_path())
+        except FileNotFoundError:
+            pass
+    return list_saves()
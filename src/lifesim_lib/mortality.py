@@ -0,0 +1,96 @@
+"""How likely a character is to die in a year, worked out once for every age and health.
+
+A character dies of old age at an age drawn uniformly from OLD_AGE, or, each
+year past a frailty age drawn uniformly from 70 + health // 12 to
+90 + health // 3, with a chance of FRAIL_CHANCE. Both depend only on age and
+health, so death_chance() reads the chance of either from a table instead of
+drawing them, and a check costs one random number, or none before anyone can
+die. death_mask() does the same for arrays of ages and healths with NumPy,
+and survival() and life_expectancy() follow a life through the table.
+
+tests/test_mortality.py checks the table against the draws it replaces.
+"""
+
+from src.lifesim_lib.rng import get_numpy
+
+OLD_AGE = (95, 122)
+FRAIL_CHANCE = 0.65
+MIN_AGE = 70  # No one dies at this age or younger
+MAX_AGE = OLD_AGE[1]  # Everyone dies by this age
+MAX_HEALTH = 100
+
+table = []  # Chances by age from MIN_AGE to MAX_AGE, then health; see death_table
+array = None
+
+
+def death_probability(age, health):
+    "The chance of dying at age with health, worked out from the ranges the ages are drawn from."
+    lo, hi = OLD_AGE
+    old_age = min(max(age - lo + 1, 0), hi - lo + 1) / (hi - lo + 1)
+    lo, hi = MIN_AGE + health // 12, 90 + health // 3
+    frail = min(max(age - lo, 0), hi - lo + 1) / (hi - lo + 1) * FRAIL_CHANCE
+    return old_age + (1 - old_age) * frail
+
+
+def death_table():
+    "The table of death_probability, which is only worked out the first time."
+    if not table:
+        table.extend(
+            [death_probability(age, health) for health in range(MAX_HEALTH + 1)]
+            for age in range(MIN_AGE, MAX_AGE + 1)
+        )
+    return table
+
+
+def death_chance(age, health):
+    if age <= MIN_AGE:
+        return 0.0
+    return (table or death_table())[min(age, MAX_AGE) - MIN_AGE][health]
+
+
+def dies(age, health, rng):
+    "Whether a character of this age and health dies this year."
+    if age <= MIN_AGE:
+        return False
+    chance = (table or death_table())[min(age, MAX_AGE) - MIN_AGE][health]
+    return chance >= 1 or rng.random() < chance
+
+
+def death_mask(ages, healths, generator):
+    "dies() for arrays of ages and healths, drawing from a NumPy Generator; returns a mask of who dies."
+    global array
+    np = get_numpy()
+    if array is None:
+        array = np.array(death_table())
+    rows = np.clip(ages, MIN_AGE, MAX_AGE) - MIN_AGE
+    return generator.random(len(rows)) < array[rows, healths]
+
+
+def survival(health, age=0):
+    """The chance of being alive at each age from age on, given alive at age, if health stays the same.
+
+    Ends at the last age anyone can reach."""
+    alive = 1.0
+    curve = [alive]
+    for year in range(age + 1, MAX_AGE + 1):
+        alive *= 1 - death_chance(year, health)
+        curve.append(alive)
+    return curve
+
+
+def life_expectancy(health, age=0):
+    "The average age at death of someone alive at age, if health stays the same."
+    curve = survival(health, age)
+    return age + 1 + sum(curve[1:])
+
+
+def main():
+    healths = range(0, MAX_HEALTH + 1, 10)
+    print(f"{'health':>8}" + "".join(f"{h:>7}" for h in healths))
+    for age in (0, 80, 90, 100):
+        expected = "".join(f"{life_expectancy(h, age):7.1f}" for h in healths)
+        print(f"{'from ' + str(age):>8}{expected}")
+
+
+if __name__ == "__main__":
+    main()
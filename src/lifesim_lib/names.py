@@ -0,0 +1,255 @@
+"""Precompiled name corpus.
+
+assets/names.bin holds every name list in one file that is memory-mapped
+rather than parsed, so worker processes share the same pages and start
+without splitting text files into thousands of strings. Each list is a table
+of offsets into a blob of UTF-8 names, and optionally an alias table for
+drawing names by frequency in constant time. All numbers are little-endian,
+read in place on little-endian machines and copied elsewhere; each section
+starts on an 8-byte boundary.
+
+  header      MAGIC, VERSION, number of lists
+  list table  per list: kind, count, offsets, blob, probabilities and aliases positions
+  offsets     count + 1 uint32 offsets into the blob
+  blob        the names, UTF-8
+  prob        count float64, only for weighted lists
+  alias       count uint32, only for weighted lists
+
+Build it after editing the text files with: python -m src.lifesim_lib.names
+A name file line is a name, optionally followed by a tab and its weight. If
+the corpus is missing, or older than a text file, the text files are compiled
+in memory instead.
+"""
+
+import array, functools, mmap, os, struct, sys
+
+ASSETS_PATH = "assets"
+CORPUS_NAME = "names.bin"
+KINDS = ("male", "female", "last")
+
+MAGIC = b"LSNM"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+LIST_ENTRY = struct.Struct("<8sIIIII")
+
+# Whether the corpus's little-endian numbers can be read in place; elsewhere they are copied and swapped
+IN_PLACE = sys.byteorder == "little"
+
+
+def align(n):
+    return (n + 7) & ~7
+
+
+def alias_table(weights):
+    "Builds the probability and alias tables of Vose's alias method."
+    n = len(weights)
+    total = sum(weights)
+    scaled = [w * n / total for w in weights]
+    prob = [1.0] * n
+    alias = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1]
+    large = [i for i, p in enumerate(scaled) if p >= 1]
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] -= 1 - scaled[s]
+        (small if scaled[l] < 1 else large).append(l)
+    return prob, alias
+
+
+def build_corpus(lists):
+    "Returns the corpus file contents for {kind: (names, weights or None)}."
+    sections = []
+    pos = align(HEADER.size + LIST_ENTRY.size * len(lists))
+    entries = []
+    for kind, (names, weights) in lists.items():
+        encoded = [name.encode() for name in names]
+        offsets = [0]
+        for name in encoded:
+            offsets.append(offsets[-1] + len(name))
+        parts = [
+            struct.pack(f"<{len(offsets)}I", *offsets),
+            b"".join(encoded),
+        ]
+        if weights is not None:
+            prob, alias = alias_table(weights)
+            parts.append(struct.pack(f"<{len(prob)}d", *prob))
+            parts.append(struct.pack(f"<{len(alias)}I", *alias))
+        positions = []
+        for part in parts:
+            positions.append(pos)
+            sections.append((pos, part))
+            pos = align(pos + len(part))
+        if weights is None:
+            positions += [0, 0]
+        entries.append(LIST_ENTRY.pack(kind.encode(), len(names), *positions))
+    out = bytearray(pos)
+    header = HEADER.pack(MAGIC, VERSION, len(lists)) + b"".join(entries)
+    out[: len(header)] = header
+    for start, part in sections:
+        out[start : start + len(part)] = part
+    return bytes(out)
+
+
+def read_name_file(path):
+    "Returns (names, weights), with weights None if no line has one."
+    names = []
+    weights = []
+    with open(path, encoding="utf-8") as f:
+        for line in f.read().splitlines():
+            name, _, weight = line.partition("\t")
+            names.append(name)
+            weights.append(float(weight) if weight else None)
+    if all(w is None for w in weights):
+        return names, None
+    return names, [1.0 if w is None else w for w in weights]
+
+
+def name_file_path(kind):
+    return f"{ASSETS_PATH}/{kind}_names.txt"
+
+
+def read_name_files():
+    return {kind: read_name_file(name_file_path(kind)) for kind in KINDS}
+
+
+def read_numbers(buf, typecode, pos, count):
+    "count little-endian numbers of an array typecode (I or d) at pos of buf."
+    view = buf[pos : pos + struct.calcsize(typecode) * count]
+    if IN_PLACE:
+        return view.cast(typecode)
+    numbers = array.array(typecode, view.tobytes())
+    if sys.byteorder == "big":
+        numbers.byteswap()
+    return numbers
+
+
+class NameList:
+    """One list of the corpus.
+
+    Names are decoded from the blob when they are first drawn, so a process only
+    ever holds the strings of the names it has used."""
+
+    def __init__(self, buf, count, offsets_pos, blob_pos, prob_pos, alias_pos):
+        self.count = count
+        self.buf = buf
+        self.offsets = read_numbers(buf, "I", offsets_pos, count + 1)
+        self.blob = buf[blob_pos : blob_pos + self.offsets[count]]
+        self.weighted = prob_pos != 0
+        if self.weighted:
+            self.prob = read_numbers(buf, "d", prob_pos, count)
+            self.alias = read_numbers(buf, "I", alias_pos, count)
+        self.positions = (offsets_pos, prob_pos, alias_pos)
+        self.decoded = {}
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("name index out of range")
+        return self.name(i)
+
+    def name(self, i):
+        try:
+            return self.decoded[i]
+        except KeyError:
+            name = str(self.blob[self.offsets[i] : self.offsets[i + 1]], "utf-8")
+            self.decoded[i] = name
+            return name
+
+    def sample(self, rng):
+        """Draws a name with one uniform number from rng, by weight if the list has weights.
+
+        Unweighted lists draw exactly as rng.choice does."""
+        u = rng.random() * self.count
+        i = int(u)
+        if self.weighted and u - i >= self.prob[i]:
+            i = self.alias[i]
+        return self.name(i)
+
+    def sample_indices(self, k, generator):
+        "Draws k name indices at once with a NumPy Generator; look them up with self[i]."
+        import numpy as np
+
+        u = generator.random(k) * self.count
+        i = u.astype(np.int64)
+        if self.weighted:
+            offsets_pos, prob_pos, alias_pos = self.positions
+            prob = np.frombuffer(self.buf, "<f8", self.count, prob_pos)
+            alias = np.frombuffer(self.buf, "<u4", self.count, alias_pos)
+            i = np.where(u - i < prob[i], i, alias[i])
+        return i
+
+
+def open_corpus(path=None):
+    "Returns {kind: NameList} from the corpus file, or None if there isn't a usable one."
+    path = path or f"{ASSETS_PATH}/{CORPUS_NAME}"
+    try:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    return parse_corpus(memoryview(mapped))
+
+
+def parse_corpus(buf):
+    magic, version, count = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version != VERSION:
+        return None
+    lists = {}
+    for n in range(count):
+        kind, *fields = LIST_ENTRY.unpack_from(buf, HEADER.size + n * LIST_ENTRY.size)
+        lists[kind.rstrip(b"\0").decode()] = NameList(buf, *fields)
+    return lists
+
+
+def is_stale(path):
+    "Whether a name file was changed after the corpus at path was built."
+    try:
+        built = os.path.getmtime(path)
+    except OSError:
+        return False
+    for kind in KINDS:
+        try:
+            if os.path.getmtime(name_file_path(kind)) > built:
+                return True
+        except OSError:
+            pass
+    return False
+
+
+@functools.lru_cache(maxsize=None)
+def load_corpus():
+    "Returns every name list, from the corpus file or else compiled from the text files."
+    path = f"{ASSETS_PATH}/{CORPUS_NAME}"
+    if is_stale(path):
+        print(
+            f"{path} is older than the name files; rebuild it with: python -m src.lifesim_lib.names",
+            file=sys.stderr,
+        )
+        lists = None
+    else:
+        lists = open_corpus(path)
+    if lists is None:
+        lists = parse_corpus(memoryview(build_corpus(read_name_files())))
+    return lists
+
+
+def write_corpus(path=None):
+    path = path or f"{ASSETS_PATH}/{CORPUS_NAME}"
+    data = build_corpus(read_name_files())
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return len(data)
+
+
+if __name__ == "__main__":
+    size = write_corpus()
+    print(f"Wrote {ASSETS_PATH}/{CORPUS_NAME} ({size} bytes)")
@@ -0,0 +1,134 @@
+"""Times the phases of a year, such as ageing relations or random events, when LIFESIM_PROFILE is set.
+
+A method decorated with @phase(name) counts as that phase whenever it runs.
+Without LIFESIM_PROFILE the decorator returns the method unchanged, so it
+costs nothing. With it, each phase's calls and time are recorded under the
+stack of phases it ran in, and when the program exits a table of them is
+printed to stderr. If LIFESIM_PROFILE is a path rather than 1, the stacks are
+also written there in the folded format flame graph tools read
+("age_up;random_events;school_grades 1234", in microseconds).
+"""
+
+import atexit, functools, sys, threading, time
+
+from src.lifesim_lib.const import PROFILE
+
+ENABLED = bool(PROFILE)
+
+local = threading.local()
+profiles = []  # The Profile of every thread that ran a phase
+profiles_lock = threading.Lock()
+
+
+class Profile:
+    """The phases one thread ran: [calls, nanoseconds, nanoseconds in nested phases] by stack."""
+
+    def __init__(self):
+        self.stack = ()
+        self.stats = {}
+
+    def entry(self, stack):
+        entry = self.stats.get(stack)
+        if entry is None:
+            entry = self.stats[stack] = [0, 0, 0]
+        return entry
+
+
+def current_profile():
+    profile = getattr(local, "profile", None)
+    if profile is None:
+        profile = local.profile = Profile()
+        with profiles_lock:
+            profiles.append(profile)
+    return profile
+
+
+def phase(name):
+    "Decorator making a function count as the named phase while profiling."
+
+    def decorate(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            profile = current_profile()
+            outer = profile.stack
+            stack = profile.stack = outer + (name,)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter_ns() - start
+                profile.stack = outer
+                entry = profile.entry(stack)
+                entry[0] += 1
+                entry[1] += elapsed
+                if outer:
+                    profile.entry(outer)[2] += elapsed
+
+        return timed
+
+    return decorate
+
+
+def stack_stats():
+    "[calls, nanoseconds, nanoseconds in nested phases] by stack, for all threads."
+    merged = {}
+    with profiles_lock:
+        for profile in profiles:
+            for stack, entry in list(profile.stats.items()):
+                total = merged.setdefault(stack, [0, 0, 0])
+                for i, value in enumerate(entry):
+                    total[i] += value
+    return merged
+
+
+def reset():
+    with profiles_lock:
+        for profile in profiles:
+            profile.stats.clear()
+
+
+def summary():
+    "A table of each phase's calls and time, slowest first, counting only time outside nested phases as its own."
+    phases = {}
+    for stack, (calls, total, nested) in stack_stats().items():
+        entry = phases.setdefault(stack[-1], [0, 0, 0])
+        entry[0] += calls
+        if stack[-1] not in stack[:-1]:  # Count a phase running inside itself once
+            entry[1] += total
+        entry[2] += total - nested
+    lines = [f"{'phase':24}{'calls':>10}{'total ms':>12}{'own ms':>12}{'us/call':>10}"]
+    for name, (calls, total, own) in sorted(
+        phases.items(), key=lambda item: -item[1][2]
+    ):
+        lines.append(
+            f"{name:24}{calls:10}{total / 1e6:12.1f}{own / 1e6:12.1f}"
+            f"{total / calls / 1e3:10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def folded():
+    "The stacks in folded format, with each one's own time in microseconds."
+    lines = []
+    for stack, (calls, total, nested) in sorted(stack_stats().items()):
+        own = (total - nested) // 1000
+        if own > 0:
+            lines.append(f"{';'.join(stack)} {own}")
+    return "\n".join(lines) + "\n"
+
+
+def report():
+    if not any(profile.stats for profile in profiles):
+        return
+    print(summary(), file=sys.stderr)
+    if PROFILE != "1":
+        with open(PROFILE, "w") as f:
+            f.write(folded())
+        print(f"Folded stacks written to {PROFILE}", file=sys.stderr)
+
+
+if ENABLED:
+    atexit.register(report)
@@ -0,0 +1,164 @@
+import math, random, struct
+
+POOL_SIZE = 1024
+
+numpy_module = None
+
+
+def get_numpy():
+    "Returns the numpy module, or None if it isn't installed. It is only imported the first time."
+    global numpy_module
+    if numpy_module is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        numpy_module = numpy
+    return numpy_module or None
+
+
+class RNG:
+    """Random number source for one life.
+
+    Uniform numbers are drawn in bulk into a pool (by NumPy when it is installed,
+    otherwise by a private random.Random) and handed out one at a time, which is
+    much cheaper than going through the random module for every draw. The methods
+    behave like the functions of the same name in the random module.
+
+    Two RNGs made with the same seed produce the same draws, and separate RNGs
+    never share state, so independent lives can run side by side. The source is
+    only made at the first draw, so making an RNG doesn't import NumPy."""
+
+    def __init__(self, seed=None, pool_size=POOL_SIZE):
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed
+        self.pool_size = pool_size
+        self._source = None
+        self._pool = []
+
+    @property
+    def source(self):
+        if self._source is None:
+            np = get_numpy()
+            if np is not None:
+                self._source = np.random.default_rng(self.seed)
+            else:
+                self._source = random.Random(self.seed)
+        return self._source
+
+    def __getstate__(self):
+        # The pool is cheap to redraw and would make every save several KB larger
+        state = self.__dict__.copy()
+        state["_pool"] = []
+        return state
+
+    def __reduce_ex__(self, protocol):
+        if self is DEFAULT_RNG:
+            return "DEFAULT_RNG"
+        return super().__reduce_ex__(protocol)
+
+    def to_bytes(self):
+        "Returns the state of the RNG's source for the save format. The pool isn't included."
+        source = self.source
+        if isinstance(source, random.Random):
+            version, internal, gauss_next = source.getstate()
+            return b"R" + struct.pack(f"<{len(internal)}I", *internal)
+        state = source.bit_generator.state
+        if state["bit_generator"] != "PCG64":
+            raise ValueError(f"Can't save a {state['bit_generator']} RNG")
+        return (
+            b"P"
+            + state["state"]["state"].to_bytes(16, "little")
+            + state["state"]["inc"].to_bytes(16, "little")
+            + struct.pack("<BI", state["has_uint32"], state["uinteger"])
+        )
+
+    @classmethod
+    def from_bytes(cls, data, pool_size=POOL_SIZE):
+        "Restores an RNG saved with to_bytes."
+        kind = data[:1]
+        if kind == b"P" and get_numpy() is None:
+            # Saved where NumPy was installed; carry on from a seed taken from the state
+            return cls(int.from_bytes(data[1:17], "little"), pool_size)
+        rng = cls(0, pool_size)
+        rng.seed = None
+        if kind == b"R":
+            internal = struct.unpack(f"<{(len(data) - 1) // 4}I", data[1:])
+            rng._source = random.Random()
+            rng._source.setstate((3, internal, None))
+        elif kind == b"P":
+            has_uint32, uinteger = struct.unpack("<BI", data[33:38])
+            rng._source = get_numpy().random.default_rng(0)
+            rng._source.bit_generator.state = {
+                "bit_generator": "PCG64",
+                "state": {
+                    "state": int.from_bytes(data[1:17], "little"),
+                    "inc": int.from_bytes(data[17:33], "little"),
+                },
+                "has_uint32": has_uint32,
+                "uinteger": uinteger,
+            }
+        else:
+            raise ValueError(f"Unknown RNG kind {kind!r}")
+        return rng
+
+    def _refill(self):
+        source = self.source
+        if isinstance(source, random.Random):
+            rand = source.random
+            self._pool = [rand() for _ in range(self.pool_size)]
+        else:
+            self._pool = source.random(self.pool_size).tolist()
+
+    def random(self):
+        try:
+            return self._pool.pop()
+        except IndexError:
+            self._refill()
+            return self._pool.pop()
+
+    def randint(self, a, b):
+        if b < a:
+            raise ValueError(f"empty range for randint({a}, {b})")
+        try:
+            u = self._pool.pop()
+        except IndexError:
+            self._refill()
+            u = self._pool.pop()
+        return a + int(u * (b - a + 1))
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+    def sample(self, population, k):
+        pool = list(population)
+        n = len(pool)
+        if not 0 <= k <= n:
+            raise ValueError("Sample larger than population or is negative")
+        for i in range(k):
+            j = i + int(self.random() * (n - i))
+            pool[i], pool[j] = pool[j], pool[i]
+        return pool[:k]
+
+    def expovariate(self, lambd):
+        return -math.log(1.0 - self.random()) / lambd
+
+    def triangular(self, low=0.0, high=1.0, mode=None):
+        u = self.random()
+        try:
+            c = 0.5 if mode is None else (mode - low) / (high - low)
+        except ZeroDivisionError:
+            return low
+        if u > c:
+            u = 1.0 - u
+            c = 1.0 - c
+            low, high = high, low
+        return low + (high - low) * math.sqrt(u * c)
+
+
+# Used by characters and helpers that aren't given an RNG of their own
+DEFAULT_RNG = RNG()
@@ -0,0 +1,503 @@
+"""Events of a year written as data in assets/rules.json, compiled once into Python functions.
+
+A rule has a name, the hook of the year it runs at (HOOKS; see
+Player.run_rules), an optional condition and a list of effects:
+
+  {"name": "lightning", "hook": "events",
+   "when": "age >= 5 and randint(1, 5000) == 1",
+   "do": [{"message": "You were struck by lightning!"}, ...]}
+
+Rules at the "illness" hook also name an illness ("illness": "Depression") and
+run each year the player has it, in the order the illnesses were caught.
+
+Conditions and amounts are Python expressions over the player's numbers
+(PLAYER_FIELDS), has_trait("LAZY"), has_illness("Depression"), min, max, abs,
+round and the random draws randint(a, b), random(), uniform(a, b) and
+round_stochastic(x); anything else is refused when the rules are loaded.
+Effects run in order:
+
+  {"let": {"name": expr, ...}}          names values for the expressions after it
+  {"if": expr, "then": [...], "else": [...]}
+  {"change": {"health": expr, ...}}     changes stats (CHANGES) or money
+  {"relationship": {"with": "parents", "by": expr}}   or "siblings", "relations"
+  {"add_illness": name}, {"remove_illness": name}
+  {"message": text}, {"event": text}    translated, then formatted with
+                                        "format": {"amount": expr} if given
+  "show_stats", "pause"
+  {"die": text}
+
+Random numbers are drawn in the order they are written, as the same code in
+Python would draw them, so moving an event into a rule doesn't change seeded
+lives. Each rule becomes the source of one Python function, compiled when the
+rules are first used, so running it costs what hand-written code would.
+
+Rules can also run on a whole Population at once (Population.run_rules): each
+expression is then computed for every character with NumPy, and effects apply
+to the characters whose conditions held. Rules that use what a Population
+doesn't keep, like money, stress or messages with amounts, are skipped there.
+
+Rule texts are msgids of lifesim.pot. `python3 -m src.lifesim_lib.rules`
+checks that the rules compile and lists the texts missing from it.
+"""
+
+import ast, functools, json, sys
+from itertools import count
+
+from src.lifesim_lib.lifesim_lib import Trait, round_stochastic
+from src.lifesim_lib.names import ASSETS_PATH
+from src.lifesim_lib.rng import get_numpy
+from src.lifesim_lib.translation import _
+from src.people.classes.parent import Parent
+from src.people.classes.person import Person
+from src.people.classes.sibling import Sibling
+
+RULES_PATH = f"{ASSETS_PATH}/rules.json"
+
+HOOKS = ("onset", "events", "illness", "work")
+
+PLAYER_FIELDS = {
+    "age",
+    "happiness",
+    "health",
+    "smarts",
+    "looks",
+    "karma",
+    "money",
+    "stress",
+    "performance",
+    "salary",
+    "has_job",
+    "years_worked",
+    "uv_years",
+    "student_loan",
+}
+POPULATION_FIELDS = {"age", "happiness", "health", "smarts", "looks"}
+CHANGES = {"happiness", "health", "smarts", "looks", "karma", "stress", "performance"}
+POPULATION_CHANGES = {"happiness", "health", "smarts", "looks"}
+GROUPS = {"parents": "Parent", "siblings": "Sibling", "relations": "Person"}
+
+OPERATORS = (
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.Not,
+    ast.USub,
+    ast.UAdd,
+    ast.And,
+    ast.Or,
+    ast.Eq,
+    ast.NotEq,
+    ast.Lt,
+    ast.LtE,
+    ast.Gt,
+    ast.GtE,
+)
+
+EFFECTS = {  # Kind of effect -> the other keys it may have
+    "let": (),
+    "if": ("then", "else"),
+    "change": (),
+    "relationship": (),
+    "add_illness": (),
+    "remove_illness": (),
+    "message": ("format",),
+    "event": ("format",),
+    "die": (),
+}
+
+
+class RuleError(ValueError):
+    pass
+
+
+def call(name, *args):
+    return ast.Call(ast.Name(name, ast.Load()), list(args), [])
+
+
+def method(obj, name, *args):
+    func = ast.Attribute(ast.Name(obj, ast.Load()), name, ast.Load())
+    return ast.Call(func, list(args), [])
+
+
+def constant_arg(node, name):
+    if len(node.args) != 1 or not isinstance(node.args[0], ast.Constant):
+        raise RuleError(f"{name}() takes one name in quotes")
+    return node.args[0].value
+
+
+class Expression:
+    """Turns the expressions of one rule into Python source, for a player (p) or a Population (pop)."""
+
+    def __init__(self, batch):
+        self.batch = batch
+        self.fields = POPULATION_FIELDS if batch else PLAYER_FIELDS
+        self.lets = set()
+
+    def source(self, text):
+        try:
+            tree = ast.parse(str(text).strip(), mode="eval")
+        except SyntaxError as e:
+            raise RuleError(f"Can't read {text!r}: {e.msg}")
+        return ast.unparse(self.convert(tree.body))
+
+    def convert(self, node):
+        if isinstance(node, ast.Constant):
+            if type(node.value) not in (int, float, bool):
+                raise RuleError(f"Unexpected {node.value!r}")
+            return node
+        if isinstance(node, ast.Name):
+            if node.id in self.lets:
+                return ast.Name(f"v_{node.id}", ast.Load())
+            if node.id in self.fields:
+                target = "pop" if self.batch else "p"
+                return ast.Attribute(ast.Name(target, ast.Load()), node.id, ast.Load())
+            raise RuleError(f"Unknown name {node.id!r}")
+        if isinstance(node, ast.BoolOp):
+            self.check_operator(node.op)
+            values = [self.convert(value) for value in node.values]
+            if not self.batch:
+                return ast.BoolOp(node.op, values)
+            op = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+            return functools.reduce(lambda a, b: ast.BinOp(a, op, b), values)
+        if isinstance(node, ast.UnaryOp):
+            self.check_operator(node.op)
+            op = (
+                ast.Invert() if self.batch and isinstance(node.op, ast.Not) else node.op
+            )
+            return ast.UnaryOp(op, self.convert(node.operand))
+        if isinstance(node, ast.BinOp):
+            self.check_operator(node.op)
+            return ast.BinOp(self.convert(node.left), node.op, self.convert(node.right))
+        if isinstance(node, ast.Compare):
+            for op in node.ops:
+                self.check_operator(op)
+            if self.batch and len(node.ops) > 1:
+                raise RuleError("Chained comparisons can't run on a population")
+            return ast.Compare(
+                self.convert(node.left),
+                node.ops,
+                [self.convert(value) for value in node.comparators],
+            )
+        if isinstance(node, ast.IfExp):
+            parts = [self.convert(part) for part in (node.test, node.body, node.orelse)]
+            if self.batch:
+                return method("np", "where", *parts)
+            return ast.IfExp(*parts)
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.keywords:
+                raise RuleError("Only functions can be called, without keywords")
+            return self.convert_call(node.func.id, node)
+        raise RuleError(f"Unexpected {ast.unparse(node)!r}")
+
+    def check_operator(self, op):
+        if not isinstance(op, OPERATORS):
+            raise RuleError(f"Unexpected operator {type(op).__name__}")
+
+    def convert_call(self, name, node):
+        if name == "has_trait":
+            trait = constant_arg(node, name)
+            if trait not in Trait.__members__:
+                raise RuleError(f"Unknown trait {trait!r}")
+            target = "pop" if self.batch else "p"
+            traits = ast.Attribute(ast.Name(target, ast.Load()), "traits", ast.Load())
+            bit = ast.BinOp(traits, ast.BitAnd(), ast.Constant(Trait[trait].bit))
+            return ast.Compare(bit, [ast.NotEq()], [ast.Constant(0)])
+        if name == "has_illness":
+            illness = ast.Constant(constant_arg(node, name))
+            if self.batch:
+                return method("pop", "illness", illness)
+            illnesses = ast.Attribute(
+                ast.Name("p", ast.Load()), "illnesses", ast.Load()
+            )
+            return ast.Compare(illness, [ast.In()], [illnesses])
+        args = [self.convert(arg) for arg in node.args]
+        n = ast.Name("n", ast.Load())
+        if name == "randint" and len(args) == 2:
+            if self.batch:
+                hi = ast.BinOp(args[1], ast.Add(), ast.Constant(1))
+                return method("rng", "integers", args[0], hi, n)
+            return method("rng", "randint", *args)
+        if name == "random" and not args:
+            return method("rng", "random", n) if self.batch else method("rng", "random")
+        if name == "uniform" and len(args) == 2:
+            return method("rng", "uniform", *args, *([n] if self.batch else []))
+        if name == "round_stochastic" and len(args) == 1:
+            extra = [ast.Name("n", ast.Load())] if self.batch else []
+            return call(
+                "round_stochastic", args[0], ast.Name("rng", ast.Load()), *extra
+            )
+        if name in ("min", "max") and len(args) == 2:
+            if self.batch:
+                return method("np", "minimum" if name == "min" else "maximum", *args)
+            return call(name, *args)
+        if name in ("abs", "round") and len(args) == 1:
+            if self.batch:
+                return method("np", "abs" if name == "abs" else "rint", *args)
+            return call(name, *args)
+        raise RuleError(f"Unknown function {name}() with {len(args)} arguments")
+
+
+class Compiler:
+    """Writes the source of a rule's function: rule(p) for a player, or rule(pop, rng, n) for a Population."""
+
+    def __init__(self, rule, batch):
+        self.rule = rule
+        self.batch = batch
+        self.expression = Expression(batch)
+        self.masks = count(1)
+        self.lines = []
+
+    def expr(self, text):
+        return self.expression.source(text)
+
+    def write(self, indent, line):
+        self.lines.append("    " * indent + line)
+
+    def source(self):
+        rule = self.rule
+        if self.batch:
+            self.write(0, "def rule(pop, rng, n):")
+            mask = "pop.alive"
+            if rule.get("illness"):
+                mask += f" & pop.illness({rule['illness']!r})"
+            if "when" in rule:
+                mask += f" & ({self.expr(rule['when'])})"
+            self.write(1, f"m0 = {mask}")
+            self.block(rule["do"], 1, "m0")
+        else:
+            self.write(0, "def rule(p):")
+            self.write(1, "rng = p.rng")
+            if "when" in rule:
+                self.write(1, f"if not ({self.expr(rule['when'])}):")
+                self.write(2, "return")
+            self.block(rule["do"], 1, None)
+        return "\n".join(self.lines) + "\n"
+
+    def block(self, effects, indent, mask):
+        start = len(self.lines)
+        for effect in effects:
+            self.effect(effect, indent, mask)
+        if len(self.lines) == start:
+            self.write(indent, "pass")
+
+    def effect(self, effect, indent, mask):
+        if effect in ("show_stats", "pause"):
+            if not self.batch:
+                self.write(indent, f"p.frontend.{effect}(p)")
+            return
+        kinds = [
+            kind for kind in EFFECTS if isinstance(effect, dict) and kind in effect
+        ]
+        if len(kinds) != 1:
+            raise RuleError(f"Can't tell what {effect!r} does")
+        kind = kinds[0]
+        unknown = set(effect) - {kind, *EFFECTS[kind]}
+        if unknown:
+            raise RuleError(f"Unexpected {', '.join(sorted(unknown))} in {kind}")
+        getattr(self, f"effect_{kind}")(effect, indent, mask)
+
+    def effect_let(self, effect, indent, mask):
+        for name, value in effect["let"].items():
+            if not name.isidentifier():
+                raise RuleError(f"Bad name {name!r}")
+            source = self.expr(value)
+            self.expression.lets.add(name)
+            self.write(indent, f"v_{name} = {source}")
+
+    def effect_if(self, effect, indent, mask):
+        test = self.expr(effect["if"])
+        if self.batch:
+            i = next(self.masks)
+            self.write(indent, f"c{i} = {test}")
+            self.write(indent, f"m{i} = {mask} & c{i}")
+            self.block(effect.get("then", []), indent, f"m{i}")
+            if "else" in effect:
+                self.write(indent, f"m{i} = {mask} & ~c{i}")
+                self.block(effect["else"], indent, f"m{i}")
+            return
+        self.write(indent, f"if {test}:")
+        self.block(effect.get("then", []), indent + 1, mask)
+        if "else" in effect:
+            self.write(indent, "else:")
+            self.block(effect["else"], indent + 1, mask)
+
+    def effect_change(self, effect, indent, mask):
+        for stat, amount in effect["change"].items():
+            amount = self.expr(amount)
+            if self.batch:
+                if stat not in POPULATION_CHANGES:
+                    raise RuleError(f"A population has no {stat}")
+                self.write(indent, f"pop.change({stat!r}, {mask}, {amount})")
+            elif stat == "money":
+                self.write(indent, f"p.money += {amount}")
+            elif stat in CHANGES:
+                self.write(indent, f"p.change_{stat}({amount})")
+            else:
+                raise RuleError(f"Can't change {stat!r}")
+
+    def effect_relationship(self, effect, indent, mask):
+        spec = effect["relationship"]
+        if set(spec) != {"with", "by"} or spec["with"] not in GROUPS:
+            raise RuleError(f"relationship needs with ({', '.join(GROUPS)}) and by")
+        if self.batch:
+            raise RuleError("A population has no relations")
+        amount = self.expr(spec["by"])
+        self.write(indent, "for relation in p.relations:")
+        self.write(indent + 1, f"if isinstance(relation, {GROUPS[spec['with']]}):")
+        self.write(indent + 2, f"relation.change_relationship({amount})")
+
+    def effect_add_illness(self, effect, indent, mask, add=True):
+        name = effect["add_illness" if add else "remove_illness"]
+        if self.batch:
+            self.write(indent, f"pop.set_illness({name!r}, {mask}, {add})")
+        else:
+            self.write(indent, f"p.{'add' if add else 'remove'}_illness({name!r})")
+
+    def effect_remove_illness(self, effect, indent, mask):
+        self.effect_add_illness(effect, indent, mask, add=False)
+
+    def effect_message(self, effect, indent, mask, kind="message"):
+        text = f"_({effect[kind]!r})"
+        if "format" in effect:
+            if self.batch:
+                raise RuleError("Amounts in messages can't be shown for a population")
+            values = ", ".join(
+                f"{name}={self.expr(value)}" for name, value in effect["format"].items()
+            )
+            text += f".format({values})"
+        if not self.batch:
+            self.write(indent, f"p.frontend.{kind}(p, {text})")
+
+    def effect_event(self, effect, indent, mask):
+        self.effect_message(effect, indent, mask, kind="event")
+
+    def effect_die(self, effect, indent, mask):
+        if self.batch:
+            self.write(indent, f"pop.kill({mask})")
+        else:
+            self.write(indent, f"p.die(_({effect['die']!r}))")
+
+
+def round_stochastic_array(value, rng, n):
+    "round_stochastic for every character of a population."
+    np = get_numpy()
+    value = np.broadcast_to(value, n)
+    low = np.floor(value)
+    return (low + (rng.random(n) < value - low)).astype(np.int64)
+
+
+class Rule:
+    """A compiled rule. run(player) runs it on a player; batch(population) on a Population."""
+
+    def __init__(self, data):
+        for key in ("name", "hook", "do"):
+            if key not in data:
+                raise RuleError(f"A rule needs a {key}")
+        self.name = data["name"]
+        self.hook = data["hook"]
+        self.illness = data.get("illness")
+        if self.hook not in HOOKS:
+            raise RuleError(f"Unknown hook {self.hook!r}")
+        if (self.hook == "illness") != bool(self.illness):
+            raise RuleError(
+                "Rules at the illness hook, and only those, name an illness"
+            )
+        self.data = data
+        self.source = Compiler(data, batch=False).source()
+        namespace = {
+            "Parent": Parent,
+            "Sibling": Sibling,
+            "Person": Person,
+            "round_stochastic": round_stochastic,
+            "_": _,
+        }
+        self.run = self.compile(self.source, namespace)
+        try:
+            self.batch_source = Compiler(data, batch=True).source()
+        except RuleError as e:
+            self.batch_source = None
+            self.batch_error = str(e)
+        self.batch_function = None
+
+    def compile(self, source, namespace):
+        exec(compile(source, f"<rule {self.name}>", "exec"), namespace)
+        return namespace["rule"]
+
+    def texts(self):
+        "The texts this rule shows, to translate."
+
+        def walk(effects):
+            for effect in effects:
+                if isinstance(effect, dict):
+                    for kind in ("message", "event", "die"):
+                        if kind in effect:
+                            yield effect[kind]
+                    yield from walk(effect.get("then", []))
+                    yield from walk(effect.get("else", []))
+
+        return list(walk(self.data["do"]))
+
+    def batch(self, population):
+        "Runs the rule on every living character of a Population. Raises RuleError if it can't run on one."
+        if self.batch_source is None:
+            raise RuleError(
+                f"Rule {self.name} can't run on a population: {self.batch_error}"
+            )
+        if self.batch_function is None:
+            namespace = {"np": get_numpy(), "round_stochastic": round_stochastic_array}
+            self.batch_function = self.compile(self.batch_source, namespace)
+        self.batch_function(population, population.rng, len(population))
+
+
+class RuleSet:
+    """Rules by hook, in the order they were written, and the illness hook's by illness."""
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.hooks = {hook: [] for hook in HOOKS}
+        self.illnesses = {}
+        for rule in rules:
+            self.hooks[rule.hook].append(rule)
+            if rule.illness:
+                self.illnesses.setdefault(rule.illness, []).append(rule)
+
+    @classmethod
+    def load(cls, path=RULES_PATH):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        rules = []
+        for item in data["rules"]:
+            try:
+                rules.append(Rule(item))
+            except RuleError as e:
+                raise RuleError(f"{path}: rule {item.get('name')}: {e}") from None
+        return cls(rules)
+
+
+@functools.lru_cache(maxsize=None)
+def load_rules():
+    "Returns the game's RuleSet, which is only read and compiled the first time."
+    return RuleSet.load()
+
+
+def main():
+    rules = load_rules()
+    with open("lifesim.pot", encoding="utf-8") as f:
+        pot = f.read()
+    missing = 0
+    for rule in rules.rules:
+        batch = "yes" if rule.batch_source else f"no ({rule.batch_error})"
+        print(f"{rule.name}: {rule.hook}, on populations: {batch}")
+        for text in rule.texts():
+            if f"msgid {json.dumps(text, ensure_ascii=False)}" not in pot:
+                print(f"  not in lifesim.pot: {text!r}")
+                missing += 1
+    print(f"{len(rules.rules)} rules compiled")
+    sys.exit(1 if missing else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""Versioned binary save format.
+
+A save is MAGIC, a version number and the player record. Every record type is
+described by a schema: a list of (field, type) pairs, where the type is either a
+struct code for fixed-size fields or one of the variable-size types below. The
+fixed-size fields of a record are packed together with one precompiled Struct.
+
+  str        UTF-8 string
+  strs       list of strings
+  bytes      raw bytes (the RNG state)
+  relations  list of relation records, each preceded by its type's index in RELATION_TYPES
+
+A struct code followed by "?" is optional and stores None as -1.
+
+Decoding returns plain data: a dict of the player's fields with "relations" as a
+list of dicts (each with a "type" key), "gender" as an int, "traits" as trait
+names and "rng" as RNG.to_bytes() output, or None. Player.load_data turns that
+into objects. Older versions are upgraded one step at a time through MIGRATIONS
+before they are returned. Version 1 is the old pickled Player state, which is
+unpickled with SaveUnpickler so a crafted file can't run code.
+"""
+
+import io, pickle, struct
+
+MAGIC = b"LSAV"
+VERSION = 3
+
+HEADER = struct.Struct("<4sH")
+LENGTH = struct.Struct("<H")
+
+PERSON_FIELDS = [
+    ("firstname", "str"),
+    ("lastname", "str"),
+    ("age", "B"),
+    ("gender", "B"),
+    ("happiness", "B"),
+    ("health", "B"),
+    ("smarts", "B"),
+    ("looks", "B"),
+    ("alive", "?"),
+]
+RELATION_FIELDS = PERSON_FIELDS + [
+    ("relationship", "B"),
+    ("spent_time", "?"),
+    ("had_conversation", "?"),
+    ("was_complimented", "?"),
+]
+
+SCHEMAS = {
+    2: {
+        "Player": PERSON_FIELDS
+        + [
+            ("ID", "str"),
+            ("karma", "B"),
+            ("total_happiness", "i"),
+            ("money", "q"),
+            ("depressed", "?"),
+            ("student_loan", "i"),
+            ("chose_student_loan", "?"),
+            ("uv_years", "B"),
+            ("meditated", "?"),
+            ("worked_out", "?"),
+            ("visited_library", "?"),
+            ("studied", "?"),
+            ("tried_to_drop_out", "?"),
+            ("played", "?"),
+            ("did_arts_and_crafts", "?"),
+            ("worked_harder", "?"),
+            ("listened_to_music", "?"),
+            ("grades", "b?"),
+            ("dropped_out", "?"),
+            ("teen_looks_inc", "B"),
+            ("times_meditated", "i"),
+            ("salary", "i"),
+            ("years_worked", "i"),
+            ("has_job", "?"),
+            ("lottery_jackpot", "q"),
+            ("stress", "B"),
+            ("performance", "B"),
+            ("traits", "strs"),
+            ("illnesses", "strs"),
+            ("rng", "bytes"),
+            ("relations", "relations"),
+        ],
+        "Parent": RELATION_FIELDS + [("generosity", "B"), ("money", "i")],
+        "Sibling": RELATION_FIELDS + [("petulance", "B")],
+    },
+}
+# Version 3 adds the events scheduled for the player (see schedule.py) as "age:name"
+SCHEMAS[3] = {
+    **SCHEMAS[2],
+    "Player": SCHEMAS[2]["Player"][:-2]
+    + [("schedule", "strs")]
+    + SCHEMAS[2]["Player"][-2:],
+}
+
+RELATION_TYPES = ("Parent", "Sibling")
+
+VAR_TYPES = ("str", "strs", "bytes", "relations")
+
+
+class SaveFormatError(Exception):
+    pass
+
+
+class Record:
+    """A schema compiled for encoding and decoding."""
+
+    def __init__(self, fields):
+        fixed = [(name, t) for name, t in fields if t not in VAR_TYPES]
+        self.fixed_names = [name for name, t in fixed]
+        self.optional = [i for i, (name, t) in enumerate(fixed) if t.endswith("?")]
+        self.struct = struct.Struct(
+            "<" + "".join(t if t == "?" else t.rstrip("?") for name, t in fixed)
+        )
+        self.var = [(name, t) for name, t in fields if t in VAR_TYPES]
+
+
+COMPILED = {
+    version: {name: Record(fields) for name, fields in schema.items()}
+    for version, schema in SCHEMAS.items()
+}
+
+
+def pack_bytes(out, b):
+    out.append(LENGTH.pack(len(b)))
+    out.append(b)
+
+
+def encode_record(out, record, data):
+    values = [data[name] for name in record.fixed_names]
+    for i in record.optional:
+        if values[i] is None:
+            values[i] = -1
+    try:
+        out.append(record.struct.pack(*values))
+    except struct.error as e:
+        raise SaveFormatError(f"Can't save {values}: {e}") from None
+    for name, t in record.var:
+        value = data[name]
+        if t == "str":
+            pack_bytes(out, value.encode())
+        elif t == "strs":
+            out.append(LENGTH.pack(len(value)))
+            for s in value:
+                pack_bytes(out, s.encode())
+        elif t == "bytes":
+            pack_bytes(out, value or b"")
+        elif t == "relations":
+            out.append(LENGTH.pack(len(value)))
+            schema = COMPILED[VERSION]
+            for relation in value:
+                kind = relation["type"]
+                out.append(bytes([RELATION_TYPES.index(kind)]))
+                encode_record(out, schema[kind], relation)
+
+
+def encode(data):
+    "Encodes the plain data of a player (see Player.to_data) as the current version."
+    out = [HEADER.pack(MAGIC, VERSION)]
+    encode_record(out, COMPILED[VERSION]["Player"], data)
+    return b"".join(out)
+
+
+def unpack_bytes(buf, pos):
+    (n,) = LENGTH.unpack_from(buf, pos)
+    pos += 2
+    return bytes(buf[pos : pos + n]), pos + n
+
+
+def decode_record(buf, pos, schema, kind):
+    record = schema[kind]
+    data = dict(zip(record.fixed_names, record.struct.unpack_from(buf, pos)))
+    pos += record.struct.size
+    for i in record.optional:
+        name = record.fixed_names[i]
+        if data[name] == -1:
+            data[name] = None
+    for name, t in record.var:
+        if t == "str":
+            value, pos = unpack_bytes(buf, pos)
+            value = value.decode()
+        elif t == "strs":
+            (n,) = LENGTH.unpack_from(buf, pos)
+            pos += 2
+            value = []
+            for _ in range(n):
+                s, pos = unpack_bytes(buf, pos)
+                value.append(s.decode())
+        elif t == "bytes":
+            value, pos = unpack_bytes(buf, pos)
+            value = value or None
+        elif t == "relations":
+            (n,) = LENGTH.unpack_from(buf, pos)
+            pos += 2
+            value = []
+            for _ in range(n):
+                relation_kind = RELATION_TYPES[buf[pos]]
+                relation, pos = decode_record(buf, pos + 1, schema, relation_kind)
+                relation["type"] = relation_kind
+                value.append(relation)
+        data[name] = value
+    return data, pos
+
+
+# The globals a version 1 save may refer to: the game's classes, the data types
+# pickle needs and what pickling an RNG wrote (a random.Random, or NumPy's Generator)
+V1_GLOBALS = {
+    "builtins": {"set", "frozenset", "list", "dict", "tuple", "bytearray", "complex"},
+    "src.lifesim_lib.lifesim_lib": {"Gender", "Trait"},
+    "src.lifesim_lib.rng": {"RNG", "DEFAULT_RNG"},
+    "src.people.classes.person": {"Person"},
+    "src.people.classes.parent": {"Parent"},
+    "src.people.classes.sibling": {"Sibling"},
+    "src.people.classes.player": {"Player"},
+    "random": {"Random"},
+    "numpy": {"ndarray", "dtype"},
+    "numpy.core.multiarray": {"_reconstruct"},
+    "numpy._core.multiarray": {"_reconstruct"},
+    "numpy.random._pickle": {"__generator_ctor", "__bit_generator_ctor"},
+    "numpy.random._pcg64": {"PCG64"},
+    "numpy.random.bit_generator": {"SeedSequence", "__pyx_unpickle_SeedSequence"},
+}
+
+
+class SaveUnpickler(pickle.Unpickler):
+    "Unpickles version 1 saves, refusing any global that isn't in V1_GLOBALS."
+
+    def find_class(self, module, name):
+        if name not in V1_GLOBALS.get(module, ()):
+            raise pickle.UnpicklingError(f"{module}.{name} isn't allowed in a save")
+        return super().find_class(module, name)
+
+
+def decode(buf):
+    "Decodes a save of any version into the plain data of the current version."
+    if buf[:4] == MAGIC:
+        magic, version = HEADER.unpack_from(buf, 0)
+        if version not in COMPILED:
+            raise SaveFormatError(f"Unknown save version {version}")
+        try:
+            data, pos = decode_record(buf, HEADER.size, COMPILED[version], "Player")
+        except (struct.error, IndexError, UnicodeDecodeError) as e:
+            raise SaveFormatError(f"Corrupt save: {e}") from None
+    else:
+        version = 1
+        try:
+            data = SaveUnpickler(io.BytesIO(buf)).load()
+        except Exception as e:
+            raise SaveFormatError(f"Corrupt save: {e}") from None
+    while version < VERSION:
+        data = MIGRATIONS[version](data)
+        version += 1
+    return data
+
+
+def field_default(t):
+    "The value of a field of type t that an old save doesn't have."
+    if t in VAR_TYPES:
+        return {"str": "", "strs": [], "bytes": None, "relations": []}[t]
+    if t.endswith("?") and t != "?":
+        return None
+    return False if t == "?" else 0
+
+
+def migrate_1_to_2(state):
+    "Pickled Player state (the old format) to plain data."
+    data = {name: state.get(name, field_default(t)) for name, t in SCHEMAS[2]["Player"]}
+    data["gender"] = state["gender"].value
+    data["traits"] = sorted(trait.name for trait in state.get("traits", ()))
+    data["illnesses"] = list(state.get("illnesses", ()))
+    rng = state.get("rng")
+    data["rng"] = rng.to_bytes() if rng is not None else None
+    relations = []
+    for relation in state["relations"]:
+        # Read field by field: characters pickled before a slot was added don't have it
+        kind = type(relation).__name__
+        rel_data = {
+            name: getattr(relation, name, field_default(t))
+            for name, t in SCHEMAS[2][kind]
+        }
+        rel_data["gender"] = relation.gender.value
+        rel_data["type"] = kind
+        relations.append(rel_data)
+    data["relations"] = relations
+    return data
+
+
+def migrate_2_to_3(data):
+    "Schedules the events that version 2 found by checking the player's state every year."
+    schedule = []
+    if data["uv_years"] > 0:
+        schedule.append(f"{data['age'] + 1}:university_year")
+    if data["student_loan"] > 0:
+        schedule.append(f"{data['age'] + 1}:loan_payment")
+    return {**data, "schedule": schedule}
+
+
+MIGRATIONS = {1: migrate_1_to_2, 2: migrate_2_to_3}
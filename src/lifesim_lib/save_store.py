@@ -0,0 +1,341 @@
+"""Where saves are kept.
+
+A SaveStore holds encoded saves (see save_format) keyed by Player.ID, each
+with an entry of what the load screen shows: ID, name, age, alive, money and
+modified. FileSaveStore keeps one file per save listed by the manifest;
+SQLiteSaveStore keeps every save as a row of one database with indexed
+columns, which suits many lives. SAVE_BACKEND in const.py picks which one
+get_store() returns.
+"""
+
+import abc, contextlib, os, sqlite3, threading, time
+
+from src.lifesim_lib.const import SAVE_BACKEND, SAVE_DB, SAVE_PATH
+from src.lifesim_lib.manifest import (
+    LEGACY_SUFFIX,
+    SAVE_SUFFIX,
+    append_records,
+    list_saves,
+    put_record,
+    save_file_id,
+    save_file_path,
+)
+
+
+def atomic_write(path, data):
+    "Writes data to path so that a crash leaves either the old or the new file, never a partial one."
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class SaveStore(abc.ABC):
+    """Interface of a save backend. A backend missing one of the abstract methods can't be created."""
+
+    @abc.abstractmethod
+    def list_ids(self):
+        pass
+
+    @abc.abstractmethod
+    def list_entries(self):
+        "Returns the entries of all saves, most recently modified first."
+
+    @abc.abstractmethod
+    def load(self, ID):
+        "Returns the encoded save. Raises KeyError if there is no such save."
+
+    @abc.abstractmethod
+    def put(self, entry, data):
+        "Stores an encoded save. A modified of None in the entry means now."
+
+    @abc.abstractmethod
+    def delete(self, ID):
+        pass
+
+    def batch(self):
+        "Context manager grouping the writes made inside it, so many saves cost about as much as one."
+        return contextlib.nullcontext()
+
+    def put_many(self, items):
+        "Stores (entry, data) pairs in one batch."
+        with self.batch():
+            for entry, data in items:
+                self.put(entry, data)
+
+    def search(
+        self,
+        name=None,
+        alive=None,
+        min_age=None,
+        max_age=None,
+        min_money=None,
+        max_money=None,
+        limit=None,
+    ):
+        "Returns the entries matching every given filter, most recently modified first. name matches the start of the name, ignoring case."
+        result = []
+        for entry in self.list_entries():
+            if name is not None and not entry["name"].lower().startswith(name.lower()):
+                continue
+            if alive is not None and entry["alive"] != alive:
+                continue
+            if min_age is not None and entry["age"] < min_age:
+                continue
+            if max_age is not None and entry["age"] > max_age:
+                continue
+            if min_money is not None and entry["money"] < min_money:
+                continue
+            if max_money is not None and entry["money"] > max_money:
+                continue
+            result.append(entry)
+            if len(result) == limit:
+                break
+        return result
+
+    def close(self):
+        pass
+
+
+class FileSaveStore(SaveStore):
+    """Keeps each save in its own file under SAVE_PATH, listed by the manifest."""
+
+    def __init__(self):
+        os.makedirs(SAVE_PATH, exist_ok=True)
+        self.lock = threading.RLock()
+        self.records = None  # Manifest records held back until the batch ends
+
+    def list_ids(self):
+        return [ID for ID in map(save_file_id, os.listdir(SAVE_PATH)) if ID]
+
+    def list_entries(self):
+        entries = list_saves()
+        for entry in entries:
+            # Entries recorded before "alive" was added are all of living players
+            entry.setdefault("alive", True)
+        return entries
+
+    def load(self, ID):
+        try:
+            with open(save_file_path(ID), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise KeyError(ID) from None
+
+    def put(self, entry, data):
+        ID = entry["ID"]
+        with self.lock:
+            atomic_write(SAVE_PATH + "/" + ID + SAVE_SUFFIX, data)
+            legacy = SAVE_PATH + "/" + ID + LEGACY_SUFFIX
+            if os.path.exists(legacy):
+                os.remove(legacy)
+            self.record(put_record(entry))
+
+    def delete(self, ID):
+        with self.lock:
+            deleted = False
+            for suffix in (SAVE_SUFFIX, LEGACY_SUFFIX):
+                path = SAVE_PATH + "/" + ID + suffix
+                if os.path.exists(path):
+                    os.remove(path)
+                    deleted = True
+            if deleted:
+                self.record({"op": "del", "ID": ID})
+
+    def record(self, record):
+        if self.records is not None:
+            self.records.append(record)
+        else:
+            append_records([record])
+
+    @contextlib.contextmanager
+    def batch(self):
+        with self.lock:
+            if self.records is not None:
+                yield  # Already inside a batch
+                return
+            self.records = []
+            try:
+                yield
+            finally:
+                records, self.records = self.records, None
+                if records:
+                    append_records(records)
+
+
+class SQLiteSaveStore(SaveStore):
+    """Keeps every save as a row of one SQLite database.
+
+    Listing and searching only read the indexed entry columns, never the saves
+    themselves. One connection is shared by all threads, one at a time."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS saves (
+            ID TEXT PRIMARY KEY,
+            name TEXT NOT NULL COLLATE NOCASE,
+            age INTEGER NOT NULL,
+            alive INTEGER NOT NULL,
+            money INTEGER NOT NULL,
+            modified REAL NOT NULL,
+            state BLOB NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS saves_name ON saves (name);
+        CREATE INDEX IF NOT EXISTS saves_age ON saves (age);
+        CREATE INDEX IF NOT EXISTS saves_alive ON saves (alive);
+        CREATE INDEX IF NOT EXISTS saves_money ON saves (money);
+        CREATE INDEX IF NOT EXISTS saves_modified ON saves (modified);
+    """
+    COLUMNS = "ID, name, age, alive, money, modified"
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.lock = threading.RLock()
+        # Transactions are started by batch() rather than implicitly by sqlite3
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(self.SCHEMA)
+
+    @staticmethod
+    def row_values(entry, data):
+        modified = entry["modified"]
+        if modified is None:
+            modified = time.time()
+        return (
+            entry["ID"],
+            entry["name"],
+            entry["age"],
+            int(entry["alive"]),
+            entry["money"],
+            modified,
+            data,
+        )
+
+    @staticmethod
+    def make_entry(row):
+        ID, name, age, alive, money, modified = row
+        return {
+            "ID": ID,
+            "name": name,
+            "age": age,
+            "alive": bool(alive),
+            "money": money,
+            "modified": modified,
+        }
+
+    @contextlib.contextmanager
+    def batch(self):
+        with self.lock:
+            if self.conn.in_transaction:
+                yield  # Already inside a batch
+                return
+            self.conn.execute("BEGIN")
+            try:
+                yield
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def list_ids(self):
+        with self.lock:
+            return [row[0] for row in self.conn.execute("SELECT ID FROM saves")]
+
+    def list_entries(self):
+        return self.search()
+
+    def load(self, ID):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT state FROM saves WHERE ID = ?", (ID,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(ID)
+        return row[0]
+
+    def put(self, entry, data):
+        self.put_many([(entry, data)])
+
+    def put_many(self, items):
+        with self.batch():
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO saves VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.row_values(entry, data) for entry, data in items),
+            )
+
+    def delete(self, ID):
+        with self.lock:
+            self.conn.execute("DELETE FROM saves WHERE ID = ?", (ID,))
+
+    def search(
+        self,
+        name=None,
+        alive=None,
+        min_age=None,
+        max_age=None,
+        min_money=None,
+        max_money=None,
+        limit=None,
+    ):
+        conditions = []
+        params = []
+        if name is not None:
+            escaped = name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append("name LIKE ? ESCAPE '\\'")
+            params.append(escaped + "%")
+        for column, op, value in (
+            ("alive", "=", None if alive is None else int(alive)),
+            ("age", ">=", min_age),
+            ("age", "<=", max_age),
+            ("money", ">=", min_money),
+            ("money", "<=", max_money),
+        ):
+            if value is not None:
+                conditions.append(f"{column} {op} ?")
+                params.append(value)
+        sql = f"SELECT {self.COLUMNS} FROM saves"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY modified DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self.lock:
+            return [self.make_entry(row) for row in self.conn.execute(sql, params)]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def copy_saves(source, dest):
+    "Copies every save from one store to another, e.g. to move existing save files into SQLite."
+    dest.put_many((entry, source.load(entry["ID"])) for entry in source.list_entries())
+
+
+STORE = None
+STORE_LOCK = threading.Lock()
+
+
+def get_store():
+    "Returns the store picked by SAVE_BACKEND, opening it on first use."
+    global STORE
+    with STORE_LOCK:
+        if STORE is None:
+            if SAVE_BACKEND == "sqlite":
+                STORE = SQLiteSaveStore(SAVE_DB)
+            elif SAVE_BACKEND == "files":
+                STORE = FileSaveStore()
+            else:
+                raise ValueError(f"Unknown save backend {SAVE_BACKEND!r}")
+        return STORE
+
+
+def set_store(store):
+    "Makes get_store() return the given store from now on."
+    global STORE
+    with STORE_LOCK:
+        STORE = store
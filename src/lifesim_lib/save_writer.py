@@ -0,0 +1,104 @@
+import atexit, sys, threading
+
+from src.lifesim_lib.save_store import get_store
+
+
+class SaveWriter:
+    """Runs save and delete jobs on a background thread so slow disks don't hold up the game.
+
+    Jobs are keyed by Player.ID. A job that is submitted while an older one for
+    the same ID is still waiting replaces it, so back-to-back saves of one player
+    collapse into a single write of the latest state. All jobs waiting when the
+    writer gets to them run in one batch of the save store, so a burst of saves
+    from a simulation costs one transaction. Jobs must only use data captured
+    when they were submitted (such as the encoded state), never the live Player,
+    which the game keeps changing.
+
+    A job that fails is reported on stderr and kept, to be tried again by the
+    next flush() unless a newer job for its ID replaces it first."""
+
+    def __init__(self):
+        self.pending = {}
+        self.failed = {}  # Jobs that failed, by ID, kept to be tried again by flush()
+        self.errors = (
+            {}
+        )  # The error of the latest job for an ID, while it keeps failing
+        self.busy = False
+        # Jobs are numbered as they are submitted; finished is the number of
+        # the last job that had been submitted when the latest batch was taken
+        self.submitted = 0
+        self.finished = 0
+        self.cond = threading.Condition()
+        self.thread = None
+
+    def submit(self, ID, job):
+        with self.cond:
+            self.failed.pop(ID, None)  # Replaced by the newer job
+            self.queue(ID, job)
+
+    def queue(self, ID, job):
+        "Adds a job to the pending ones. Hold cond."
+        self.pending.pop(ID, None)  # Move it to the back of the queue
+        self.pending[ID] = job
+        self.submitted += 1
+        if self.thread is None:
+            self.thread = threading.Thread(
+                target=self.run, name="SaveWriter", daemon=True
+            )
+            self.thread.start()
+        self.cond.notify_all()
+
+    def run(self):
+        while True:
+            with self.cond:
+                while not self.pending:
+                    self.cond.wait()
+                jobs = list(self.pending.items())
+                self.pending.clear()
+                self.busy = True
+                taken = self.submitted
+            failed = {}
+            try:
+                with get_store().batch():
+                    for ID, job in jobs:
+                        try:
+                            job()
+                        except Exception as e:
+                            failed[ID] = e
+            except Exception as e:  # Nothing in the batch was written
+                failed = {ID: e for ID, job in jobs}
+            finally:
+                with self.cond:
+                    for ID, job in jobs:
+                        if ID not in failed:
+                            self.errors.pop(ID, None)
+                            continue
+                        print(f"Saving {ID} failed: {failed[ID]!r}", file=sys.stderr)
+                        self.errors[ID] = failed[ID]
+                        if ID not in self.pending:  # Unless a newer job replaces it
+                            self.failed[ID] = job
+                    self.busy = False
+                    self.finished = taken
+                    self.cond.notify_all()
+
+    def flush(self, ID=None, timeout=None):
+        """Tries failed jobs again and waits until every job submitted so far has finished.
+
+        Jobs submitted meanwhile, say by other sessions of a server, aren't
+        waited for. Given an ID, raises the error of the latest job for it if
+        that failed, so the caller knows its own save wasn't written. Returns
+        False if the timeout ran out."""
+        with self.cond:
+            for failed_ID, job in self.failed.items():
+                self.queue(failed_ID, job)
+            self.failed.clear()
+            target = self.submitted
+            done = self.cond.wait_for(lambda: self.finished >= target, timeout)
+            error = self.errors.get(ID)
+        if done and error is not None:
+            raise error
+        return done
+
+
+SAVE_WRITER = SaveWriter()
+atexit.register(SAVE_WRITER.flush)
@@ -0,0 +1,76 @@
+"""Events of a life that happen at a given age, so a year only looks at the ones due.
+
+A year runs in stages (STAGES, in order); Player.run_events(stage) runs what
+is due in each. Two kinds of events are run:
+
+  milestones  the same for every life, like starting school at 6; registered
+              with @milestone(age, stage) in a table keyed by age and stage
+  events      added to one life's Schedule with Schedule.add(age, name), like
+              the next year of university; registered with @event(name, stage)
+
+Both decorators register methods of Player, which are called with the player.
+A Schedule is a heap, so finding the events due costs the same however many
+are waiting, and it is saved with the player as "age:name" strings.
+"""
+
+import heapq
+
+STAGES = ("looks", "university", "loans", "childhood", "school")
+STAGE_INDEX = {stage: i for i, stage in enumerate(STAGES)}
+
+MILESTONES = {}  # (age, stage) -> functions
+EVENTS = {}  # name -> (stage, function)
+
+
+def milestone(age, stage):
+    "Decorator running a function on every life in the given stage of the year it turns age."
+
+    def register(func):
+        MILESTONES.setdefault((age, STAGE_INDEX[stage]), []).append(func)
+        return func
+
+    return register
+
+
+def event(name, stage):
+    "Decorator registering a function as the event a Schedule runs by that name, in the given stage."
+
+    def register(func):
+        EVENTS[name] = (STAGE_INDEX[stage], func)
+        return func
+
+    return register
+
+
+class Schedule:
+    """The events waiting to happen in one life, as a heap of (age, stage, order added, name)."""
+
+    def __init__(self):
+        self.heap = []
+        self.added = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def add(self, age, name):
+        heapq.heappush(self.heap, (age, EVENTS[name][0], self.added, name))
+        self.added += 1
+
+    def pop_due(self, age, stage):
+        """Removes and yields the names of the events due by this stage of the year at age, in order.
+
+        Events added while this runs are yielded too if they are due."""
+        heap = self.heap
+        while heap and heap[0][:2] <= (age, stage):
+            yield heapq.heappop(heap)[3]
+
+    def to_data(self):
+        return [f"{age}:{name}" for age, stage, added, name in sorted(self.heap)]
+
+    @classmethod
+    def from_data(cls, items):
+        schedule = cls()
+        for item in items:
+            age, name = item.split(":", 1)
+            schedule.add(int(age), name)
+        return schedule
@@ -0,0 +1,210 @@
+"""Renders the text interface in frames.
+
+Screen replaces sys.stdout for the interactive game. Whatever is printed is
+held back until the game waits for input, then written to the terminal in a
+single write. clear() starts a new frame: instead of running the clear
+command, the frame is drawn over the previous one with escape sequences, and
+on a terminal only the lines that changed are rewritten.
+
+A process running several sessions at once (see src/engine/server.py) gives
+each session thread its own Screen with use_screen() and replaces sys.stdout
+with ThreadOutput, which sends what the thread prints to that Screen.
+"""
+
+import io, os, re, shutil, sys, threading, unicodedata
+from sys import platform
+
+HOME = "\x1b[H"
+CLEAR = "\x1b[H\x1b[2J\x1b[3J"  # What the clear command writes, scrollback included
+ERASE_LINE = "\x1b[K"
+ERASE_BELOW = "\x1b[J"
+
+ANSI_SEQUENCE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+
+def display_width(row):
+    "Number of terminal columns a row takes, not counting escape sequences."
+    width = 0
+    for char in ANSI_SEQUENCE.sub("", row):
+        width += 2 if unicodedata.east_asian_width(char) in "WF" else 1
+    return width
+
+
+class Screen(io.TextIOBase):
+    """Frames written to out.
+
+    read, if given, is called instead of input() to get a line; it returns None
+    at the end of input. size is the terminal's size, by default that of the
+    terminal the process runs in."""
+
+    def __init__(self, out, read=None, size=None):
+        self.out = out
+        self.read = read
+        self.size = size
+        self.pending = []
+        self.clear_pending = False
+        # The rows on the terminal since the last frame was drawn, or None if
+        # they are not known; None rows are known to hold something else.
+        self.rows = None
+        self.diff = out.isatty()
+        self.frames = 0
+
+    @classmethod
+    def install(cls):
+        "Puts a Screen in front of sys.stdout and returns it."
+        if platform == "win32":
+            os.system("")  # Turns on escape sequences in the Windows console
+        screen = cls(sys.stdout)
+        sys.stdout = screen
+        return screen
+
+    @property
+    def encoding(self):
+        return self.out.encoding
+
+    def writable(self):
+        return True
+
+    def isatty(self):
+        return self.out.isatty()
+
+    def write(self, s):
+        self.pending.append(s)
+        return len(s)
+
+    def clear(self):
+        "Starts a new frame. Anything not yet shown would be wiped at once, so it is dropped."
+        self.pending = []
+        self.clear_pending = True
+
+    def flush(self):
+        text = "".join(self.pending)
+        self.pending = []
+        if self.clear_pending:
+            self.clear_pending = False
+            text = self.draw_frame(text)
+            self.frames += 1
+        else:
+            self.add_rows(text)
+        if text:
+            self.out.write(text)
+        self.out.flush()
+
+    def read_line(self, prompt="", pause=False):
+        self.write(prompt)
+        self.flush()
+        line = self.read()
+        if line is None:
+            raise EOFError("EOF when reading a line")
+        self.echoed()
+        return line
+
+    def echoed(self):
+        "Tells the screen the user typed a line, which the terminal echoed after the last row."
+        if self.rows is not None:
+            self.rows[-1] = None
+            self.rows.append("")
+            self.check_size()
+
+    def add_rows(self, text):
+        if self.rows is None or not text:
+            return
+        new_rows = text.split("\n")
+        if self.rows[-1] is not None:
+            new_rows[0] = self.rows[-1] + new_rows[0]
+        self.rows[-1:] = new_rows
+        self.check_size()
+
+    def terminal_size(self):
+        return self.size or shutil.get_terminal_size()
+
+    def check_size(self):
+        if len(self.rows) >= self.terminal_size().lines:
+            self.rows = (
+                None  # It scrolled, so the rows are no longer where they were drawn
+            )
+
+    def fits(self, rows):
+        size = self.terminal_size()
+        return len(rows) < size.lines and all(
+            display_width(row) < size.columns for row in rows
+        )
+
+    def draw_frame(self, text):
+        "Returns what to write to replace the screen with text."
+        old = self.rows
+        new = text.split("\n")
+        self.rows = new if self.diff and self.fits(new) else None
+        if old is None or self.rows is None:
+            return CLEAR + text
+        out = [HOME]
+        last = len(new) - 1
+        for i, row in enumerate(new):
+            if i < last and i < len(old) and old[i] == row:
+                out.append("\n")  # Unchanged; just move down to the next row
+            elif i < last:
+                out.append(row + ERASE_LINE + "\n")
+            else:
+                out.append(row)
+        out.append(ERASE_BELOW)
+        return "".join(out)
+
+
+local = threading.local()
+
+
+def use_screen(screen):
+    "Makes output of the current thread go to screen, or back to sys.stdout if it is None."
+    local.screen = screen
+
+
+def current_screen():
+    "Returns the Screen the current thread draws on, or None."
+    screen = getattr(local, "screen", None)
+    if screen is None and isinstance(sys.stdout, Screen):
+        screen = sys.stdout
+    return screen
+
+
+class ThreadOutput(io.TextIOBase):
+    "Stands in for sys.stdout: writes to the Screen of the current thread if it has one, else to out."
+
+    def __init__(self, out):
+        self.out = out
+
+    def target(self):
+        return getattr(local, "screen", None) or self.out
+
+    @property
+    def encoding(self):
+        return self.out.encoding
+
+    def writable(self):
+        return True
+
+    def write(self, s):
+        return self.target().write(s)
+
+    def flush(self):
+        self.target().flush()
+
+
+def clear_screen():
+    screen = current_screen()
+    if screen is not None:
+        screen.clear()
+    else:
+        sys.stdout.write(CLEAR)
+
+
+def read_line(prompt="", pause=False):
+    """input() that keeps the Screen's picture of the terminal right. Use it for all input in the game.
+
+    pause tells the screen the line is only waited for, not used."""
+    screen = current_screen()
+    if screen is not None and screen.read is not None:
+        return screen.read_line(prompt, pause)
+    line = input(prompt)
+    if screen is not None:
+        screen.echoed()
+    return line
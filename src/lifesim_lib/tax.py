@@ -0,0 +1,75 @@
+"""Income tax, worked out from the tax already owed at the start of each bracket.
+
+A regime is a list of brackets like SALARY_TAX_BRACKETS: [upper bound, rate]
+pairs, then the rate above the last bound. TaxRegime adds up the tax of each
+whole bracket once, so taxing a salary only finds its bracket (with bisect,
+or np.searchsorted for an array of salaries) and adds the tax of the part in
+it, in the same order as walking the brackets would, to the same result.
+
+The game uses SALARY_TAX_BRACKETS unless LIFESIM_TAX_REGIME names one of the
+regimes in assets/tax_regimes.json, such as another filing status or
+country's brackets.
+"""
+
+import bisect, functools, json
+
+from src.lifesim_lib.const import SALARY_TAX_BRACKETS, TAX_REGIME
+from src.lifesim_lib.names import ASSETS_PATH
+from src.lifesim_lib.rng import get_numpy
+
+REGIMES_PATH = f"{ASSETS_PATH}/tax_regimes.json"
+
+
+class TaxRegime:
+    def __init__(self, name, brackets):
+        *pairs, top_rate = brackets
+        self.name = name
+        self.bounds = [bound for bound, rate in pairs]
+        if self.bounds != sorted(self.bounds):
+            raise ValueError(f"The brackets of {name} aren't in order")
+        self.rates = [rate for bound, rate in pairs] + [top_rate]
+        self.starts = [0] + self.bounds  # Where each bracket starts
+        self.owed = [0]  # Tax owed at the start of each bracket
+        tax = 0
+        for start, bound, rate in zip(self.starts, self.bounds, self.rates):
+            tax += (bound - start) * rate
+            self.owed.append(tax)
+        self.arrays = None
+
+    def tax(self, salary):
+        i = bisect.bisect_left(self.bounds, salary)
+        return round(self.owed[i] + (salary - self.starts[i]) * self.rates[i])
+
+    def taxes(self, salaries):
+        "tax() of every salary in an array, as an array of int64."
+        np = get_numpy()
+        if self.arrays is None:
+            self.arrays = [
+                np.array(a, dtype=float)
+                for a in (self.bounds, self.owed, self.starts, self.rates)
+            ]
+        bounds, owed, starts, rates = self.arrays
+        salaries = np.asarray(salaries)
+        i = np.searchsorted(bounds, salaries, side="left")
+        return np.rint(owed[i] + (salaries - starts[i]) * rates[i]).astype(np.int64)
+
+
+@functools.lru_cache(maxsize=None)
+def load_regimes(path=REGIMES_PATH):
+    "The TaxRegimes of a file of regimes by name, which is only read the first time."
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {
+        name: TaxRegime(name, brackets) for name, brackets in data["regimes"].items()
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def tax_regime(name=TAX_REGIME):
+    "The regime of this name in assets/tax_regimes.json, or with none the game's own brackets."
+    if not name:
+        return TaxRegime("default", SALARY_TAX_BRACKETS)
+    try:
+        return load_regimes()[name]
+    except KeyError:
+        raise ValueError(f"No tax regime {name!r} in {REGIMES_PATH}") from None
@@ -1,23 +1,22 @@
-from src.lifesim_lib.const import *
-import gettext
-import os as _os
+"""Translations of the game's text.
 
-_ = lambda s: s
+Importing this module reads nothing and asks nothing. The language is the one
+passed to set_language(), or else the first of: the LIFESIM_LANG environment
+variable, the preference saved by save_language(), English. Only the catalog
+of that language is loaded, the first time some text is translated.
 
-from src.lifesim_lib.lifesim_lib import choice_input
+Text that has to be defined before the language is known (constants, traits)
+is marked with N_ and translated with _ where it is shown. Pass -k N_ to
+pygettext.py so those strings end up in lifesim.pot too.
+"""
 
-dir = _os.getcwd()
-langs = {"en": None}
+import gettext, json, os
 
-for lang in LANGUAGES:
-    try:
-        l = gettext.translation("lifesim", localedir=dir + "/locale", languages=[lang])
-    except:
-        pass
-    else:
-        langs[lang] = l
+LOCALE_DIR = os.getcwd() + "/locale"
+LANG_ENV = "LIFESIM_LANG"
+SETTINGS_NAME = "settings.json"
 
-lang_map = {
+LANGUAGE_NAMES = {
     "en": "English",
     "es": "Español",
     "ko": "한국인",
@@ -27,14 +26,79 @@ lang_map = {
     "bn": "বাংলা",
 }
 
-names = []
-codes = []
-for lang in langs:
-    codes.append(lang)
-    names.append(lang_map.get(lang, lang))
+language = None
+catalog = None
+
+
+def N_(message):
+    "Marks text for translation without translating it yet."
+    return message
+
+
+def _(message):
+    if catalog is None:
+        try:
+            set_language(configured_language() or "en")
+        except ValueError:
+            set_language("en")
+    return catalog.gettext(message)
+
+
+def available_languages():
+    "Returns the codes of English and every language with a compiled catalog in locale/."
+    codes = ["en"]
+    try:
+        names = sorted(os.listdir(LOCALE_DIR))
+    except FileNotFoundError:
+        return codes
+    for code in names:
+        if os.path.exists(f"{LOCALE_DIR}/{code}/LC_MESSAGES/lifesim.mo"):
+            codes.append(code)
+    return codes
+
+
+def settings_path():
+    from src.lifesim_lib.const import SAVE_PATH
 
-language = codes[choice_input(*names) - 1]
+    return SAVE_PATH + "/" + SETTINGS_NAME
 
-if language != "en":
-    langs[language].install()
-    _ = langs[language].gettext
+
+def saved_language():
+    try:
+        with open(settings_path(), encoding="utf-8") as f:
+            return json.load(f).get("language")
+    except (OSError, ValueError):
+        return None
+
+
+def save_language(code):
+    "Remembers the language for the next time the game starts."
+    path = settings_path()
+    try:
+        with open(path, encoding="utf-8") as f:
+            settings = json.load(f)
+    except (OSError, ValueError):
+        settings = {}
+    settings["language"] = code
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(settings, f)
+
+
+def configured_language():
+    "Returns the language from LIFESIM_LANG or the saved preference, or None if neither is set."
+    return os.environ.get(LANG_ENV) or saved_language()
+
+
+def set_language(code):
+    global language, catalog
+    if code == "en":
+        new_catalog = gettext.NullTranslations()
+    else:
+        try:
+            new_catalog = gettext.translation(
+                "lifesim", localedir=LOCALE_DIR, languages=[code]
+            )
+        except OSError:
+            raise ValueError(f"No translation for language {code!r}") from None
+    language, catalog = code, new_catalog
@@ -0,0 +1,129 @@
+"""Registry of menu actions.
+
+Every action has a stable ID (such as "activities.library"), a label that is
+translated once per language, a predicate saying when it is offered and a
+handler. Menus list their available actions in the order they were
+registered. Other front ends can list and perform actions by ID without the
+text menus; importing src.menus.main registers the game's actions. Actions
+registered with api=False, and the menus they open, are only for the text
+menus: other front ends don't offer or perform them.
+"""
+
+from src.lifesim_lib import translation
+from src.lifesim_lib.translation import N_, _
+from src.lifesim_lib.lifesim_lib import choice_input, clear_screen
+
+ACTIONS = {}
+MENUS = {}
+
+BACK = N_("Back")
+
+label_cache = {}
+
+
+def translated(message):
+    "Returns _(message), looking it up only once per language."
+    key = (translation.language, message)
+    try:
+        return label_cache[key]
+    except KeyError:
+        text = _(message)
+        label_cache[(translation.language, message)] = text
+        return text
+
+
+def always(player, *args):
+    return True
+
+
+class Action:
+    def __init__(self, ID, label, available, handler, menu, opens=None, api=True):
+        self.ID = ID
+        self.label = label
+        self.available = available
+        self.handler = handler
+        self.menu = menu
+        self.opens = opens  # The menu the action leads to, if any
+        self.api = api  # Whether front ends other than the text menus may perform it
+
+    def text(self):
+        return translated(self.label)
+
+
+class Menu:
+    """A list of actions. Handlers of a menu all take the same arguments: the player and the menu's target, if any."""
+
+    def __init__(self, ID, back=True):
+        self.ID = ID
+        self.back = back  # Whether "Back" is offered first
+        self.actions = []
+        MENUS[ID] = self
+
+    def action(self, ID, label, available=always, opens=None, api=True):
+        """Decorator registering the function as the handler of an action of this menu.
+
+        opens is the menu the handler runs, if any. api=False keeps the action,
+        and the menu it opens, to the text menus."""
+
+        def register(handler):
+            if ID in ACTIONS:
+                raise ValueError(f"Duplicate action ID {ID!r}")
+            action = Action(ID, label, available, handler, self, opens, api)
+            ACTIONS[ID] = action
+            self.actions.append(action)
+            return handler
+
+        return register
+
+    def available(self, player, *args):
+        return [action for action in self.actions if action.available(player, *args)]
+
+    def choose(self, player, *args):
+        "Asks which available action to take. Returns it, or None for Back."
+        actions = self.available(player, *args)
+        labels = [action.text() for action in actions]
+        if self.back:
+            labels.insert(0, translated(BACK))
+        index = choice_input(*labels) - 1 - self.back
+        return actions[index] if index >= 0 else None
+
+    def run(self, player, *args, clear=True):
+        "Asks for an action and performs it, clearing the screen in between unless clear is False."
+        action = self.choose(player, *args)
+        if clear:
+            clear_screen()
+        if action is not None:
+            action.handler(player, *args)
+
+
+def menu_available(player, menu_ID):
+    "Whether the player can get to a menu from the main menu right now."
+    menu = MENUS[menu_ID]
+    openers = [action for action in ACTIONS.values() if action.opens is menu]
+    if not openers:
+        return True
+    return any(
+        action.available(player) and menu_available(player, action.menu.ID)
+        for action in openers
+    )
+
+
+def api_action(action):
+    "Whether front ends other than the text menus may perform the action: it and every way to its menu are marked api."
+    if not action.api:
+        return False
+    openers = [other for other in ACTIONS.values() if other.opens is action.menu]
+    return not openers or any(api_action(other) for other in openers)
+
+
+def available_actions(player, menu_ID, *args):
+    "Returns the IDs of the actions a menu offers right now."
+    return [action.ID for action in MENUS[menu_ID].available(player, *args)]
+
+
+def perform(player, ID, *args):
+    "Performs an action by ID, as if it had been picked from its menu."
+    action = ACTIONS[ID]
+    if not (action.available(player, *args) and menu_available(player, action.menu.ID)):
+        raise ValueError(f"Action {ID!r} isn't available")
+    return action.handler(player, *args)
@@ -1,13 +1,18 @@
-import random
-from random import randint
-
 from src.lifesim_lib.const import *
-from src.lifesim_lib.translation import _
+from src.lifesim_lib.translation import N_, _
 from src.lifesim_lib.lifesim_lib import *
+from src.menus.actions import Menu
 from src.people.classes.parent import Parent
 from src.people.classes.person import Person
 from src.people.classes.sibling import Sibling
 
+MAIN_MENU = Menu("main", back=False)
+RELATIONSHIP_MENU = Menu("relationship")
+ACTIVITIES_MENU = Menu("activities")
+SCHOOL_MENU = Menu("school")
+JOB_MENU = Menu("job")
+DEBUG_MENU = Menu("debug")
+
 
 def main_menu(player):
     print()
@@ -21,723 +26,819 @@ def main_menu(player):
 
     player.display_stats()
     print()
-    choices = [_("Age +1"), _("Relationships"), _("Activities")]
-    if player.is_in_school():
-        choices.append(_("School"))
-    elif player.age >= 18:
-        if player.has_job:
-            choices.append(_("Job Menu"))
-        else:
-            choices.append(_("Find a Job"))
-    choices.append(_("View Saved Games"))
-    if DEBUG:
-        choices.append(_("Debug Menu"))
-    choice = choice_input(*choices, return_text=True)
+    MAIN_MENU.run(player)
+
+
+def can_work(player):
+    return not player.is_in_school() and player.age >= 18
+
+
+def can_retire(player):
+    return player.years_worked >= 10 and player.age >= 65
+
+
+@MAIN_MENU.action("main.age_up", N_("Age +1"))
+def age_up(player):
+    print()
+    player.age_up()
+
+
+@MAIN_MENU.action("main.relationships", N_("Relationships"), opens=RELATIONSHIP_MENU)
+def relationships(player):
+    relations = player.relations
+    print(_("Relationships: "))
+    for num, relation in enumerate(relations):
+        print(f"{num+1}. {relation.name} ({relation.get_translated_type()})")
+    back = _("Back")
+    print(f"{len(relations)+1}. {back}")
+    choice = int_input_range(1, len(relations) + 1)
     clear_screen()
-    if choice == _("Age +1"):
+    if choice <= len(player.relations):
+        relation = relations[choice - 1]
+        print(_("Name") + ": " + relation.name + f" ({relation.get_translated_type()})")
+        print(_("Age") + f": {relation.age}")
+        bars = [(_("Relationship"), relation.relationship)]
+        if isinstance(relation, Parent):
+            bars.append((_("Generosity"), relation.generosity))
+            bars.append((_("Money"), relation.money))
+        elif isinstance(relation, Sibling):
+            bars.append((_("Smarts"), relation.smarts))
+            bars.append((_("Looks"), relation.looks))
+            bars.append((_("Petulance"), relation.petulance))
+        print_align_bars(*bars)
+        RELATIONSHIP_MENU.run(player, relation)
         print()
-        player.age_up()
-    if choice == _("Relationships"):
-        relations = player.relations
-        print(_("Relationships: "))
-        for num, relation in enumerate(relations):
-            print(f"{num+1}. {relation.name} ({relation.get_translated_type()})")
-        back = _("Back")
-        print(f"{len(relations)+1}. {back}")
-        choice = int_input_range(1, len(relations) + 1)
+
+
+@MAIN_MENU.action("main.activities", N_("Activities"), opens=ACTIVITIES_MENU)
+def activities(player):
+    print(_("Activities Menu"))
+    print()
+    ACTIVITIES_MENU.run(player)
+
+
+@MAIN_MENU.action(
+    "main.school",
+    N_("School"),
+    lambda player: player.is_in_school(),
+    opens=SCHOOL_MENU,
+)
+def school(player):
+    print(_("School Menu"))
+    print()
+    display_bar(_("Grades"), player.grades)
+    SCHOOL_MENU.run(player)
+
+
+@MAIN_MENU.action(
+    "main.job",
+    N_("Job Menu"),
+    lambda player: can_work(player) and player.has_job,
+    opens=JOB_MENU,
+)
+def job(player):
+    print(_("Your job"))
+    print()
+    print_align_bars(
+        (_("Stress"), player.stress), (_("Performance"), player.performance)
+    )
+    JOB_MENU.run(player, clear=False)
+
+
+@MAIN_MENU.action(
+    "main.find_job",
+    N_("Find a Job"),
+    lambda player: can_work(player) and not player.has_job,
+)
+def find_job(player):
+    rng = player.rng
+    salary = round_stochastic(
+        randexpo(30000, 55000, rng), rng
+    )  # TODO: Add a selection of different types of jobs
+    if yes_no(
+        _(
+            "You found a job with a salary of ${salary:,}. Would you like to apply?"
+        ).format(salary=salary)
+    ):
+        m = 100 + round_stochastic((salary - 40000) / 300, rng)
+        mod = (
+            50 - player.smarts
+        )  # Mod is inverted because we want to roll 100 OR LOWER to get the job
+        roll = rng.randint(1, m)
+        if mod > 0:
+            roll += rng.randint(0, mod)
+        elif mod < 0:
+            roll -= rng.randint(0, abs(mod))
+        if roll <= 100:
+            print(_("You got the job!"))
+            player.change_happiness(4)
+            player.get_job(salary)
+        else:
+            print(_("You didn't get an interview."))
+            player.change_happiness(-rng.randint(1, 4))
+    else:
+        clear_screen()
+
+
+# Loads or deletes other lives, so only the text menus offer it
+@MAIN_MENU.action(
+    "main.saves",
+    N_("View Saved Games"),
+    lambda player: can_browse_saves(),
+    api=False,
+)
+def saved_games(player):
+    # Lives open in a session, this one's included, can't be loaded or deleted
+    saves = [entry for entry in list_saves() if not life_is_open(entry["ID"])]
+    if not saves:
+        print(_("No previously saved games"))
+    else:
+        print(_("Previously saved games:"))
+        choices = list(map(lambda e: e["name"], saves))
+        choices.append(_("Back"))
+        choice = choice_input(*choices)
         clear_screen()
-        if choice <= len(player.relations):
-            relation = relations[choice - 1]
+        if choice < len(choices):
+            entry = saves[choice - 1]
+            print(entry["name"] + "\n")
+            choice = choice_input(_("Back"), _("Load Save"), _("Delete Save"))
+            if choice == 2:
+                if not open_life(entry["ID"]):
+                    print(_("That life is being played in another session."))
+                elif yes_no(_("Would you like to load this save?")):
+                    player.save_game()
+                    d = load_save(entry["ID"])
+                    close_life(player.ID)
+                    player.load_data(d)
+                    clear_screen()
+                else:
+                    close_life(entry["ID"])
+            elif choice == 3:
+                if yes_no(_("Are you sure you want to delete this save?")):
+                    delete_save_file(entry["ID"])
+
+
+@MAIN_MENU.action(
+    "main.debug", N_("Debug Menu"), lambda player: DEBUG, opens=DEBUG_MENU, api=False
+)
+def debug(player):
+    DEBUG_MENU.run(player, clear=False)
+
+
+@RELATIONSHIP_MENU.action(
+    "relationship.spend_time",
+    N_("Spend time"),
+    lambda player, relation: relation.age >= 5 and player.age >= 3,
+)
+def spend_time(player, relation):
+    rng = player.rng
+    if relation.relationship < 15:
+        print(_("Your {relation} refused to see you."))
+        player.change_happiness(-4)
+    else:
+        print(
+            _("You spent time with your {relation}.").format(
+                relation=relation.name_accusative()
+            )
+        )
+        enjoyment1 = max(rng.randint(0, 70), rng.randint(0, 70)) + rng.randint(0, 30)
+        if player.traits & TraitBit.CHEERFUL:
+            enjoyment1 = max(enjoyment1, rng.randint(0, 100))
+        elif player.traits & TraitBit.GRUMPY:
+            enjoyment1 = min(enjoyment1, rng.randint(0, 100))
+        enjoyment2 = round(rng.triangular(0, 100, relation.relationship))
+        print_align_bars(
+            (_("Your Enjoyment"), enjoyment1),
+            (
+                _("{his_her} Enjoyment").format(
+                    his_her=relation.his_her().capitalize()
+                ),
+                enjoyment2,
+            ),
+        )
+        if not relation.spent_time:
+            player.change_happiness(round_stochastic(enjoyment1 / 12, rng))
+            relation.change_relationship(round_stochastic(enjoyment2 / 12, rng))
+            if player.traits & TraitBit.CHEERFUL:
+                player.change_happiness(3)
+            relation.spent_time = True
+
+
+@RELATIONSHIP_MENU.action(
+    "relationship.conversation",
+    N_("Have a conversation"),
+    lambda player, relation: relation.age >= 5 and player.age >= 3,
+)
+def have_conversation(player, relation):
+    rng = player.rng
+    if relation.relationship < 25:
+        display_event(
+            _(
+                "Your {relation} isn't interested in having a conversation with you."
+            ).format(relation=relation.name_accusative())
+        )
+        player.change_happiness(-4)
+    else:
+        agreement = rng.triangular(0, 100, 65)
+        agreement += rng.randint(0, max(0, (relation.relationship - 50) // 3))
+        if isinstance(relation, Sibling) and rng.randint(1, 2) == 1:
+            agreement -= rng.randint(0, relation.petulance // 3)
+        agreement = clamp(round(agreement), rng.randint(0, 10), rng.randint(90, 100))
+        print(
+            _("You had a conversation with your {relation}.").format(
+                relation=relation.name_accusative()
+            )
+        )
+        display_bar(_("Agreement"), agreement)
+        if not relation.had_conversation:
+            player.change_happiness(8 if player.traits & TraitBit.CHEERFUL else 4)
+            relation.change_relationship(round_stochastic(agreement / 12, rng))
+            relation.had_conversation = True
+        if agreement < 15:
+            relation.change_relationship(-rng.randint(2, 8))
             print(
-                _("Name")
-                + ": "
-                + relation.name
-                + f" ({relation.get_translated_type()})"
+                _(
+                    "You and your {relation} got into an argument. What will you do?"
+                ).format(relation=relation.name_accusative())
             )
-            print(_("Age") + f": {relation.age}")
-            bars = [(_("Relationship"), relation.relationship)]
-            if isinstance(relation, Parent):
-                bars.append((_("Generosity"), relation.generosity))
-                bars.append((_("Money"), relation.money))
-            elif isinstance(relation, Sibling):
-                bars.append((_("Smarts"), relation.smarts))
-                bars.append((_("Looks"), relation.looks))
-                bars.append((_("Petulance"), relation.petulance))
-            print_align_bars(*bars)
-            choices = [_("Back")]
-            if relation.age >= 5:
-                if player.age >= 3:
-                    choices.append(_("Spend time"))
-                    choices.append(_("Have a conversation"))
-                if player.age >= 6:
-                    choices.append(_("Compliment"))
-                    choices.append(_("Insult"))
-            choice = choice_input(*choices, return_text=True)
-            clear_screen()
-            if choice == _("Spend time"):
-                if relation.relationship < 15:
-                    print(_("Your {relation} refused to see you."))
-                    player.change_happiness(-4)
-                else:
-                    print(
-                        _("You spent time with your {relation}.").format(
-                            relation=relation.name_accusative()
-                        )
-                    )
-                    enjoyment1 = max(randint(0, 70), randint(0, 70)) + randint(0, 30)
-                    if Trait.CHEERFUL in player.traits:
-                        enjoyment1 = max(enjoyment1, randint(0, 100))
-                    elif Trait.GRUMPY in player.traits:
-                        enjoyment1 = min(enjoyment1, randint(0, 100))
-                    enjoyment2 = round(random.triangular(0, 100, relation.relationship))
-                    print_align_bars(
-                        (_("Your Enjoyment"), enjoyment1),
-                        (
-                            _("{his_her} Enjoyment").format(
-                                his_her=relation.his_her().capitalize()
-                            ),
-                            enjoyment2,
-                        ),
-                    )
-                    if not relation.spent_time:
-                        player.change_happiness(round_stochastic(enjoyment1 / 12))
-                        relation.change_relationship(round_stochastic(enjoyment2 / 12))
-                        if Trait.CHEERFUL in player.traits:
-                            player.change_happiness(3)
-                        relation.spent_time = True
-            elif choice == _("Have a conversation"):
-                if relation.relationship < 25:
-                    display_event(
-                        _(
-                            "Your {relation} isn't interested in having a conversation with you."
-                        ).format(relation=relation.name_accusative())
-                    )
-                    player.change_happiness(-4)
-                else:
-                    agreement = random.triangular(0, 100, 65)
-                    agreement += randint(0, max(0, (relation.relationship - 50) // 3))
-                    if isinstance(relation, Sibling) and randint(1, 2) == 1:
-                        agreement -= randint(0, relation.petulance // 3)
-                    agreement = clamp(
-                        round(agreement), randint(0, 10), randint(90, 100)
-                    )
-                    print(
-                        _("You had a conversation with your {relation}.").format(
-                            relation=relation.name_accusative()
-                        )
+            choice = choice_input(
+                _("Apologize"),
+                _("Agree to disagree"),
+                _("Insult {him_her}").format(him_her=relation.him_her()),
+            )
+            if choice == 1:
+                player.change_karma(rng.randint(1, 3))
+                print(
+                    _("You apologized to your {relation}").format(
+                        relation=relation.name_accusative()
                     )
-                    display_bar(_("Agreement"), agreement)
-                    if not relation.had_conversation:
-                        player.change_happiness(
-                            8 if Trait.CHEERFUL in player.traits else 4
-                        )
-                        relation.change_relationship(round_stochastic(agreement / 12))
-                        relation.had_conversation = True
-                    if agreement < 15:
-                        relation.change_relationship(-randint(2, 8))
-                        print(
-                            _(
-                                "You and your {relation} got into an argument. What will you do?"
-                            ).format(relation=relation.name_accusative())
-                        )
-                        choice = choice_input(
-                            _("Apologize"),
-                            _("Agree to disagree"),
-                            _("Insult {him_her}").format(him_her=relation.him_her()),
-                        )
-                        if choice == 1:
-                            player.change_karma(randint(1, 3))
-                            print(
-                                _("You apologized to your {relation}").format(
-                                    relation=relation.name_accusative()
-                                )
-                            )
-                            relation.change_relationship(randint(2, 4))
-                        elif choice == 2:
-                            print(_("You agreed to disagree"))
-                        elif choice == 3:
-                            player.change_karma(-randint(2, 6))
-                            print(
-                                _("You insulted your {relation}").format(
-                                    relation=relation.name_accusative()
-                                )
-                            )
-                            relation.change_relationship(-randint(4, 7))
-            elif choice == _("Compliment"):
-                appreciation = randint(0, 60) + randint(0, 40)
-                relationship = relation.relationship
-                if relationship >= randint(51, 100):
-                    appreciation = max(appreciation, randint(0, 60) + randint(0, 40))
-                    if relationship >= randint(75, 120):
-                        appreciation = max(
-                            appreciation, randint(0, 60) + randint(0, 40)
-                        )
-                elif relationship <= randint(0, 49):
-                    appreciation = min(appreciation, randint(0, 60) + randint(0, 40))
-                    if relationship <= randint(0, 25):
-                        appreciation = min(
-                            appreciation, randint(0, 60) + randint(0, 40)
-                        )
-                compliment = random.choice(COMPLIMENTS)
+                )
+                relation.change_relationship(rng.randint(2, 4))
+            elif choice == 2:
+                print(_("You agreed to disagree"))
+            elif choice == 3:
+                player.change_karma(-rng.randint(2, 6))
                 print(
-                    _("You told your {relation} that {hes_shes} {compliment}.").format(
-                        relation=relation.name_accusative(),
-                        hes_shes=relation.hes_shes(),
-                        compliment=compliment,
+                    _("You insulted your {relation}").format(
+                        relation=relation.name_accusative()
                     )
                 )
-                display_bar(
-                    _("{his_her} Appreciation").format(
-                        his_her=relation.his_her().capitalize()
-                    ),
-                    appreciation,
+                relation.change_relationship(-rng.randint(4, 7))
+
+
+@RELATIONSHIP_MENU.action(
+    "relationship.compliment",
+    N_("Compliment"),
+    lambda player, relation: relation.age >= 5 and player.age >= 6,
+)
+def compliment(player, relation):
+    rng = player.rng
+    appreciation = rng.randint(0, 60) + rng.randint(0, 40)
+    relationship = relation.relationship
+    if relationship >= rng.randint(51, 100):
+        appreciation = max(appreciation, rng.randint(0, 60) + rng.randint(0, 40))
+        if relationship >= rng.randint(75, 120):
+            appreciation = max(appreciation, rng.randint(0, 60) + rng.randint(0, 40))
+    elif relationship <= rng.randint(0, 49):
+        appreciation = min(appreciation, rng.randint(0, 60) + rng.randint(0, 40))
+        if relationship <= rng.randint(0, 25):
+            appreciation = min(appreciation, rng.randint(0, 60) + rng.randint(0, 40))
+    compliment = _(rng.choice(COMPLIMENTS))
+    print(
+        _("You told your {relation} that {hes_shes} {compliment}.").format(
+            relation=relation.name_accusative(),
+            hes_shes=relation.hes_shes(),
+            compliment=compliment,
+        )
+    )
+    display_bar(
+        _("{his_her} Appreciation").format(his_her=relation.his_her().capitalize()),
+        appreciation,
+    )
+    press_enter()
+    if not relation.was_complimented:
+        player.change_karma(rng.randint(0, 2))
+        relation.change_relationship(round_stochastic(appreciation / 6, rng))
+        if rng.randint(1, 300) <= round_stochastic(
+            appreciation * relation.relationship / 50, rng
+        ):
+            compliment = _(rng.choice(COMPLIMENTS))
+            display_event(
+                _("Your {relation} told you that you're {compliment}!").format(
+                    relation=relation.name_accusative(),
+                    compliment=compliment,
                 )
-                press_enter()
-                if not relation.was_complimented:
-                    player.change_karma(randint(0, 2))
-                    relation.change_relationship(round_stochastic(appreciation / 6))
-                    if randint(1, 300) <= round_stochastic(
-                        appreciation * relation.relationship / 50
-                    ):
-                        compliment = random.choice(COMPLIMENTS)
-                        display_event(
-                            _(
-                                "Your {relation} told you that you're {compliment}!"
-                            ).format(
-                                relation=relation.name_accusative(),
-                                compliment=compliment,
-                            )
-                        )
-                        player.change_happiness(
-                            randint(6, 10) - (3 * (Trait.GRUMPY in player.traits))
-                        )
-                        if Trait.CHEERFUL in player.traits:
-                            player.change_happiness(4)
-                    relation.was_complimented = True
-            elif choice == _("Insult"):
-                rel = relation.name_accusative()
-                if yes_no(
-                    _("Are you sure you want to insult your {relation}?").format(
-                        relation=rel
-                    )
-                ):
-                    display_event(_("You insulted your {rel}.").format(rel=rel))
-                    relation.change_relationship(-randint(4, 8))
-                    player.change_karma(-randint(2, 4))
-                    if isinstance(relation, Sibling):
-                        chance = 50 * (relation.petulance / 100) ** 1.5
-                    else:
-                        chance = (100 - relation.relationship) / 4
-                    if random.uniform(0, 100) < chance:
-                        display_event(
-                            _("Your {rel} insulted you back.").format(rel=rel)
-                        )
-                        player.change_happiness(
-                            -randint(1, 5)
-                            if isinstance(relation, Sibling)
-                            else -randint(3, 8)
-                        )
-            print()
-    if choice == _("Activities"):
-        print(_("Activities Menu"))
-        print()
-        choices = [_("Back")]
-        if 3 <= player.age < 13:
-            choices.append(_("Play with your toys"))
-        if player.age >= 4:
-            choices.append(_("Doctor"))
-        if player.age >= 5:
-            choices.append(_("Arts and Crafts"))
-        if player.age >= 13:
-            choices.append(_("Meditate"))
-            choices.append(_("Library"))
-            choices.append(_("Gym"))
-            choices.append(_("Listen to music"))
-        if player.age >= 18:
-            choices.append(_("Lottery"))
-        choices.append(_("Surrender"))
-        choice = choice_input(*choices, return_text=True)
-        clear_screen()
-        if choice == _("Play with your toys"):
-            if player.is_depressed():
-                print(_("You don't feel like playing, but you decide to try anyway."))
-                happy_gain = randint(0, 6)
-                if Trait.CHEERFUL in player.traits:
-                    happy_gain += 2
-            else:
-                sayings = [
-                    _("You played with your toys."),
-                    _("You had a lot of fun playing with your toys."),
-                ]
-                print(random.choice(sayings))
-                happy_gain = randint(5, 10)
-                if Trait.CHEERFUL in player.traits:
-                    happy_gain += 5
-            if not player.played:
-                player.played = True
-                player.change_happiness(happy_gain)
-        elif choice == _("Arts and Crafts"):
-            if randint(1, 10) == 1:
+            )
+            player.change_happiness(
+                rng.randint(6, 10) - (3 * bool(player.traits & TraitBit.GRUMPY))
+            )
+            if player.traits & TraitBit.CHEERFUL:
+                player.change_happiness(4)
+        relation.was_complimented = True
+
+
+@RELATIONSHIP_MENU.action(
+    "relationship.insult",
+    N_("Insult"),
+    lambda player, relation: relation.age >= 5 and player.age >= 6,
+)
+def insult(player, relation):
+    rng = player.rng
+    rel = relation.name_accusative()
+    if yes_no(
+        _("Are you sure you want to insult your {relation}?").format(relation=rel)
+    ):
+        display_event(_("You insulted your {rel}.").format(rel=rel))
+        relation.change_relationship(-rng.randint(4, 8))
+        player.change_karma(-rng.randint(2, 4))
+        if isinstance(relation, Sibling):
+            chance = 50 * (relation.petulance / 100) ** 1.5
+        else:
+            chance = (100 - relation.relationship) / 4
+        if rng.uniform(0, 100) < chance:
+            display_event(_("Your {rel} insulted you back.").format(rel=rel))
+            player.change_happiness(
+                -rng.randint(1, 5)
+                if isinstance(relation, Sibling)
+                else -rng.randint(3, 8)
+            )
+
+
+@ACTIVITIES_MENU.action(
+    "activities.play", N_("Play with your toys"), lambda player: 3 <= player.age < 13
+)
+def play_with_toys(player):
+    rng = player.rng
+    if player.is_depressed():
+        print(_("You don't feel like playing, but you decide to try anyway."))
+        happy_gain = rng.randint(0, 6)
+        if player.traits & TraitBit.CHEERFUL:
+            happy_gain += 2
+    else:
+        sayings = [
+            _("You played with your toys."),
+            _("You had a lot of fun playing with your toys."),
+        ]
+        print(rng.choice(sayings))
+        happy_gain = rng.randint(5, 10)
+        if player.traits & TraitBit.CHEERFUL:
+            happy_gain += 5
+    if not player.played:
+        player.played = True
+        player.change_happiness(happy_gain)
+
+
+@ACTIVITIES_MENU.action(
+    "activities.doctor", N_("Doctor"), lambda player: player.age >= 4
+)
+def doctor(player):
+    rng = player.rng
+    has_fee = player.age >= 18
+    if has_fee:
+        visit = yes_no(_("Would you like to visit the doctor? ($100 consultation fee)"))
+    else:
+        visit = yes_no(_("Would you like to visit the doctor?"))
+    if visit:
+        if has_fee and player.money < 100:
+            print(_("You don't have enough money."))
+        else:
+            if has_fee:
+                player.money -= 100
+            if len(player.illnesses) == 0:
                 print(
                     _(
-                        "You thought about doing arts and crafts, but couldn't decide what to make."
+                        "The doctor has determined that you are not suffering from any illnesses."
                     )
                 )
-                player.change_happiness(-randint(1, 3))
             else:
-                if randint(1, 2) == 1 or player.age < 16:
-                    print(_("You decided to paint."))
-                    if not player.did_arts_and_crafts:
-                        player.change_happiness(randint(2, 4))
-                        player.change_smarts(randint(1, 2))
-                else:
-                    print(_("You decided to bake something tasty!"))
-                    if not player.did_arts_and_crafts:
-                        player.change_happiness(randint(3, 6))
-                        player.change_smarts(randint(0, 3))
-                if not player.did_arts_and_crafts:
-                    if Trait.CHEERFUL in player.traits:
-                        player.change_happiness(3)
-                        if Trait.NERD in player.traits:
-                            player.change_smarts(randint(0, 2))
-                player.did_arts_and_crafts = True
-        elif choice == _("Listen to music"):
-            print(_("You listened to some music."))
-            if not player.listened_to_music:
-                player.change_happiness(
-                    randint(4, 8) + 3 * (Trait.CHEERFUL in player.traits)
-                )
-                player.change_health(randint(0, 2))
-                player.change_stress(-randint(1, 7))
-                player.change_smarts(randint(0, 1 + (Trait.NERD in player.traits)))
-                player.listened_to_music = True
-        elif choice == _("Doctor"):
-            has_fee = player.age >= 18
-            if has_fee:
-                visit = yes_no(
-                    _("Would you like to visit the doctor? ($100 consultation fee)")
+                print(
+                    _(
+                        "The doctor has determined that you are currently suffering from the following:"
+                    )
                 )
-            else:
-                visit = yes_no(_("Would you like to visit the doctor?"))
-            if visit:
-                if has_fee and player.money < 100:
-                    print(_("You don't have enough money."))
-                else:
-                    if has_fee:
-                        player.money -= 100
-                    if len(player.illnesses) == 0:
-                        print(
-                            _(
-                                "The doctor has determined that you are not suffering from any illnesses."
+                s = [
+                    _(ILLNESSES_TRANSLATIONS.get(name, name))
+                    for name in player.illnesses
+                ]
+                print(", ".join(s))
+                options = ["Back"]
+                options.extend(_("Treat {illness}").format(illness=n) for n in s)
+                choice = choice_input(*options)
+                if choice > 1:
+                    was_cured = False
+                    illness = player.illnesses[choice - 2]
+                    if illness == "Depression":
+                        was_cured = rng.randint(
+                            1, 4
+                        ) == 1 and player.happiness >= rng.randint(20, 35)
+                        if was_cured:
+                            player.change_health(rng.randint(4, 8))
+                            player.change_happiness((100 - player.happiness) // 2)
+                    elif illness == "High Blood Pressure":
+                        was_cured = (
+                            player.stress < rng.randint(65, 85)
+                            and rng.randint(1, 3) == 1
+                        )
+                        if was_cured:
+                            player.change_health(rng.randint(4, 8))
+                            player.change_happiness(rng.randint(3, 6))
+                    print(
+                        _("You were treated for your {illness}.").format(
+                            illness=illness
+                        )
+                    )
+                    if was_cured:
+                        display_event(
+                            _("You are no longer suffering from {illness}.").format(
+                                illness=illness
                             )
                         )
+                        player.remove_illness(illness)
                     else:
-                        print(
-                            _(
-                                "The doctor has determined that you are currently suffering from the following:"
+                        player.change_health(rng.randint(3, 5))
+                        player.change_happiness(rng.randint(3, 5))
+                        display_event(
+                            _("You continue to suffer from {illness}.").format(
+                                illness=illness
                             )
                         )
-                        s = [
-                            ILLNESSES_TRANSLATIONS.get(name, name)
-                            for name in player.illnesses
-                        ]
-                        print(", ".join(s))
-                        options = ["Back"]
-                        options.extend(
-                            _("Treat {illness}").format(illness=n) for n in s
-                        )
-                        choice = choice_input(*options)
-                        if choice > 1:
-                            was_cured = False
-                            illness = player.illnesses[choice - 2]
-                            if illness == "Depression":
-                                was_cured = randint(
-                                    1, 4
-                                ) == 1 and player.happiness >= randint(20, 35)
-                                if was_cured:
-                                    player.change_health(randint(4, 8))
-                                    player.change_happiness(
-                                        (100 - player.happiness) // 2
-                                    )
-                            elif illness == "High Blood Pressure":
-                                was_cured = (
-                                    player.stress < randint(65, 85)
-                                    and randint(1, 3) == 1
-                                )
-                                if was_cured:
-                                    player.change_health(randint(4, 8))
-                                    player.change_happiness(randint(3, 6))
-                            print(
-                                _("You were treated for your {illness}.").format(
-                                    illness=illness
-                                )
-                            )
-                            if was_cured:
-                                display_event(
-                                    _(
-                                        "You are no longer suffering from {illness}."
-                                    ).format(illness=illness)
-                                )
-                                player.remove_illness(illness)
-                            else:
-                                player.change_health(randint(3, 5))
-                                player.change_happiness(randint(3, 5))
-                                display_event(
-                                    _("You continue to suffer from {illness}.").format(
-                                        illness=illness
-                                    )
-                                )
-        elif choice == _("Meditate"):
-            print(_("You practiced meditation."))
-            if not player.meditated:  # You can only get the bonus once per year
-                player.change_health(randint(2, 4))
-                player.change_happiness(randint(3, 5))
-                player.change_karma(randint(1, 3))
-                player.change_stress(-randint(3, 8))
-                if (
-                    player.times_meditated == 0 or randint(1, 20) == 1
-                ):  # Your first meditation is guaranteed to cause a deeper awareness
-                    player.change_happiness(2)
-                    player.change_stress(-3)
-                    print(_("You have achieved a deeper awareness of yourself."))
-                    display_bar(_("Karma"), player.karma)
-                if Trait.CHEERFUL in player.traits:
-                    player.change_happiness(4)
-                player.meditated = True
-                player.times_meditated += 1
-        elif choice == _("Library"):
-            print(_("You went to the library."))
-            enjoyment = randint(15, 65)
-            if Trait.CHEERFUL in player.traits:
-                enjoyment = max(enjoyment, randint(15, 65))
-            elif Trait.GRUMPY in player.traits:
-                enjoyment = min(enjoyment, randint(15, 65))
-            display_bar(_("Your Enjoyment"), enjoyment)
-            if not player.visited_library:  # You can only get the bonus once per year
-                player.change_happiness(round_stochastic(enjoyment / 15))
-                if Trait.CHEERFUL in player.traits:
-                    player.change_happiness(3)
-                player.change_smarts(
-                    randint(2, 5) + (3 * (Trait.NERD in player.traits))
+
+
+@ACTIVITIES_MENU.action(
+    "activities.arts_and_crafts", N_("Arts and Crafts"), lambda player: player.age >= 5
+)
+def arts_and_crafts(player):
+    rng = player.rng
+    if rng.randint(1, 10) == 1:
+        print(
+            _(
+                "You thought about doing arts and crafts, but couldn't decide what to make."
+            )
+        )
+        player.change_happiness(-rng.randint(1, 3))
+    else:
+        if rng.randint(1, 2) == 1 or player.age < 16:
+            print(_("You decided to paint."))
+            if not player.did_arts_and_crafts:
+                player.change_happiness(rng.randint(2, 4))
+                player.change_smarts(rng.randint(1, 2))
+        else:
+            print(_("You decided to bake something tasty!"))
+            if not player.did_arts_and_crafts:
+                player.change_happiness(rng.randint(3, 6))
+                player.change_smarts(rng.randint(0, 3))
+        if not player.did_arts_and_crafts:
+            if player.traits & TraitBit.CHEERFUL:
+                player.change_happiness(3)
+                if player.traits & TraitBit.NERD:
+                    player.change_smarts(rng.randint(0, 2))
+        player.did_arts_and_crafts = True
+
+
+@ACTIVITIES_MENU.action(
+    "activities.meditate", N_("Meditate"), lambda player: player.age >= 13
+)
+def meditate(player):
+    rng = player.rng
+    print(_("You practiced meditation."))
+    if not player.meditated:  # You can only get the bonus once per year
+        player.change_health(rng.randint(2, 4))
+        player.change_happiness(rng.randint(3, 5))
+        player.change_karma(rng.randint(1, 3))
+        player.change_stress(-rng.randint(3, 8))
+        if (
+            player.times_meditated == 0 or rng.randint(1, 20) == 1
+        ):  # Your first meditation is guaranteed to cause a deeper awareness
+            player.change_happiness(2)
+            player.change_stress(-3)
+            print(_("You have achieved a deeper awareness of yourself."))
+            display_bar(_("Karma"), player.karma)
+        if player.traits & TraitBit.CHEERFUL:
+            player.change_happiness(4)
+        player.meditated = True
+        player.times_meditated += 1
+
+
+@ACTIVITIES_MENU.action(
+    "activities.library", N_("Library"), lambda player: player.age >= 13
+)
+def library(player):
+    rng = player.rng
+    print(_("You went to the library."))
+    enjoyment = rng.randint(15, 65)
+    if player.traits & TraitBit.CHEERFUL:
+        enjoyment = max(enjoyment, rng.randint(15, 65))
+    elif player.traits & TraitBit.GRUMPY:
+        enjoyment = min(enjoyment, rng.randint(15, 65))
+    display_bar(_("Your Enjoyment"), enjoyment)
+    if not player.visited_library:  # You can only get the bonus once per year
+        player.change_happiness(round_stochastic(enjoyment / 15, rng))
+        if player.traits & TraitBit.CHEERFUL:
+            player.change_happiness(3)
+        player.change_smarts(
+            rng.randint(2, 5) + (3 * bool(player.traits & TraitBit.NERD))
+        )
+        player.visited_library = True
+
+
+@ACTIVITIES_MENU.action("activities.gym", N_("Gym"), lambda player: player.age >= 13)
+def gym(player):
+    rng = player.rng
+    if player.health < 10:
+        print(_("Your health is too weak to visit the gym."))
+    else:
+        workout = rng.randint(25, 75)
+        if player.health > 50:
+            workout += rng.randint(0, (player.health - 50) // 2)
+        else:
+            workout -= rng.randint(0, (50 - player.health) // 2)
+        lo = -25
+        hi = 25
+        if workout < 25:
+            lo = -workout
+        elif workout > 75:
+            hi = 100 - workout
+        workout += rng.randint(lo, hi)
+        print(_("You worked out at the gym."))
+        print(_("Workout") + ": " + draw_bar(workout, 100, 25))
+        if not player.worked_out:
+            player.change_happiness(round(workout / 12) + rng.randint(0, 1))
+            if player.traits & TraitBit.CHEERFUL:
+                player.change_happiness(3)
+            player.change_health(round(workout / 14) + rng.randint(1, 2))
+            if player.looks < workout:
+                player.change_looks(
+                    rng.randint(1, 3) + rng.randint(0, round(workout / 33))
                 )
-                player.visited_library = True
-        elif choice == _("Gym"):
-            if player.health < 10:
-                print(_("Your health is too weak to visit the gym."))
-            else:
-                workout = randint(25, 75)
-                if player.health > 50:
-                    workout += randint(0, (player.health - 50) // 2)
-                else:
-                    workout -= randint(0, (50 - player.health) // 2)
-                lo = -25
-                hi = 25
-                if workout < 25:
-                    lo = -workout
-                elif workout > 75:
-                    hi = 100 - workout
-                workout += randint(lo, hi)
-                print(_("You worked out at the gym."))
-                print(_("Workout") + ": " + draw_bar(workout, 100, 25))
-                if not player.worked_out:
-                    player.change_happiness(round(workout / 12) + randint(0, 1))
-                    if Trait.CHEERFUL in player.traits:
-                        player.change_happiness(3)
-                    player.change_health(round(workout / 14) + randint(1, 2))
-                    if player.looks < workout:
-                        player.change_looks(
-                            randint(1, 3) + randint(0, round(workout / 33))
-                        )
-                    player.worked_out = True
-                print()
-        elif choice == _("Lottery"):
-            print(_("Play the lottery today!"))
-            print(_("Ticket cost: $4 each"))
+            player.worked_out = True
+        print()
+
+
+@ACTIVITIES_MENU.action(
+    "activities.music", N_("Listen to music"), lambda player: player.age >= 13
+)
+def listen_to_music(player):
+    rng = player.rng
+    print(_("You listened to some music."))
+    if not player.listened_to_music:
+        player.change_happiness(
+            rng.randint(4, 8) + 3 * bool(player.traits & TraitBit.CHEERFUL)
+        )
+        player.change_health(rng.randint(0, 2))
+        player.change_stress(-rng.randint(1, 7))
+        player.change_smarts(rng.randint(0, 1 + bool(player.traits & TraitBit.NERD)))
+        player.listened_to_music = True
+
+
+@ACTIVITIES_MENU.action(
+    "activities.lottery", N_("Lottery"), lambda player: player.age >= 18
+)
+def lottery(player):
+    rng = player.rng
+    print(_("Play the lottery today!"))
+    print(_("Ticket cost: $4 each"))
+    print(_("Lottery jackpot: ${jackpot}").format(jackpot=player.lottery_jackpot))
+    choice = choice_input(_("Buy a ticket"), _("Buy 10 tickets"), _("Back"))
+    ticket_num = 0
+    if choice == 1:
+        ticket_num = 1
+    elif choice == 2:
+        ticket_num = 10
+    cost = ticket_num * 4
+    if ticket_num > 0:
+        if player.money < cost:
+            print(_("You don't have enough money"))
+        else:
+            player.money -= cost
             print(
-                _("Lottery jackpot: ${jackpot}").format(jackpot=player.lottery_jackpot)
+                _(
+                    "Guess the 4 winning numbers between 1 and 20. Each number in the line must be separated by a space."
+                )
             )
-            choice = choice_input(_("Buy a ticket"), _("Buy 10 tickets"), _("Back"))
-            ticket_num = 0
-            if choice == 1:
-                ticket_num = 1
-            elif choice == 2:
-                ticket_num = 10
-            cost = ticket_num * 4
-            if ticket_num > 0:
-                if player.money < cost:
-                    print(_("You don't have enough money"))
-                else:
-                    player.money -= cost
-                    print(
-                        _(
-                            "Guess the 4 winning numbers between 1 and 20. Each number in the line must be separated by a space."
-                        )
-                    )
+            if ticket_num > 1:
+                print(_("The numbers within each line must be unique."))
+            else:
+                print(_("The numbers must be unique."))
+            guessed = []
+            for i in range(ticket_num):
+                valid = False
+                while not valid:
+                    valid = True
                     if ticket_num > 1:
-                        print(_("The numbers within each line must be unique."))
+                        msg = _("Guess #{num}: ").format(num=i + 1)
                     else:
-                        print(_("The numbers must be unique."))
-                    guessed = []
-                    for i in range(ticket_num):
+                        msg = _("Guess: ")
+                    guess = read_line(msg)
+                    nums = guess.split()
+                    try:
+                        nums = list(map(int, nums))
+                    except ValueError:
+                        print(_("The values must all be integers."))
+                        valid = False
+                        continue
+                    if len(nums) != 4:
+                        print(_("You must enter exactly 4 numbers"))
+                        valid = False
+                    elif not all(1 <= val <= 20 for val in nums):
+                        print(_("All values must be between 1 and 20"))
+                        valid = False
+                    elif len(nums) != len(set(nums)):
+                        print(_("All values must be unique."))
                         valid = False
-                        while not valid:
-                            valid = True
-                            if ticket_num > 1:
-                                msg = _("Guess #{num}: ").format(num=i + 1)
-                            else:
-                                msg = _("Guess: ")
-                            guess = input(msg)
-                            nums = guess.split()
-                            try:
-                                nums = list(map(int, nums))
-                            except ValueError:
-                                print(_("The values must all be integers."))
-                                valid = False
-                                continue
-                            if len(nums) != 4:
-                                print(_("You must enter exactly 4 numbers"))
-                                valid = False
-                            elif not all(1 <= val <= 20 for val in nums):
-                                print(_("All values must be between 1 and 20"))
-                                valid = False
-                            elif len(nums) != len(set(nums)):
-                                print(_("All values must be unique."))
-                                valid = False
-                            else:
-                                guessed.append(nums)
-                    winning = random.sample(range(1, 21), 4)
-                    print(
-                        _("The winning numbers are {nums}").format(
-                            nums=", ".join(map(str, winning))
-                        )
-                    )
-                    won = False
-                    for guess in guessed:
-                        if set(guess) == set(winning):
-                            won = True
-                            break
-                    if won:
-                        print(
-                            _("YOU WON THE ${amount} LOTTERY JACKPOT!!!").format(
-                                amount=player.lottery_jackpot
-                            )
-                        )
-                        player.change_happiness(100)
-                        player.money += player.lottery_jackpot
-                        player.change_jackpot()
                     else:
-                        print(
-                            _("You did not win the ${amount} lottery jackpot.").format(
-                                amount=player.lottery_jackpot
-                            )
-                        )
-        elif choice == _("Surrender"):
-            if yes_no(_("Are you sure you want to surrender this life?")):
-                if yes_no(_("This will kill your current character. Continue?")):
-                    player.die(_("You surrendered."))
-    if choice == _("School"):
-        print(_("School Menu"))
-        print()
-        display_bar(_("Grades"), player.grades)
-        choice = choice_input(_("Back"), _("Study harder"), _("Drop out"))
-        clear_screen()
-        if choice == 2:
-            print(_("You began studying harder"))
-            if not player.studied:
-                player.change_grades(randint(5, 7 + (100 - player.grades) // 5))
-                player.change_smarts(randint(0, 2) + (Trait.NERD in player.traits))
-                player.studied = True
-        if choice == 3:
-            can_drop_out = player.smarts < randint(8, 12) + randint(0, 13)
-            can_drop_out &= not player.tried_to_drop_out
-            if (
-                player.age >= 18
-                or player.uv_years > 0
-                or (player.age >= randint(15, 16) and can_drop_out)
-            ):
-                player.dropped_out = True
-                player.grades = None
-                print(_("You dropped out of school."))
-                if player.uv_years > 0:
-                    player.uv_years = 0
-            else:
-                player.tried_to_drop_out = True
-                print(_("Your parents won't let you drop out of school."))
-    if choice == _("Debug Menu"):
-        choice = choice_input(_("Back"), _("Stats"), _("Identity"))
-        if choice == 2:
-            while True:
-                clear_screen()
-                print(_("Your stats"))
-                display_data(_("Happiness"), player.happiness)
-                display_data(_("Health"), player.health)
-                display_data(_("Smarts"), player.smarts)
-                display_data(_("Looks"), player.looks)
-                display_data(_("Karma"), player.karma)
-                print()
-                print(_("The below stats only matter if you have a job:"))
-                display_data(_("Stress"), player.stress)
-                display_data(_("Performance"), player.performance)
-                print()
-                choice = choice_input(
-                    _("Back"),
-                    _("Modify Happiness"),
-                    _("Modify Health"),
-                    _("Modify Smarts"),
-                    _("Modify Looks"),
-                    _("Modify Karma"),
-                    _("Modify Stress"),
-                    _("Modify Performance"),
+                        guessed.append(nums)
+            winning = rng.sample(range(1, 21), 4)
+            print(
+                _("The winning numbers are {nums}").format(
+                    nums=", ".join(map(str, winning))
                 )
-                if choice == 1:
+            )
+            won = False
+            for guess in guessed:
+                if set(guess) == set(winning):
+                    won = True
                     break
-                elif choice == 2:
-                    print(_("What would you like to set Happiness to? (0-100)"))
-                    val = int_input_range_optional(0, 100)
-                    if val is not None:
-                        player.happiness = val
-                elif choice == 3:
-                    print(_("What would you like to set Health to? (0-100)"))
-                    val = int_input_range_optional(0, 100)
-                    if val is not None:
-                        player.health = val
-                elif choice == 4:
-                    print(_("What would you like to set Smarts to? (0-100)"))
-                    val = int_input_range_optional(0, 100)
-                    if val is not None:
-                        player.smarts = val
-                elif choice == 5:
-                    print(_("What would you like to set Looks to? (0-100)"))
-                    val = int_input_range_optional(0, 100)
-                    if val is not None:
-                        player.looks = val
-                elif choice == 6:
-                    print(_("What would you like to set Karma to? (0-100)"))
-                    val = int_input_range_optional(0, 100)
-                    if val is not None:
-                        player.karma = val
-                elif choice == 7:
-                    print(_("What would you like to set Stress to? (0-100)"))
-                    val = int_input_range_optional(0, 100)
-                    if val is not None:
-                        player.stress = val
-                elif choice == 8:
-                    print(_("What would you like to set Performance to? (0-100)"))
-                    val = int_input_range_optional(0, 100)
-                    if val is not None:
-                        player.performance = val
-        elif choice == 3:
-            while True:
-                clear_screen()
-                display_data(_("First name"), player.firstname)
-                display_data(_("Last name"), player.lastname)
-                display_data(_("Gender"), player.get_gender_str())
-                choice = choice_input(
-                    _("Back"),
-                    _("Change first name"),
-                    _("Change last name"),
-                    _("Change gender"),
+            if won:
+                print(
+                    _("YOU WON THE ${amount} LOTTERY JACKPOT!!!").format(
+                        amount=player.lottery_jackpot
+                    )
                 )
-                if choice == 1:
-                    break
-                elif choice == 2:
-                    name = input(_("Enter first name: ")).strip()
-                    if name:
-                        player.firstname = name
-                elif choice == 3:
-                    name = input(_("Enter last name: ")).strip()
-                    if name:
-                        player.lastname = name
-                elif choice == 4:
-                    if player.gender == Gender.Male:
-                        player.gender = Gender.Female
-                    else:
-                        player.gender = Gender.Male
-    if choice == _("Find a Job"):
-        salary = round_stochastic(
-            randexpo(30000, 55000)
-        )  # TODO: Add a selection of different types of jobs
-        if yes_no(
-            _(
-                "You found a job with a salary of ${salary:,}. Would you like to apply?"
-            ).format(salary=salary)
-        ):
-            m = 100 + round_stochastic((salary - 40000) / 300)
-            mod = (
-                50 - player.smarts
-            )  # Mod is inverted because we want to roll 100 OR LOWER to get the job
-            roll = randint(1, m)
-            if mod > 0:
-                roll += randint(0, mod)
-            elif mod < 0:
-                roll -= randint(0, abs(mod))
-            if roll <= 100:
-                print(_("You got the job!"))
-                player.change_happiness(4)
-                player.get_job(salary)
+                player.change_happiness(100)
+                player.money += player.lottery_jackpot
+                player.change_jackpot()
             else:
-                print(_("You didn't get an interview."))
-                player.change_happiness(-randint(1, 4))
-        else:
-            clear_screen()
-    elif choice == _("Job Menu"):
-        print(_("Your job"))
+                print(
+                    _("You did not win the ${amount} lottery jackpot.").format(
+                        amount=player.lottery_jackpot
+                    )
+                )
+
+
+@ACTIVITIES_MENU.action("activities.surrender", N_("Surrender"))
+def surrender(player):
+    if yes_no(_("Are you sure you want to surrender this life?")):
+        if yes_no(_("This will kill your current character. Continue?")):
+            player.die(_("You surrendered."))
+
+
+@SCHOOL_MENU.action("school.study", N_("Study harder"))
+def study_harder(player):
+    rng = player.rng
+    print(_("You began studying harder"))
+    if not player.studied:
+        player.change_grades(rng.randint(5, 7 + (100 - player.grades) // 5))
+        player.change_smarts(rng.randint(0, 2) + bool(player.traits & TraitBit.NERD))
+        player.studied = True
+
+
+@SCHOOL_MENU.action("school.drop_out", N_("Drop out"))
+def drop_out(player):
+    rng = player.rng
+    can_drop_out = player.smarts < rng.randint(8, 12) + rng.randint(0, 13)
+    can_drop_out &= not player.tried_to_drop_out
+    if (
+        player.age >= 18
+        or player.uv_years > 0
+        or (player.age >= rng.randint(15, 16) and can_drop_out)
+    ):
+        player.dropped_out = True
+        player.grades = None
+        print(_("You dropped out of school."))
+        if player.uv_years > 0:
+            player.uv_years = 0
+    else:
+        player.tried_to_drop_out = True
+        print(_("Your parents won't let you drop out of school."))
+
+
+@JOB_MENU.action("job.work_harder", N_("Work Harder"))
+def work_harder(player):
+    rng = player.rng
+    print("You worked harder.")
+    if not player.worked_harder:
+        player.change_performance(rng.randint(1, 10))
+        player.change_stress(4)
+        if player.traits & TraitBit.LAZY:
+            player.change_stress(6)
+        player.worked_harder = True
+
+
+@JOB_MENU.action("job.retire", N_("Retire"), can_retire)
+def retire(player):
+    rng = player.rng
+    pension = round(player.salary * min(player.years_worked, 35) * 0.02)
+    if yes_no(
+        _(
+            "Do you want to retire? You will receive a yearly pension of ${pension}"
+        ).format(pension=pension)
+    ):
+        player.lose_job()
+        player.salary = pension
+        player.change_happiness(rng.randint(25, 50))
+        print(
+            _("You retired and are now receiving pension of ${pension}.").format(
+                pension=pension
+            )
+        )
+
+
+@JOB_MENU.action("job.quit", N_("Quit Job"), lambda player: not can_retire(player))
+def quit_job(player):
+    if yes_no(_("Are you sure you want to quit your job?")):
+        player.lose_job()
+        print(_("You quit your job."))
+
+
+@DEBUG_MENU.action("debug.stats", N_("Stats"))
+def debug_stats(player):
+    while True:
+        clear_screen()
+        print(_("Your stats"))
+        display_data(_("Happiness"), player.happiness)
+        display_data(_("Health"), player.health)
+        display_data(_("Smarts"), player.smarts)
+        display_data(_("Looks"), player.looks)
+        display_data(_("Karma"), player.karma)
         print()
-        print_align_bars(
-            (_("Stress"), player.stress), (_("Performance"), player.performance)
+        print(_("The below stats only matter if you have a job:"))
+        display_data(_("Stress"), player.stress)
+        display_data(_("Performance"), player.performance)
+        print()
+        choice = choice_input(
+            _("Back"),
+            _("Modify Happiness"),
+            _("Modify Health"),
+            _("Modify Smarts"),
+            _("Modify Looks"),
+            _("Modify Karma"),
+            _("Modify Stress"),
+            _("Modify Performance"),
         )
-        can_retire = player.years_worked >= 10 and player.age >= 65
+        if choice == 1:
+            break
+        elif choice == 2:
+            print(_("What would you like to set Happiness to? (0-100)"))
+            val = int_input_range_optional(0, 100)
+            if val is not None:
+                player.happiness = val
+        elif choice == 3:
+            print(_("What would you like to set Health to? (0-100)"))
+            val = int_input_range_optional(0, 100)
+            if val is not None:
+                player.health = val
+        elif choice == 4:
+            print(_("What would you like to set Smarts to? (0-100)"))
+            val = int_input_range_optional(0, 100)
+            if val is not None:
+                player.smarts = val
+        elif choice == 5:
+            print(_("What would you like to set Looks to? (0-100)"))
+            val = int_input_range_optional(0, 100)
+            if val is not None:
+                player.looks = val
+        elif choice == 6:
+            print(_("What would you like to set Karma to? (0-100)"))
+            val = int_input_range_optional(0, 100)
+            if val is not None:
+                player.karma = val
+        elif choice == 7:
+            print(_("What would you like to set Stress to? (0-100)"))
+            val = int_input_range_optional(0, 100)
+            if val is not None:
+                player.stress = val
+        elif choice == 8:
+            print(_("What would you like to set Performance to? (0-100)"))
+            val = int_input_range_optional(0, 100)
+            if val is not None:
+                player.performance = val
+
+
+@DEBUG_MENU.action("debug.identity", N_("Identity"))
+def debug_identity(player):
+    while True:
+        clear_screen()
+        display_data(_("First name"), player.firstname)
+        display_data(_("Last name"), player.lastname)
+        display_data(_("Gender"), player.get_gender_str())
         choice = choice_input(
-            _("Back"), _("Work Harder"), _("Retire") if can_retire else _("Quit Job")
+            _("Back"),
+            _("Change first name"),
+            _("Change last name"),
+            _("Change gender"),
         )
-        if choice == 2:
-            print("You worked harder.")
-            if not player.worked_harder:
-                player.change_performance(randint(1, 10))
-                player.change_stress(4)
-                if Trait.LAZY in player.traits:
-                    player.change_stress(6)
-                player.worked_harder = True
-        if choice == 3:
-            if can_retire:
-                pension = round(player.salary * min(player.years_worked, 35) * 0.02)
-                if yes_no(
-                    _(
-                        "Do you want to retire? You will receive a yearly pension of ${pension}"
-                    ).format(pension=pension)
-                ):
-                    player.lose_job()
-                    player.salary = pension
-                    player.change_happiness(randint(25, 50))
-                    print(
-                        _(
-                            "You retired and are now receiving pension of ${pension}."
-                        ).format(pension=pension)
-                    )
-            elif yes_no(_("Are you sure you want to quit your job?")):
-                player.lose_job()
-                print(_("You quit your job."))
-        # TODO: Add ability to ask for a raise
-    elif choice == _("View Saved Games"):
-        players = list(filter(lambda p: p["ID"] != player.ID, get_saves()))
-        if not players:
-            print(_("No previously saved games"))
-        else:
-            print(_("Previously saved games:"))
-            choices = list(map(lambda p: p["name"], players))
-            choices.append(_("Back"))
-            choice = choice_input(*choices)
-            clear_screen()
-            if choice < len(choices):
-                d = players[choice - 1]
-                print(d["name"] + "\n")
-                choice = choice_input(_("Back"), _("Load Save"), _("Delete Save"))
-                if choice == 2:
-                    if yes_no(_("Would you like to load this save?")):
-                        player.save_game()
-                        player.__init__()  # Re-initialize in preparation for loading a save
-                        player.__dict__.update(d)
-                        clear_screen()
-                elif choice == 3:
-                    if yes_no(_("Are you sure you want to delete this save?")):
-                        os.remove(d["save_path"])
+        if choice == 1:
+            break
+        elif choice == 2:
+            name = read_line(_("Enter first name: ")).strip()
+            if name:
+                player.firstname = name
+        elif choice == 3:
+            name = read_line(_("Enter last name: ")).strip()
+            if name:
+                player.lastname = name
+        elif choice == 4:
+            if player.gender == Gender.Male:
+                player.gender = Gender.Female
+            else:
+                player.gender = Gender.Male
@@ -2,22 +2,23 @@ from src.people.classes.player import Player
 from src.people.classes.sibling import Sibling
 from src.lifesim_lib.translation import _
 from src.lifesim_lib.const import SAVE_PATH
-import os, random, pickle
-from random import randint
+import os
 from src.lifesim_lib.lifesim_lib import *
+from src.menus.main import main_menu
 
 
 def start_menu():
     if not os.path.exists(SAVE_PATH):
         os.mkdir(SAVE_PATH)
-    saves = get_save_files()
+    saves = []
+    if can_browse_saves():
+        saves = [entry for entry in list_saves() if not life_is_open(entry["ID"])]
     if saves:
         choice = choice_input(_("Load Game"), _("New Game"))
         if choice == 1:
-            players = get_saves(saves)
-            choices = [p["name"] for p in players]
+            choices = [entry["name"] for entry in saves]
             choice = choice_input(*choices)
-            d = players[choice - 1]
+            d = load_save(saves[choice - 1]["ID"])
             return Player.load(d)
     choice = choice_input(_("Random Life"), _("Custom Life"))
 
@@ -25,9 +26,9 @@ def start_menu():
         first = ""
         last = ""
         while not first:
-            first = input(_("Enter your first name: ")).strip()
+            first = read_line(_("Enter your first name: ")).strip()
         while not last:
-            last = input(_("Enter your last name: ")).strip()
+            last = read_line(_("Enter your last name: ")).strip()
         print()
         print(_("Choose your gender:"))
         choice = choice_input(_("Male"), _("Female"))
@@ -38,7 +39,7 @@ def start_menu():
         if choice == 1:
             player.randomize_traits()
         else:
-            player.traits = set()
+            player.traits = 0
             all_traits = [t for t in Trait]
             while True:
                 clear_screen()
@@ -51,9 +52,7 @@ def start_menu():
                 else:
                     print(_("None"))
                 print()
-                can_choose = lambda t: not any(
-                    t.conflicts_with(other) for other in player.traits
-                )
+                can_choose = lambda t: not player.traits & t.conflict_mask
                 options = [trait for trait in all_traits if can_choose(trait)]
                 choices = list(
                     map(lambda t: get_colored(t.name_, t.get_color()), options)
@@ -65,10 +64,7 @@ def start_menu():
                         break
                 else:
                     trait = options[choice - 1]
-                    if trait in player.traits:
-                        player.traits.remove(trait)
-                    else:
-                        player.traits.add(trait)
+                    player.traits ^= trait.bit
             clear_screen()
         return player
     else:
@@ -81,21 +77,8 @@ def start_menu():
     print(
         _("Your father is {name}, age {age}.").format(name=father.name, age=father.age)
     )
-    sibling_age = randint(2, 10)
-    if (
-        mother.age >= randint(16, 20) + sibling_age
-        and father.age >= randint(16, 18) + sibling_age
-        and randint(1, 6) < 6
-    ):
-        whichlast = random.choice(
-            (player.parents["Mother"].lastname, player.parents["Father"].lastname)
-        )
-        theirsmarts = round_stochastic((randint(0, 100) + player.smarts) / 2)
-        theirlooks = round_stochastic((randint(0, 100) + player.looks) / 2)
-        sibling = Sibling(
-            whichlast, sibling_age, Gender.random(), theirsmarts, theirlooks
-        )
-        player.relations.append(sibling)
+    sibling = player.generate_sibling()
+    if sibling is not None:
         print(
             _("You have a {siblingtype} named {name}, age {age}.").format(
                 siblingtype=sibling.get_translated_type().lower(),
@@ -105,3 +88,32 @@ def start_menu():
         )
     player.randomize_traits()
     return player
+
+
+def play(browse_saves=True):
+    """Plays lives until the user doesn't want another one.
+
+    With browse_saves=False, only new lives can be played: the saves aren't
+    listed, loaded or deleted. The server does this, as every user shares them."""
+    session.browse_saves = browse_saves
+    while True:
+        clear_screen()
+        player = None
+        try:
+            player = start_menu()
+            if not open_life(player.ID):
+                player = None
+                print(_("That life is being played in another session."))
+                press_enter()
+                continue
+            player.print_traits()
+            print(_("Age {age}").format(age=player.age))
+            while True:
+                main_menu(player)
+                player.save_game()
+        except PlayerDied:
+            if not yes_no(_("Would you like to start a new life?")):
+                break
+        finally:
+            if player is not None:
+                close_life(player.ID)
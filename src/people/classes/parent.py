@@ -1,6 +1,4 @@
-from random import randint
-
-from src.lifesim_lib.lifesim_lib import random_name
+from src.lifesim_lib.lifesim_lib import random_name, DEFAULT_RNG
 from src.lifesim_lib.translation import _
 from src.people.classes.relationship import Relationship
 
@@ -8,13 +6,15 @@ from src.people.classes.relationship import Relationship
 class Parent(Relationship):
     """Base class for relationships."""
 
-    def __init__(self, lastname, age, gender):
-        happiness = randint(40, 100)
-        health = randint(30, 100)
-        smarts = randint(0, 50) + randint(0, 50)
-        looks = randint(0, 60) + randint(0, 40)
+    __slots__ = ("generosity", "money")
+
+    def __init__(self, lastname, age, gender, rng=DEFAULT_RNG):
+        happiness = rng.randint(40, 100)
+        health = rng.randint(30, 100)
+        smarts = rng.randint(0, 50) + rng.randint(0, 50)
+        looks = rng.randint(0, 60) + rng.randint(0, 40)
         super().__init__(
-            random_name(gender),
+            random_name(gender, rng),
             lastname,
             age,
             gender,
@@ -22,10 +22,11 @@ class Parent(Relationship):
             health,
             smarts,
             looks,
-            randint(90, 100),
+            rng.randint(90, 100),
+            rng,
         )
-        self.generosity = randint(0, 100)
-        self.money = randint(0, 50) + randint(0, 50)
+        self.generosity = rng.randint(0, 100)
+        self.money = rng.randint(0, 50) + rng.randint(0, 50)
 
     def name_accusative(self):
         return self.get_gender_word(_("father"), _("mother"))
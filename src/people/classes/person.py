@@ -1,13 +1,35 @@
-from random import randint
-
-from src.lifesim_lib.lifesim_lib import clamp
+from src.lifesim_lib.lifesim_lib import clamp, DEFAULT_RNG
+from src.lifesim_lib.mortality import dies
 
 
 class Person:
     """Base class for any character in the game."""
 
+    # Slots keep each character small enough to hold large families and NPC populations in memory
+    __slots__ = (
+        "firstname",
+        "lastname",
+        "age",
+        "gender",
+        "happiness",
+        "health",
+        "smarts",
+        "looks",
+        "alive",
+        "rng",
+    )
+
     def __init__(
-        self, firstname, lastname, age, gender, happiness, health, smarts, looks
+        self,
+        firstname,
+        lastname,
+        age,
+        gender,
+        happiness,
+        health,
+        smarts,
+        looks,
+        rng=DEFAULT_RNG,
     ):
         self.firstname = firstname
         self.lastname = lastname
@@ -18,20 +40,46 @@ class Person:
         self.smarts = smarts
         self.looks = looks
         self.alive = True
-        self.name = self.firstname + " " + self.lastname
+        self.rng = rng
+
+    @property
+    def name(self):
+        return self.firstname + " " + self.lastname
+
+    def get_state(self):
+        "Returns the character's attributes as a dict."
+        state = {}
+        for cls in type(self).__mro__:
+            for key in cls.__dict__.get("__slots__", ()):
+                state[key] = getattr(self, key)
+        state.update(getattr(self, "__dict__", {}))
+        return state
+
+    def to_data(self):
+        "Returns the character's attributes as plain data for the save format."
+        data = self.get_state()
+        data["type"] = type(self).__name__
+        data["gender"] = self.gender.value
+        return data
+
+    def __setstate__(self, state):
+        if isinstance(state, tuple):  # (__dict__, slots), as pickled by default
+            state = {**(state[0] or {}), **state[1]}
+        for key, value in state.items():
+            if key != "name":  # Stored by characters saved before name was a property
+                setattr(self, key, value)
 
     def age_up(self):
+        rng = self.rng
         self.age += 1
-        self.change_happiness(randint(-3, 3))
-        self.change_health(randint(-3, 3))
-        self.change_smarts(randint(-3, 3))
-        self.change_looks(randint(-3, 3))
+        self.change_happiness(rng.randint(-3, 3))
+        self.change_health(rng.randint(-3, 3))
+        self.change_smarts(rng.randint(-3, 3))
+        self.change_looks(rng.randint(-3, 3))
 
     def death_check(self):
-        return (self.age >= randint(95, 122)) or (
-            self.age > randint(70 + self.health // 12, 90 + self.health // 3)
-            and randint(1, 100) <= 65
-        )
+        "Whether the character dies this year (see mortality.py)."
+        return dies(self.age, self.health, self.rng)
 
     def change_happiness(self, amount):
         self.happiness = clamp(self.happiness + amount, 0, 100)
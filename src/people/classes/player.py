@@ -1,9 +1,23 @@
-import math, os, random, uuid, pickle
-from random import randint
+import hashlib, math, os, uuid
 
 from src.lifesim_lib.const import *
 from src.lifesim_lib.translation import _
 from src.lifesim_lib.lifesim_lib import *
+from src.lifesim_lib.frontend import TERMINAL
+from src.lifesim_lib.manifest import make_entry
+from src.lifesim_lib.profiler import phase
+from src.lifesim_lib.rules import load_rules
+from src.lifesim_lib.schedule import (
+    EVENTS,
+    MILESTONES,
+    STAGE_INDEX,
+    Schedule,
+    event,
+    milestone,
+)
+from src.lifesim_lib.save_format import encode
+from src.lifesim_lib.save_store import get_store
+from src.lifesim_lib.save_writer import SAVE_WRITER
 from src.people.classes.parent import Parent
 from src.people.classes.person import Person
 from src.people.classes.sibling import Sibling
@@ -12,48 +26,60 @@ from src.people.classes.sibling import Sibling
 class Player(Person):
     """Base class for the player."""
 
-    def __init__(self, first=None, last=None, gender=None):
-        gender = gender or Gender.random()
-        first = first or random_name(gender)
-        last = last or random.choice(LAST_NAMES)
-        happiness = randint(50, 100)
-        health = randint(75, 100)
-        smarts = randint(0, 50) + randint(0, 50)
-        looks = randint(0, 65) + randint(0, 35)
-        super().__init__(first, last, 0, gender, happiness, health, smarts, looks)
+    frontend = TERMINAL  # Replaced with a HeadlessFrontend for unattended lives
+
+    def __init__(self, first=None, last=None, gender=None, rng=None):
+        rng = rng or RNG()
+        gender = gender or Gender.random(rng)
+        first = first or random_name(gender, rng)
+        last = last or last_names().sample(rng)
+        happiness = rng.randint(50, 100)
+        health = rng.randint(75, 100)
+        smarts = rng.randint(0, 50) + rng.randint(0, 50)
+        looks = rng.randint(0, 65) + rng.randint(0, 35)
+        super().__init__(first, last, 0, gender, happiness, health, smarts, looks, rng)
         last1 = last2 = last
-        if randint(1, 100) <= 40:
-            newlast = random.choice(LAST_NAMES)
-            if random.randint(1, 3) == 1:
+        if rng.randint(1, 100) <= 40:
+            newlast = last_names().sample(rng)
+            if rng.randint(1, 3) == 1:
                 last2 = newlast  # Makes it more common to be named after the father's last name
             else:
                 last1 = newlast
         self.parents = {  # Cache these for performance since we only have one of each
             "Mother": Parent(
                 last1,
-                min(randint(randint(18, 20), 50) for _ in range(3)),
+                min(rng.randint(rng.randint(18, 20), 50) for _ in range(3)),
                 Gender.Female,
+                rng,
             ),
             "Father": Parent(
-                last2, min(randint(randint(18, 20), 68) for _ in range(3)), Gender.Male
+                last2,
+                min(rng.randint(rng.randint(18, 20), 68) for _ in range(3)),
+                Gender.Male,
+                rng,
             ),
         }
         diff = self.parents["Father"].generosity - self.parents["Mother"].generosity
-        if randint(1, 2) == 1:
+        if rng.randint(1, 2) == 1:
             if diff > 0:
-                self.parents["Mother"].generosity += randint(0, diff // 2)
+                self.parents["Mother"].generosity += rng.randint(0, diff // 2)
             elif diff < 0:
-                self.parents["Mother"].generosity -= randint(0, abs(diff) // 2)
+                self.parents["Mother"].generosity -= rng.randint(0, abs(diff) // 2)
         else:
             diff = -diff
             if diff > 0:
-                self.parents["Father"].generosity += randint(0, diff // 2)
+                self.parents["Father"].generosity += rng.randint(0, diff // 2)
             elif diff < 0:
-                self.parents["Father"].generosity -= randint(0, abs(diff) // 2)
+                self.parents["Father"].generosity -= rng.randint(0, abs(diff) // 2)
 
         self.relations = [self.parents["Mother"], self.parents["Father"]]
 
-        self.karma = randint(0, 25) + randint(0, 25) + randint(0, 25) + randint(0, 25)
+        self.karma = (
+            rng.randint(0, 25)
+            + rng.randint(0, 25)
+            + rng.randint(0, 25)
+            + rng.randint(0, 25)
+        )
         self.total_happiness = 0
         self.meditated = False
         self.worked_out = False
@@ -73,11 +99,33 @@ class Player(Person):
         self.lottery_jackpot = 0
         self.stress = 0
         self.performance = 0
-        self.traits = set()
+        self.traits = 0  # Mask of Trait bits
         self.illnesses = []
+        self.schedule = Schedule()  # Events to come; see schedule.py
 
         self.ID = str(uuid.uuid4())
-        self.save_path = SAVE_PATH + "/" + self.ID + ".pickle"
+        self.saved_digest = None
+
+    def generate_sibling(self):
+        """Randomly gives the player an older sibling. Returns the sibling, or None."""
+        rng = self.rng
+        mother = self.parents["Mother"]
+        father = self.parents["Father"]
+        sibling_age = rng.randint(2, 10)
+        if (
+            mother.age >= rng.randint(16, 20) + sibling_age
+            and father.age >= rng.randint(16, 18) + sibling_age
+            and rng.randint(1, 6) < 6
+        ):
+            whichlast = rng.choice((mother.lastname, father.lastname))
+            theirsmarts = round_stochastic((rng.randint(0, 100) + self.smarts) / 2, rng)
+            theirlooks = round_stochastic((rng.randint(0, 100) + self.looks) / 2, rng)
+            sibling = Sibling(
+                whichlast, sibling_age, Gender.random(rng), theirsmarts, theirlooks, rng
+            )
+            self.relations.append(sibling)
+            return sibling
+        return None
 
     def is_depressed(self):
         return (
@@ -85,57 +133,110 @@ class Player(Person):
         )  # TODO: Migrate depression to a list of diseases
 
     def randomize_traits(self):
-        self.traits.clear()
+        rng = self.rng
         total_traits = len(Trait.__members__)
         num_traits = 1
-        while randint(1, 100) <= 60 and num_traits < randint(1, total_traits):
+        while rng.randint(1, 100) <= 60 and num_traits < rng.randint(1, total_traits):
             num_traits += 1
-        all_traits = [t for t in Trait]
-        t = set()
-
-        for i in range(num_traits):
-            attempts = 50
-            while attempts > 0:
-                selected = random.choice(all_traits)
-                if not selected.roll_selection():
-                    continue
-                if len(t) < 1 or not any(selected.conflicts_with(trait) for trait in t):
-                    break
-                else:
-                    attempts -= 1
-            if attempts > 0:
-                t.add(selected)
-        self.traits = t
+        self.traits = random_traits(num_traits, rng)
 
     def print_traits(self):
         if self.traits:
             print()
             print(_("You have the following traits:"))
-            for trait in self.traits:
+            for trait in traits_of(self.traits):
                 print_colored(f"{trait.name_}: {trait.desc}", trait.get_color())
 
     @classmethod
-    def load(cls, d):
-        p = cls()
-        p.__dict__.update(d)
+    def load(cls, data):
+        "Makes a player from the plain data returned by load_save."
+        p = cls.__new__(cls)
+        p.load_data(data)
         return p
 
+    def get_state(self):
+        state = super().get_state()
+        state.pop("frontend", None)
+        state.pop("saved_digest", None)
+        # Lets the save list show names without building a Player
+        state["name"] = self.name
+        return state
+
+    def to_data(self):
+        data = super().to_data()
+        data["traits"] = sorted(trait.name for trait in traits_of(self.traits))
+        data["rng"] = self.rng.to_bytes()
+        data["relations"] = [relation.to_data() for relation in self.relations]
+        data["schedule"] = self.schedule.to_data()
+        return data
+
+    def load_data(self, data):
+        "Replaces the player's state with the plain data of a save."
+        rng = RNG.from_bytes(data["rng"]) if data["rng"] else RNG()
+        relations = []
+        for rel_data in data["relations"]:
+            rel_data = dict(rel_data)
+            cls = Parent if rel_data.pop("type") == "Parent" else Sibling
+            relation = cls.__new__(cls)
+            relation.__setstate__(
+                {**rel_data, "gender": Gender(rel_data["gender"]), "rng": rng}
+            )
+            relations.append(relation)
+        self.__setstate__(
+            {
+                **data,
+                "gender": Gender(data["gender"]),
+                "traits": trait_mask(Trait[name] for name in data["traits"]),
+                "rng": rng,
+                "relations": relations,
+                "schedule": Schedule.from_data(data["schedule"]),
+                "parents": {
+                    r.get_type(): r for r in relations if isinstance(r, Parent)
+                },
+            }
+        )
+        self.saved_digest = self.state_digest(encode(self.to_data()))
+
+    @staticmethod
+    def state_digest(data):
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def is_dirty(self):
+        "Whether the player or any relation changed since the last save or load."
+        return self.state_digest(encode(self.to_data())) != self.saved_digest
+
     def change_happiness(self, amount):
-        if amount != 0 and Trait.MOODY in self.traits:
-            amount = round_stochastic(amount * 1.5)
+        scale = HAPPINESS_SCALE[self.traits]
+        if amount != 0 and scale != 1:
+            amount = round_stochastic(amount * scale, self.rng)
         super().change_happiness(amount)
 
     def change_jackpot(self):
-        self.lottery_jackpot = round(randexpo(100000, 1000000))
-
-    def save_game(self):
-        if not os.path.exists(self.save_path):
-            open(self.save_path, "x")
-        pickle.dump(self.__dict__, open(self.save_path, "wb"))
+        self.lottery_jackpot = round(randexpo(100000, 1000000, self.rng))
+
+    def save_game(self, wait=False):
+        """Saves the game in the background; pass wait=True to block until it is on disk.
+
+        The state is encoded right away, so the player can keep changing while the
+        save is being written."""
+        # Comparing digests of the serialized state costs far less than rewriting
+        # an unchanged save, and adds nothing to the code that changes the state
+        state = self.to_data()
+        data = encode(state)
+        digest = self.state_digest(data)
+        if digest != self.saved_digest:
+            entry = make_entry(state)
+            SAVE_WRITER.submit(self.ID, lambda: get_store().put(entry, data))
+            self.saved_digest = digest
+        if wait:
+            SAVE_WRITER.flush(self.ID)
 
     def delete_save(self):
-        if os.path.exists(self.save_path):
-            os.remove(self.save_path)
+        if self.saved_digest is None:
+            return  # Never saved, so there's nothing to delete
+        ID = self.ID
+        SAVE_WRITER.submit(ID, lambda: get_store().delete(ID))
+        self.saved_digest = None
 
     def is_in_school(self):
         return self.grades is not None
@@ -157,7 +258,7 @@ class Player(Person):
 
     def get_traits_str(self):
         return ", ".join(
-            map(lambda t: get_colored(t.name_, t.get_color()), self.traits)
+            map(lambda t: get_colored(t.name_, t.get_color()), traits_of(self.traits))
         )
 
     def reset_already_did(self):
@@ -171,135 +272,180 @@ class Player(Person):
         self.worked_harder = False
         self.listened_to_music = False
 
+    @phase("age_up")
     def age_up(self):
         oldhappy = self.happiness
         self.total_happiness += self.happiness
+        self.age_stats()
+        self.age_relations()
+        self.frontend.message(self, _("Age {age}").format(age=self.age))
+        if self.check_death():
+            return
+        self.change_jackpot()
+        if self.has_job:
+            self.job_stress()
+        self.age_looks()
+        self.depression_onset()
+        self.relation_deaths()
+        self.random_events()
+        if self.has_job:
+            self.job_performance(oldhappy)
+
+    @phase("stats")
+    def age_stats(self):
+        rng = self.rng
         super().age_up()
-        if Trait.GRUMPY in self.traits and self.happiness > 33:
-            if randint(1, 12) == 1:
-                self.change_happiness(-randint(4, 8))
+        traits = self.traits
+        if traits & TraitBit.GRUMPY and self.happiness > 33:
+            if rng.randint(1, 12) == 1:
+                self.change_happiness(-rng.randint(4, 8))
             else:
-                self.change_happiness(-randint(0, 4))
-        if Trait.FAST_WORKER in self.traits:
-            self.change_performance(randint(0, 4))
-        elif Trait.SLOW_WORKER in self.traits:
-            self.change_performance(-randint(0, 4))
-        if Trait.LAZY in self.traits:
-            self.change_performance(-randint(1, 5))
-            self.change_stress(-randint(0, 4))
+                self.change_happiness(-rng.randint(0, 4))
+        if traits & TraitBit.FAST_WORKER:
+            self.change_performance(rng.randint(0, 4))
+        elif traits & TraitBit.SLOW_WORKER:
+            self.change_performance(-rng.randint(0, 4))
+        if traits & TraitBit.LAZY:
+            self.change_performance(-rng.randint(1, 5))
+            self.change_stress(-rng.randint(0, 4))
         self.reset_already_did()
-        self.change_karma(randint(-2, 2))
+        self.change_karma(rng.randint(-2, 2))
 
+    @phase("relations")
+    def age_relations(self):
+        rng = self.rng
         for relation in self.relations:
             relation.age_up()
             if isinstance(relation, Parent):
                 if self.age < 18:
                     relation.change_relationship(1)
                 else:
-                    relation.change_relationship(random.choice((-1, -1, 0)))
+                    relation.change_relationship(rng.choice((-1, -1, 0)))
 
-        print(_("Age {age}").format(age=self.age))
+    @phase("death_check")
+    def check_death(self):
+        "Whether the player died of old age this year."
         if self.death_check():
             self.die(_("You died of old age."))
-            return
-        self.change_jackpot()
-        if self.has_job:
-            self.change_stress(randint(-4, 4))
-            base = 65 - self.happiness * 0.3
-            diff = base - self.stress
-            if diff > 0:
-                self.change_stress(randint(0, round_stochastic(diff / 6)))
-            elif diff < 0:
-                self.change_stress(-randint(0, round_stochastic(abs(diff) / 10)))
-        if self.age == 13:
-            val = 0
-            if randint(1, 4) == 1:
-                val = randint(0, 1)
-            else:
-                val = min(randint(0, 12) for _ in range(4))
-            self.teen_looks_inc = val
-        if self.age >= 13 and self.age < randint(18, 24):
+            return True
+        return False
+
+    @phase("job_stress")
+    def job_stress(self):
+        rng = self.rng
+        self.change_stress(rng.randint(-4, 4))
+        base = 65 - self.happiness * 0.3
+        diff = base - self.stress
+        if diff > 0:
+            self.change_stress(rng.randint(0, round_stochastic(diff / 6, rng)))
+        elif diff < 0:
+            self.change_stress(-rng.randint(0, round_stochastic(abs(diff) / 10, rng)))
+
+    @phase("looks")
+    def age_looks(self):
+        rng = self.rng
+        self.run_events("looks")
+        if self.age >= 13 and self.age < rng.randint(18, 24):
             self.change_looks(self.teen_looks_inc)
-        if self.age > 50 and self.looks > randint(20, 25):
+        if self.age > 50 and self.looks > rng.randint(20, 25):
             decay = min((self.age - 51) // 5 + 1, 4)
-            self.change_looks(-randint(0, decay))
-        if self.happiness < randint(1, 10) and not self.is_depressed():
-            display_event(_("You are suffering from depression."))
-            self.add_illness("Depression")
-            self.change_happiness(-50)
-            self.change_health(-randint(4, 8))
+            self.change_looks(-rng.randint(0, decay))
+
+    @milestone(13, "looks")
+    def start_growing_up(self):
+        "Picks how much the player's looks go up each year as a teenager."
+        rng = self.rng
+        val = 0
+        if rng.randint(1, 4) == 1:
+            val = rng.randint(0, 1)
+        else:
+            val = min(rng.randint(0, 12) for _ in range(4))
+        self.teen_looks_inc = val
+
+    @phase("depression_onset")
+    def depression_onset(self):
+        self.run_rules("onset")
+
+    @phase("relation_deaths")
+    def relation_deaths(self):
+        rng = self.rng
         for relation in self.relations[:]:
             if relation.death_check():
                 rel_str = relation.name_accusative()
-                display_event(
+                self.frontend.event(
+                    self,
                     _(
                         "Your {relative} died at the age of {age} due to old age."
-                    ).format(relative=rel_str, age=relation.age)
+                    ).format(relative=rel_str, age=relation.age),
                 )
                 inheritance = 0
-                happy_remove = randint(40, 55)
+                happy_remove = rng.randint(40, 55)
                 if isinstance(relation, Parent):
-                    if randint(1, 100) <= 70 and randint(1, 100) <= relation.generosity:
-                        avg = 100000 * (relation.money / 100) ** 2
-                        lo = max(avg * relation.generosity / 200, 1)
-                        inheritance = round_stochastic(randexpo(lo, avg))
+                    inheritance = self.inheritance(relation)
                     del self.parents[relation.get_type()]
                 elif isinstance(relation, Sibling):
-                    happy_remove = randint(25, 40)
+                    happy_remove = rng.randint(25, 40)
                 self.change_happiness(-happy_remove)
                 self.relations.remove(relation)
                 if inheritance > 0:
-                    display_event(
-                        _("You inherited ${amount}").format(amount=inheritance)
+                    self.frontend.event(
+                        self, _("You inherited ${amount}").format(amount=inheritance)
                     )
                     self.money += inheritance
                     self.change_happiness(
-                        round_stochastic(1.5 * math.log10(inheritance))
+                        round_stochastic(1.5 * math.log10(inheritance), rng)
                     )
-        self.random_events()
-        if self.has_job:
-            happy_change = (
-                self.happiness - oldhappy
-            )  # Large decreases in happiness can increase stress
-            if happy_change > 0:
-                diff = max(happy_change - 5, 0)
-                diff /= 2
-            else:
-                diff = min(happy_change + 5, 0)
-            diff = -round_stochastic(diff / 4)
-            self.change_stress(diff)
-            self.change_performance(
-                randint(-4, 4) + round_stochastic((50 - self.stress) / 20)
+
+    @phase("inheritance")
+    def inheritance(self, parent):
+        "What a parent who died leaves the player, often nothing."
+        rng = self.rng
+        if rng.randint(1, 100) <= 70 and rng.randint(1, 100) <= parent.generosity:
+            avg = 100000 * (parent.money / 100) ** 2
+            lo = max(avg * parent.generosity / 200, 1)
+            if lo < avg:  # A parent with next to no money leaves nothing
+                return round_stochastic(randexpo(lo, avg, rng), rng)
+        return 0
+
+    @phase("job_performance")
+    def job_performance(self, oldhappy):
+        "How the year went at work: stress, performance, getting fired and its toll on health."
+        rng = self.rng
+        happy_change = (
+            self.happiness - oldhappy
+        )  # Large decreases in happiness can increase stress
+        if happy_change > 0:
+            diff = max(happy_change - 5, 0)
+            diff /= 2
+        else:
+            diff = min(happy_change + 5, 0)
+        diff = -round_stochastic(diff / 4, rng)
+        self.change_stress(diff)
+        self.change_performance(
+            rng.randint(-4, 4) + round_stochastic((50 - self.stress) / 20, rng)
+        )
+        if self.performance < 15 and rng.randint(1, self.performance + 1) == 1:
+            self.frontend.event(
+                self, _("You have been fired from your job.\nReason: Performance")
             )
-            if self.performance < 15 and randint(1, self.performance + 1) == 1:
-                display_event(
-                    _("You have been fired from your job.\nReason: Performance")
-                )
-                self.lose_job()
-                self.change_happiness(-randint(20, 35))
-            if self.stress > 65:
-                amount = randint(0, round_stochastic((self.stress - 65) / 5))
-                self.change_happiness(-amount)
-                critical_stress = self.stress > 85
-                if critical_stress:
-                    self.change_health(round_stochastic((self.stress - 80) / 4))
-                if amount > 0 and randint(1, 5 - critical_stress) == 1:
-                    if critical_stress:
-                        print(
-                            _(
-                                "You feel like you're on the verge of burnout from so much work!"
-                            )
-                        )
-                    else:
-                        print(_("You're feeling stressed out from all of this work."))
-                if (
-                    critical_stress
-                    and "High Blood Pressure" not in self.illnesses
-                    and randint(1, 7) == 1
-                ):
-                    display_event(_("You are suffering from high blood pressure."))
-                    self.change_health(-randint(4, 8))
-                    self.add_illness("High Blood Pressure")
+            self.lose_job()
+            self.change_happiness(-rng.randint(20, 35))
+        self.run_rules("work")
+
+    @phase("school_grades")
+    def school_grades(self):
+        "Grades drift towards what the player's smarts would earn, and up or down with happiness."
+        rng = self.rng
+        self.change_grades(rng.randint(-3, 3))
+        base = round(10 * math.sqrt(self.smarts))
+        if self.grades < base - 2:
+            self.change_grades(rng.randint(1, 3))
+        elif self.grades > base + 2:
+            self.change_grades(-rng.randint(1, 3))
+        grade_delta = (self.happiness - 50) / 10
+        if grade_delta > 0:
+            grade_delta /= 2
+        self.change_grades(round_stochastic(grade_delta, rng))
 
     def get_job(self, salary):
         if not self.has_job:
@@ -326,19 +472,23 @@ class Player(Person):
             self.performance = clamp(self.performance + amount, 0, 100)
 
     def calc_grades(self, offset):
-        self.grades = clamp(round(10 * math.sqrt(self.smarts + offset)), 0, 100)
+        self.grades = clamp(round(10 * math.sqrt(max(self.smarts + offset, 0))), 0, 100)
 
     def get_gender_str(self):
         return _("Male") if self.gender == Gender.Male else _("Female")
 
+    def lifetime_happiness(self):
+        return round(self.total_happiness / max(self.age, 1))
+
     def die(self, message):
-        print(message)
-        avg_happy = round(self.total_happiness / self.age)
+        self.alive = False
+        self.cause_of_death = message
+        avg_happy = self.lifetime_happiness()
         score = self.happiness * 0.3 + avg_happy * 0.7
-        print_align_bars((_("Lifetime Happiness"), avg_happy), (_("Karma"), self.karma))
+        self.frontend.death(self, message, avg_happy)
         self.delete_save()
-        press_enter()
-        raise PlayerDied
+        SAVE_WRITER.flush(self.ID)
+        raise PlayerDied(message)
 
     def display_stats(self):
         if self.happiness >= 60:
@@ -376,193 +526,226 @@ class Player(Person):
             show_percent=True,
         )
 
+    @phase("random_events")
     def random_events(self):
-        if self.age >= 5 and randint(1, 5000) == 1:
-            print(_("You were struck by lightning!"))
-            good_or_bad = (
-                randint(1, 2) == 1
-            )  # TODO: Should I make the chance for it to be good or bad based on your karma?
-            if good_or_bad:
-                self.change_happiness(100)
-                self.change_health(100)
-                self.change_smarts(100)
-                self.change_looks(100)
-            else:
-                self.change_happiness(-100)
-                self.change_health(-100)
-                self.change_smarts(-100)
-                self.change_looks(-100)
-            self.display_stats()
-            press_enter()
-            if not good_or_bad and randint(1, 5) == 1:
-                self.die(_("You died after being struck by lightning."))
+        rng = self.rng
+        self.run_rules("events")
         if self.has_job:
             self.years_worked += 1
         if self.salary > 0:
             tax = calculate_tax(self.salary)
             income = self.salary - tax
-            income *= random.uniform(0.4, 0.8)  # Expenses
-            self.money += round_stochastic(income)
-        if self.uv_years > 0:
-            self.uv_years -= 1
-            if self.uv_years == 0:
-                self.grades = None
-                display_event(_("You graduated from university."))
-                self.change_happiness(randint(14, 20))
-                self.change_smarts(randint(10, 15))
-                if self.chose_student_loan:
-                    self.student_loan = randint(20000, 40000)
-                    print(_("You now have to start paying back your student loan"))
-            else:
-                if self.grades < randint(10, 45):
-                    display_event(
-                        _("You were expelled from university after earning bad grades.")
-                    )
-                    self.change_happiness(-randint(30, 50))
-        if self.student_loan > 0:
-            amount = min(randint(1000, 3000) for _ in range(3))
-            amount = min(amount, self.student_loan)
-            self.money -= amount
-            self.student_loan -= amount
-            if self.student_loan == 0:
-                print(_("You've fully paid off your student loan"))
+            income *= rng.uniform(0.4, 0.8)  # Expenses
+            self.money += round_stochastic(income, rng)
+        self.run_events("university")
+        self.run_events("loans")
         for illness in self.illnesses[:]:
-            if illness == "Depression":
-                if self.happiness >= randint(20, 35):
-                    display_event(_("You are no longer suffering from depression"))
-                    self.change_happiness((100 - self.happiness) // 2)
-                    self.change_health(randint(4, 8))
-                    self.remove_illness("Depression")
-                else:
-                    self.change_happiness(-randint(1, 2))
-                    self.change_health(-randint(1, 4))
-            elif illness == "High Blood Pressure":
-                self.change_health(-randint(1, 5))
-                if self.stress > randint(80, 95) and self.health < randint(1, 10):
-                    if randint(1, 3) == 1:
-                        self.die(_("You died due to a massive heart attack."))
-                elif self.stress < randint(25, 60) and randint(1, 2) == 1:
-                    display_event(
-                        _("You are no longer suffering from high blood pressure")
-                    )
-                    self.change_happiness(randint(4, 8))
-                    self.change_health(randint(4, 8))
-                    self.remove_illness("High Blood Pressure")
-        if self.age == 2 and randint(1, 2) == 1:
-            print(
-                _("Your mother is taking to to the doctor's office to get vaccinated.")
-            )
-            print(_("How will you behave?"))
-            choices = [_("Try to stay calm"), _("Throw a tantrum"), _("Bite her")]
-            choice = choice_input(*choices)
-            clear_screen()
-            if choice == 1:
-                print(_("You remained calm"))
-            elif choice == 2:
-                self.change_happiness(-randint(25, 35))
-                self.parents["Mother"].change_relationship(-randint(6, 10))
-                print(_("You threw a tantrum"))
-            elif choice == 3:
-                self.change_happiness(-randint(6, 10))
-                self.parents["Mother"].change_relationship(-randint(25, 35))
-                print(_("You bit your mother"))
+            for rule in load_rules().illnesses.get(illness, ()):
+                rule.run(self)
+        self.run_events("childhood")
         if self.is_in_school():
-            self.change_grades(randint(-3, 3))
-            base = round(10 * math.sqrt(self.smarts))
-            if self.grades < base - 2:
-                self.change_grades(randint(1, 3))
-            elif self.grades > base + 2:
-                self.change_grades(-randint(1, 3))
-            grade_delta = (self.happiness - 50) / 10
-            if grade_delta > 0:
-                grade_delta /= 2
-            self.change_grades(round_stochastic(grade_delta))
-        if self.age == 6:
-            print(_("You are starting elementary school"))
-            self.change_smarts(randint(1, 2))
-            self.calc_grades(randint(4, 8))
-        if self.age == 12:
-            print(_("You are starting middle school"))
-            self.change_smarts(randint(1, 3))
-            self.calc_grades(randint(0, 8))
-        if self.age == 14:
-            print(_("You are starting high school"))
-            self.change_smarts(randint(1, 4))
-            self.calc_grades(randint(-8, 8))
-        if self.age == 17 and not self.dropped_out:
+            self.school_grades()
+        self.run_events("school")
+
+    def run_rules(self, hook):
+        "Runs the rules of assets/rules.json at this hook of the year (see rules.py)."
+        for rule in load_rules().hooks[hook]:
+            rule.run(self)
+
+    def run_events(self, stage):
+        "Runs the milestones of the player's age and the scheduled events due in this stage of the year."
+        stage = STAGE_INDEX[stage]
+        for func in MILESTONES.get((self.age, stage), ()):
+            func(self)
+        for name in self.schedule.pop_due(self.age, stage):
+            EVENTS[name][1](self)
+
+    @event("university_year", "university")
+    def university_year(self):
+        if self.uv_years == 0:
+            return  # Dropped out
+        rng = self.rng
+        self.uv_years -= 1
+        if self.uv_years == 0:
             self.grades = None
-            print(_("You graduated from high school."))
-            self.change_happiness(randint(15, 20))
-            self.change_smarts(randint(6, 10))
-            print()
-            self.display_stats()
-            print()
-            print(_("Would you like to apply to university?"))
-            choice = choice_input(_("Yes"), _("No"))
-            clear_screen()
-            if choice == 1:
-                if self.smarts >= random.randint(28, 44):
-                    print(_("Your application to university was accepted!"))
-                    self.change_happiness(randint(7, 9))
-                    SCHOLARSHIP = _("Scholarship")
-                    LOAN = _("Student Loan")
-                    PARENTS = _("Ask parents to pay")
-                    choices = [SCHOLARSHIP, LOAN, PARENTS]
-                    chosen = False
-                    while not chosen:
-                        print(_("How would you like to pay for your college tuition?"))
-                        choice = choice_input(*choices, return_text=True)
-                        clear_screen()
-                        if choice == SCHOLARSHIP:
-                            if self.smarts >= randint(randint(75, 85), 100):
-                                display_event(
-                                    _("Your scholarship application has been awarded!")
-                                )
-                                self.change_happiness(
-                                    randint(10, 15)
-                                    + (10 * (Trait.CHEERFUL in self.traits))
-                                )
-                                chosen = True
-                            else:
-                                display_event(
-                                    _("Your scholarship application was rejected.")
-                                )
-                                self.change_happiness(-randint(7, 9))
-                                choices.remove(SCHOLARSHIP)
-                        elif choice == PARENTS:
-                            total = sum(p.generosity for p in self.parents.values())
-                            avg = total / len(self.parents)
-                            chance = (avg / 100) ** 4
-                            if random.random() < chance:
-                                display_event(
-                                    _(
-                                        "Your parents agreed to pay for your university tuition!"
-                                    )
-                                )
-                                self.change_happiness(
-                                    randint(7, 9)
-                                    + (7 * (Trait.CHEERFUL in self.traits))
-                                )
-                                chosen = True
-                            else:
-                                display_event(
-                                    _(
-                                        "Your parents refused to pay for your university tuition."
-                                    )
-                                )
-                                self.change_happiness(-randint(7, 9))
-                                choices.remove(PARENTS)
+            self.frontend.event(self, _("You graduated from university."))
+            self.change_happiness(rng.randint(14, 20))
+            self.change_smarts(rng.randint(10, 15))
+            if self.chose_student_loan:
+                self.student_loan = rng.randint(20000, 40000)
+                self.frontend.message(
+                    self, _("You now have to start paying back your student loan")
+                )
+                self.schedule.add(self.age, "loan_payment")  # The first is due now
+        else:
+            if self.grades < rng.randint(10, 45):
+                self.frontend.event(
+                    self,
+                    _("You were expelled from university after earning bad grades."),
+                )
+                self.change_happiness(-rng.randint(30, 50))
+            self.schedule.add(self.age + 1, "university_year")
+
+    @event("loan_payment", "loans")
+    def pay_student_loan(self):
+        if self.student_loan == 0:
+            return
+        rng = self.rng
+        amount = min(rng.randint(1000, 3000) for _ in range(3))
+        amount = min(amount, self.student_loan)
+        self.money -= amount
+        self.student_loan -= amount
+        if self.student_loan == 0:
+            self.frontend.message(self, _("You've fully paid off your student loan"))
+        else:
+            self.schedule.add(self.age + 1, "loan_payment")
+
+    @milestone(2, "childhood")
+    def vaccination(self):
+        rng = self.rng
+        if rng.randint(1, 2) != 1:
+            return
+        self.frontend.message(
+            self,
+            _("Your mother is taking to to the doctor's office to get vaccinated."),
+        )
+        choice = self.frontend.choose(
+            self,
+            "vaccination",
+            _("How will you behave?"),
+            [
+                ("calm", _("Try to stay calm")),
+                ("tantrum", _("Throw a tantrum")),
+                ("bite", _("Bite her")),
+            ],
+        )
+        if choice == "calm":
+            self.frontend.message(self, _("You remained calm"))
+        elif choice == "tantrum":
+            self.change_happiness(-rng.randint(25, 35))
+            self.parents["Mother"].change_relationship(-rng.randint(6, 10))
+            self.frontend.message(self, _("You threw a tantrum"))
+        elif choice == "bite":
+            self.change_happiness(-rng.randint(6, 10))
+            self.parents["Mother"].change_relationship(-rng.randint(25, 35))
+            self.frontend.message(self, _("You bit your mother"))
+
+    @milestone(6, "school")
+    def start_elementary_school(self):
+        rng = self.rng
+        self.frontend.message(self, _("You are starting elementary school"))
+        self.change_smarts(rng.randint(1, 2))
+        self.calc_grades(rng.randint(4, 8))
+
+    @milestone(12, "school")
+    def start_middle_school(self):
+        rng = self.rng
+        self.frontend.message(self, _("You are starting middle school"))
+        self.change_smarts(rng.randint(1, 3))
+        self.calc_grades(rng.randint(0, 8))
+
+    @milestone(14, "school")
+    def start_high_school(self):
+        rng = self.rng
+        self.frontend.message(self, _("You are starting high school"))
+        self.change_smarts(rng.randint(1, 4))
+        self.calc_grades(rng.randint(-8, 8))
+
+    @milestone(17, "school")
+    def finish_high_school(self):
+        if self.dropped_out:
+            return
+        rng = self.rng
+        self.grades = None
+        self.frontend.message(self, _("You graduated from high school."))
+        self.change_happiness(rng.randint(15, 20))
+        self.change_smarts(rng.randint(6, 10))
+        self.frontend.message(self, "")
+        self.frontend.show_stats(self)
+        self.frontend.message(self, "")
+        choice = self.frontend.choose(
+            self,
+            "apply_university",
+            _("Would you like to apply to university?"),
+            [("yes", _("Yes")), ("no", _("No"))],
+        )
+        if choice == "yes":
+            if self.smarts >= rng.randint(28, 44):
+                self.frontend.message(
+                    self, _("Your application to university was accepted!")
+                )
+                self.change_happiness(rng.randint(7, 9))
+                choices = [
+                    ("scholarship", _("Scholarship")),
+                    ("loan", _("Student Loan")),
+                    ("parents", _("Ask parents to pay")),
+                ]
+                chosen = False
+                while not chosen:
+                    choice = self.frontend.choose(
+                        self,
+                        "tuition",
+                        _("How would you like to pay for your college tuition?"),
+                        choices,
+                    )
+                    if choice == "scholarship":
+                        if self.smarts >= rng.randint(rng.randint(75, 85), 100):
+                            self.frontend.event(
+                                self,
+                                _("Your scholarship application has been awarded!"),
+                            )
+                            self.change_happiness(
+                                rng.randint(10, 15)
+                                + (10 * bool(self.traits & TraitBit.CHEERFUL))
+                            )
+                            chosen = True
                         else:
-                            display_event(
+                            self.frontend.event(
+                                self,
+                                _("Your scholarship application was rejected."),
+                            )
+                            self.change_happiness(-rng.randint(7, 9))
+                            choices = [c for c in choices if c[0] != choice]
+                    elif choice == "parents":
+                        total = sum(p.generosity for p in self.parents.values())
+                        avg = total / len(self.parents)
+                        chance = (avg / 100) ** 4
+                        if rng.random() < chance:
+                            self.frontend.event(
+                                self,
                                 _(
-                                    "You took out a student loan to pay for your university tuition."
-                                )
+                                    "Your parents agreed to pay for your university tuition!"
+                                ),
+                            )
+                            self.change_happiness(
+                                rng.randint(7, 9)
+                                + (7 * bool(self.traits & TraitBit.CHEERFUL))
                             )
                             chosen = True
-                            self.chose_student_loan = True
-                    print(_("You are now enrolled in university."))
-                    self.uv_years = 4
-                    self.calc_grades(randint(-8, 10))
-                else:
-                    display_event(_("Your application to university was rejected."))
-                    self.change_happiness(-randint(7, 9))
+                        else:
+                            self.frontend.event(
+                                self,
+                                _(
+                                    "Your parents refused to pay for your university tuition."
+                                ),
+                            )
+                            self.change_happiness(-rng.randint(7, 9))
+                            choices = [c for c in choices if c[0] != choice]
+                    else:
+                        self.frontend.event(
+                            self,
+                            _(
+                                "You took out a student loan to pay for your university tuition."
+                            ),
+                        )
+                        chosen = True
+                        self.chose_student_loan = True
+                self.frontend.message(self, _("You are now enrolled in university."))
+                self.uv_years = 4
+                self.calc_grades(rng.randint(-8, 10))
+                self.schedule.add(self.age + 1, "university_year")
+            else:
+                self.frontend.event(
+                    self, _("Your application to university was rejected.")
+                )
+                self.change_happiness(-rng.randint(7, 9))
@@ -1,6 +1,4 @@
-from random import randint
-
-from src.lifesim_lib.lifesim_lib import clamp, Gender
+from src.lifesim_lib.lifesim_lib import clamp, Gender, DEFAULT_RNG
 from src.people.classes.person import Person
 
 _ = lambda s: s
@@ -9,10 +7,24 @@ _ = lambda s: s
 class Relationship(Person):
     """Base class for relationships."""
 
+    __slots__ = ("relationship", "spent_time", "had_conversation", "was_complimented")
+
     def __init__(
-        self, first, last, age, gender, happiness, health, smarts, looks, relationship
+        self,
+        first,
+        last,
+        age,
+        gender,
+        happiness,
+        health,
+        smarts,
+        looks,
+        relationship,
+        rng=DEFAULT_RNG,
     ):
-        super().__init__(first, last, age, gender, happiness, health, smarts, looks)
+        super().__init__(
+            first, last, age, gender, happiness, health, smarts, looks, rng
+        )
         self.relationship = relationship
         self.spent_time = False
         self.had_conversation = False
@@ -43,7 +55,7 @@ class Relationship(Person):
 
     def age_up(self):
         super().age_up()
-        self.change_relationship(randint(-4, 4))
+        self.change_relationship(self.rng.randint(-4, 4))
         self.spent_time = False
         self.had_conversation = False
         self.was_complimented = False
@@ -1,6 +1,4 @@
-from random import randint
-
-from src.lifesim_lib.lifesim_lib import random_name
+from src.lifesim_lib.lifesim_lib import random_name, DEFAULT_RNG
 from src.lifesim_lib.translation import _
 from src.people.classes.relationship import Relationship
 
@@ -8,11 +6,13 @@ from src.people.classes.relationship import Relationship
 class Sibling(Relationship):
     """Base class for siblings."""
 
-    def __init__(self, lastname, age, gender, smarts, looks):
-        happiness = randint(40, 80)
-        health = randint(60, 100)
+    __slots__ = ("petulance",)
+
+    def __init__(self, lastname, age, gender, smarts, looks, rng=DEFAULT_RNG):
+        happiness = rng.randint(40, 80)
+        health = rng.randint(60, 100)
         super().__init__(
-            random_name(gender),
+            random_name(gender, rng),
             lastname,
             age,
             gender,
@@ -20,9 +20,10 @@ class Sibling(Relationship):
             health,
             smarts,
             looks,
-            randint(35, 80),
+            rng.randint(35, 80),
+            rng,
         )
-        self.petulance = randint(0, 100)
+        self.petulance = rng.randint(0, 100)
 
     def name_accusative(self):
         return self.get_gender_word(_("brother"), _("sister")) + ", " + self.firstname
@@ -0,0 +1,5 @@
+import os, sys, tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# const.py reads this on import; keep the tests' saves out of the checkout
+os.environ.setdefault("LIFESIM_SAVE_PATH", tempfile.mkdtemp(prefix="lifesim-tests-"))
@@ -0,0 +1,118 @@
+import pytest
+
+import src.menus.main  # Registers the actions
+from src.engine.headless import new_random_life
+from src.lifesim_lib.const import DEBUG
+from src.lifesim_lib.translation import set_language
+from src.menus.actions import ACTIONS, MENUS, available_actions, perform
+
+
+@pytest.fixture(autouse=True)
+def english():
+    set_language("en")
+
+
+# The menus as they were built inline before the action registry
+
+
+def old_main(player):
+    choices = ["Age +1", "Relationships", "Activities"]
+    if player.is_in_school():
+        choices.append("School")
+    elif player.age >= 18:
+        if player.has_job:
+            choices.append("Job Menu")
+        else:
+            choices.append("Find a Job")
+    choices.append("View Saved Games")
+    if DEBUG:
+        choices.append("Debug Menu")
+    return choices
+
+
+def old_relationship(player, relation):
+    choices = []
+    if relation.age >= 5:
+        if player.age >= 3:
+            choices.append("Spend time")
+            choices.append("Have a conversation")
+        if player.age >= 6:
+            choices.append("Compliment")
+            choices.append("Insult")
+    return choices
+
+
+def old_activities(player):
+    choices = []
+    if 3 <= player.age < 13:
+        choices.append("Play with your toys")
+    if player.age >= 4:
+        choices.append("Doctor")
+    if player.age >= 5:
+        choices.append("Arts and Crafts")
+    if player.age >= 13:
+        choices.append("Meditate")
+        choices.append("Library")
+        choices.append("Gym")
+        choices.append("Listen to music")
+    if player.age >= 18:
+        choices.append("Lottery")
+    choices.append("Surrender")
+    return choices
+
+
+def old_job(player):
+    choices = ["Work Harder"]
+    if player.years_worked >= 10 and player.age >= 65:
+        choices.append("Retire")
+    else:
+        choices.append("Quit Job")
+    return choices
+
+
+def labels(menu_ID, player, *args):
+    return [action.text() for action in MENUS[menu_ID].available(player, *args)]
+
+
+def states():
+    player = new_random_life()
+    for age in range(0, 101):
+        for grades in (None, 50):
+            for has_job in (False, True):
+                for years_worked in (0, 10):
+                    player.age = age
+                    player.grades = grades
+                    player.has_job = has_job
+                    player.years_worked = years_worked
+                    yield player
+
+
+def test_menus_match_the_old_inline_menus():
+    for player in states():
+        assert labels("main", player) == old_main(player)
+        assert labels("activities", player) == old_activities(player)
+        assert labels("school", player) == ["Study harder", "Drop out"]
+        assert labels("job", player) == old_job(player)
+        relation = player.relations[0]
+        for relation_age in range(0, 8):
+            relation.age = relation_age
+            assert labels("relationship", player, relation) == old_relationship(
+                player, relation
+            )
+
+
+def test_action_IDs_are_unique_and_namespaced():
+    for ID, action in ACTIONS.items():
+        assert action.ID == ID
+        assert ID.split(".")[0] in MENUS
+    for menu in MENUS.values():
+        for action in menu.actions:
+            assert ACTIONS[action.ID] is action
+
+
+def test_perform_checks_availability():
+    player = new_random_life()
+    player.age = 2
+    assert "activities.lottery" not in available_actions(player, "activities")
+    with pytest.raises(ValueError):
+        perform(player, "activities.lottery")
@@ -0,0 +1,48 @@
+import pytest
+
+from src.engine.api import API, APIError
+from src.lifesim_lib.lifesim_lib import load_save
+from src.lifesim_lib.save_writer import SAVE_WRITER
+from src.lifesim_lib.translation import set_language
+
+set_language("en")
+
+
+@pytest.fixture
+def api():
+    return API()
+
+
+def test_menu_only_actions_are_not_offered(api):
+    ID = api.create({})["ID"]
+    listed = [ID for IDs in api.actions(ID)["actions"].values() for ID in IDs]
+    assert "main.age_up" in listed
+    assert "main.saves" not in listed and "main.debug" not in listed
+    for action_ID in ("main.saves", "main.debug", "debug.stats"):
+        with pytest.raises(APIError) as e:
+            api.perform(ID, action_ID, {"input": ["1", "2", "1"]})
+        assert e.value.status == 404
+
+
+def test_action_cannot_switch_lives(api):
+    a = api.create({})
+    b = api.create({})
+    SAVE_WRITER.flush()
+    with api.player(a["ID"]) as player:
+        with pytest.raises(APIError) as e:
+            api.run(player, {}, lambda: player.load_data(load_save(b["ID"])))
+    assert e.value.status == 409
+    assert api.state(a["ID"])["name"] == a["name"]
+    assert api.state(b["ID"])["name"] == b["name"]
+
+
+def test_unfinished_action_is_not_kept(api):
+    ID = api.create({})["ID"]
+    with api.player(ID) as player:
+        player.age = 18
+        player.money = 100
+        player.save_game()
+    with pytest.raises(APIError) as e:
+        api.perform(ID, "activities.lottery", {"input": ["1"]})
+    assert e.value.status == 409
+    assert api.state(ID)["money"] == 100
@@ -0,0 +1,46 @@
+import builtins
+
+import pytest
+
+from src.engine.headless import new_random_life, simulate_life
+from src.lifesim_lib.frontend import FixedPolicy
+
+CHOICES = {
+    "vaccination": ["calm"],
+    "apply_university": ["yes"],
+    "tuition": ["parents", "loan"],
+}
+
+
+@pytest.fixture
+def no_terminal(monkeypatch):
+    def refuse(*args):
+        raise AssertionError("a headless life asked for input")
+
+    monkeypatch.setattr(builtins, "input", refuse)
+
+
+def test_life_runs_to_death_without_input(no_terminal, capsys):
+    for _ in range(20):
+        events = []
+        player = simulate_life(policy=FixedPolicy(CHOICES), sink=events.append)
+        assert not player.alive
+        assert events[-1].kind == "death"
+        assert [event.age for event in events] == sorted(event.age for event in events)
+    assert capsys.readouterr().out == ""
+
+
+def test_fixed_policy_makes_the_decisions(no_terminal):
+    for _ in range(50):
+        events = []
+        simulate_life(policy=FixedPolicy(CHOICES), sink=events.append)
+        for event in events:
+            if event.kind == "decision":
+                decision, key = event.text.split("=")
+                if decision in CHOICES:
+                    assert key in CHOICES[decision]
+
+
+def test_max_age_stops_a_life(no_terminal):
+    player = simulate_life(new_random_life(), policy=FixedPolicy(CHOICES), max_age=10)
+    assert player.age == 10 or not player.alive
@@ -0,0 +1,24 @@
+from src.engine.montecarlo import run_chunk, run_lives, split, worker_seed
+from src.lifesim_lib.frontend import FixedPolicy
+
+POLICY = FixedPolicy({"apply_university": ["yes"], "tuition": ["loan"]})
+
+
+def test_same_seed_same_lives():
+    first = run_lives(40, workers=2, seed=7, policy=POLICY)
+    assert len(first) == 40
+    assert run_lives(40, workers=2, seed=7, policy=POLICY) == first
+    assert run_lives(40, workers=2, seed=8, policy=POLICY) != first
+
+
+def test_workers_replay_their_chunk():
+    lives = run_lives(30, workers=3, seed=11, policy=POLICY)
+    start = 0
+    for i, n in enumerate(split(30, 3)):
+        assert run_chunk(worker_seed(11, i), n, POLICY) == lives[start : start + n]
+        start += n
+
+
+def test_split():
+    assert split(10, 3) == [4, 3, 3]
+    assert split(2, 4) == [1, 1, 0, 0]
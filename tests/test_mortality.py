@@ -0,0 +1,72 @@
+import math
+
+import pytest
+
+from src.lifesim_lib import mortality
+from src.lifesim_lib.rng import RNG, get_numpy
+
+MAX_Z = 4.5
+
+
+def sampled_death(age, health, rng):
+    "Person.death_check as it was before the mortality table."
+    return (age >= rng.randint(95, 122)) or (
+        age > rng.randint(70 + health // 12, 90 + health // 3)
+        and rng.randint(1, 100) <= 65
+    )
+
+
+def counted_death(age, health):
+    "The exact chance of sampled_death, counting its outcomes."
+    old_ages = range(95, 123)
+    frail_ages = range(70 + health // 12, 90 + health // 3 + 1)
+    deaths = 0
+    for old_age in old_ages:
+        if age >= old_age:
+            deaths += len(frail_ages) * 100
+            continue
+        for frail_age in frail_ages:
+            if age > frail_age:
+                deaths += 65
+    return deaths / (len(old_ages) * len(frail_ages) * 100)
+
+
+def z_score(deaths, trials, chance):
+    if chance in (0, 1):
+        return 0 if deaths == chance * trials else math.inf
+    return (deaths - chance * trials) / math.sqrt(trials * chance * (1 - chance))
+
+
+def test_table_matches_counted_chances():
+    for age in range(0, 130):
+        for health in range(mortality.MAX_HEALTH + 1):
+            assert mortality.death_chance(age, health) == pytest.approx(
+                counted_death(age, health), abs=1e-12
+            )
+
+
+def test_dies_matches_old_draws():
+    rng = RNG(1)
+    trials = 4000
+    for age in range(60, 126, 5):
+        for health in range(0, mortality.MAX_HEALTH + 1, 25):
+            chance = mortality.death_chance(age, health)
+            old = sum(sampled_death(age, health, rng) for _ in range(trials))
+            new = sum(mortality.dies(age, health, rng) for _ in range(trials))
+            assert abs(z_score(old, trials, chance)) <= MAX_Z, (age, health)
+            assert abs(z_score(new, trials, chance)) <= MAX_Z, (age, health)
+
+
+def test_death_mask_matches_table():
+    np = get_numpy()
+    if np is None:
+        pytest.skip("NumPy isn't installed")
+    generator = np.random.default_rng(3)
+    trials = 20000
+    for age, health in ((71, 0), (85, 50), (100, 100), (121, 30)):
+        ages = np.full(trials, age)
+        healths = np.full(trials, health)
+        deaths = int(mortality.death_mask(ages, healths, generator).sum())
+        assert (
+            abs(z_score(deaths, trials, mortality.death_chance(age, health))) <= MAX_Z
+        )
@@ -0,0 +1,57 @@
+import os, struct
+
+from src.lifesim_lib import names
+
+LISTS = {
+    "male": (["Adam", "Bo", "Émile"], None),
+    "female": (["Ann", "Zoë", "Eve", "Ida"], [4.0, 1.0, 2.5, 0.5]),
+    "last": (["Smith"], None),
+}
+
+
+def contents(lists):
+    return {
+        kind: (
+            [names[i] for i in range(len(names))],
+            list(names.prob) if names.weighted else None,
+            list(names.alias) if names.weighted else None,
+        )
+        for kind, names in lists.items()
+    }
+
+
+def test_numbers_are_little_endian(monkeypatch):
+    data = names.build_corpus(LISTS)
+    in_place = contents(names.parse_corpus(memoryview(data)))
+    monkeypatch.setattr(names, "IN_PLACE", False)
+    assert contents(names.parse_corpus(memoryview(data))) == in_place
+    for kind, (listed, weights) in LISTS.items():
+        assert in_place[kind][0] == listed
+    female = names.parse_corpus(memoryview(data))["female"]
+    offsets_pos, prob_pos, alias_pos = female.positions
+    assert list(female.prob) == list(struct.unpack_from("<4d", data, prob_pos))
+    assert list(female.alias) == list(struct.unpack_from("<4I", data, alias_pos))
+
+
+def write_name_files(directory, lists):
+    for kind, (listed, weights) in lists.items():
+        with open(f"{directory}/{kind}_names.txt", "w", encoding="utf-8") as f:
+            for i, name in enumerate(listed):
+                f.write(name if weights is None else f"{name}\t{weights[i]}")
+                f.write("\n")
+
+
+def test_stale_corpus_is_not_used(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(names, "ASSETS_PATH", str(tmp_path))
+    write_name_files(tmp_path, LISTS)
+    names.write_corpus()
+    built = os.path.getmtime(tmp_path / names.CORPUS_NAME)
+    assert not names.is_stale(str(tmp_path / names.CORPUS_NAME))
+    assert names.load_corpus.__wrapped__()["male"][2] == "Émile"
+
+    write_name_files(tmp_path, {"male": (["Carl"], None)})
+    os.utime(tmp_path / "male_names.txt", (built + 10, built + 10))
+    assert names.is_stale(str(tmp_path / names.CORPUS_NAME))
+    lists = names.load_corpus.__wrapped__()
+    assert [lists["male"][i] for i in range(len(lists["male"]))] == ["Carl"]
+    assert "older than the name files" in capsys.readouterr().err
@@ -0,0 +1,79 @@
+import pickle, random
+
+import pytest
+
+from src.engine.headless import new_random_life, simulate_life
+from src.lifesim_lib.frontend import FixedPolicy
+from src.lifesim_lib.rng import DEFAULT_RNG, RNG
+
+POLICY = FixedPolicy({"vaccination": ["calm"], "apply_university": ["no"]})
+
+
+def draws(rng, n):
+    return [rng.random() for _ in range(n)]
+
+
+def test_same_seed_same_draws():
+    a, b = RNG(5), RNG(5)
+    assert draws(a, 3000) == draws(b, 3000)
+    assert [a.randint(1, 6) for _ in range(100)] == [
+        b.randint(1, 6) for _ in range(100)
+    ]
+    assert draws(RNG(6), 10) != draws(RNG(5), 10)
+
+
+def test_restored_stream_continues_past_the_dropped_pool():
+    rng = RNG(5, pool_size=16)
+    seen = draws(rng, 20)
+    restored = pickle.loads(pickle.dumps(rng))
+    assert restored.seed == 5
+    # The rest of the second pool isn't saved, so the restored RNG starts on the third
+    expected = draws(RNG(5, pool_size=16), 48)[32:]
+    assert draws(restored, 16) == expected
+    assert not set(expected) & set(seen)
+
+
+def test_default_rng_stays_shared():
+    assert pickle.loads(pickle.dumps(DEFAULT_RNG)) is DEFAULT_RNG
+
+
+def age(player, years):
+    random.seed(0)  # Policies fall back to the random module
+    return simulate_life(player, policy=POLICY, max_age=player.age + years)
+
+
+def snapshot(player):
+    return (
+        player.alive,
+        player.age,
+        player.happiness,
+        player.health,
+        player.smarts,
+        player.looks,
+        player.money,
+        [(r.name, r.age, r.relationship) for r in player.relations],
+    )
+
+
+def test_same_seed_same_life():
+    a = age(new_random_life(RNG(3)), 30)
+    b = age(new_random_life(RNG(3)), 30)
+    assert snapshot(a) == snapshot(b)
+
+
+def test_restored_life_shares_one_stream():
+    player = age(new_random_life(RNG(9)), 8)
+    data = pickle.dumps(player)
+    first, second = pickle.loads(data), pickle.loads(data)
+    for relation in first.relations:
+        assert relation.rng is first.rng
+    assert snapshot(age(first, 30)) == snapshot(age(second, 30))
+
+
+def test_randint_range():
+    rng = RNG(2)
+    with pytest.raises(ValueError):
+        rng.randint(5, 4)
+    assert draws(rng, 5) == draws(RNG(2), 5)  # The failed call drew nothing
+    assert {rng.randint(3, 3) for _ in range(20)} == {3}
+    assert {rng.randint(1, 3) for _ in range(200)} == {1, 2, 3}
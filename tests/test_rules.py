@@ -0,0 +1,217 @@
+import math, random
+
+import numpy as np
+
+from src.engine.headless import new_random_life
+from src.engine.population import Population
+from src.lifesim_lib.frontend import HeadlessFrontend
+from src.lifesim_lib.lifesim_lib import PlayerDied, round_stochastic
+from src.lifesim_lib.rng import RNG
+from src.lifesim_lib.rules import load_rules
+from src.lifesim_lib.translation import _, set_language
+
+
+class RecordingRNG(RNG):
+    """Logs every draw, and makes draws with long odds (like lightning's 1 in 5000) come up."""
+
+    def __init__(self, seed):
+        super().__init__(seed)
+        self.calls = []
+
+    def randint(self, a, b):
+        value = a if b - a >= 999 else super().randint(a, b)
+        self.calls.append(("randint", a, b, value))
+        return value
+
+    def random(self):
+        value = super().random()
+        self.calls.append(("random", value))
+        return value
+
+
+# The code the rules replaced, as it was written inline in Player
+
+
+def old_onset(self):
+    rng = self.rng
+    if self.happiness < rng.randint(1, 10) and not self.is_depressed():
+        self.frontend.event(self, _("You are suffering from depression."))
+        self.add_illness("Depression")
+        self.change_happiness(-50)
+        self.change_health(-rng.randint(4, 8))
+
+
+def old_work(self):
+    rng = self.rng
+    if self.stress > 65:
+        amount = rng.randint(0, round_stochastic((self.stress - 65) / 5, rng))
+        self.change_happiness(-amount)
+        critical_stress = self.stress > 85
+        if critical_stress:
+            self.change_health(round_stochastic((self.stress - 80) / 4, rng))
+        if amount > 0 and rng.randint(1, 5 - critical_stress) == 1:
+            if critical_stress:
+                self.frontend.message(
+                    self,
+                    _(
+                        "You feel like you're on the verge of burnout from so much work!"
+                    ),
+                )
+            else:
+                self.frontend.message(
+                    self, _("You're feeling stressed out from all of this work.")
+                )
+        if (
+            critical_stress
+            and "High Blood Pressure" not in self.illnesses
+            and rng.randint(1, 7) == 1
+        ):
+            self.frontend.event(self, _("You are suffering from high blood pressure."))
+            self.change_health(-rng.randint(4, 8))
+            self.add_illness("High Blood Pressure")
+
+
+def old_events(self):
+    rng = self.rng
+    if self.age >= 5 and rng.randint(1, 5000) == 1:
+        self.frontend.message(self, _("You were struck by lightning!"))
+        good_or_bad = rng.randint(1, 2) == 1
+        if good_or_bad:
+            self.change_happiness(100)
+            self.change_health(100)
+            self.change_smarts(100)
+            self.change_looks(100)
+        else:
+            self.change_happiness(-100)
+            self.change_health(-100)
+            self.change_smarts(-100)
+            self.change_looks(-100)
+        self.frontend.show_stats(self)
+        self.frontend.pause(self)
+        if not good_or_bad and rng.randint(1, 5) == 1:
+            self.die(_("You died after being struck by lightning."))
+
+
+def old_illnesses(self):
+    rng = self.rng
+    for illness in self.illnesses[:]:
+        if illness == "Depression":
+            if self.happiness >= rng.randint(20, 35):
+                self.frontend.event(
+                    self, _("You are no longer suffering from depression")
+                )
+                self.change_happiness((100 - self.happiness) // 2)
+                self.change_health(rng.randint(4, 8))
+                self.remove_illness("Depression")
+            else:
+                self.change_happiness(-rng.randint(1, 2))
+                self.change_health(-rng.randint(1, 4))
+        elif illness == "High Blood Pressure":
+            self.change_health(-rng.randint(1, 5))
+            if self.stress > rng.randint(80, 95) and self.health < rng.randint(1, 10):
+                if rng.randint(1, 3) == 1:
+                    self.die(_("You died due to a massive heart attack."))
+            elif self.stress < rng.randint(25, 60) and rng.randint(1, 2) == 1:
+                self.frontend.event(
+                    self, _("You are no longer suffering from high blood pressure")
+                )
+                self.change_happiness(rng.randint(4, 8))
+                self.change_health(rng.randint(4, 8))
+                self.remove_illness("High Blood Pressure")
+
+
+def new_hook(hook):
+    def run(player):
+        for rule in load_rules().hooks[hook]:
+            rule.run(player)
+
+    return run
+
+
+def new_illnesses(player):
+    for illness in player.illnesses[:]:
+        for rule in load_rules().illnesses.get(illness, ()):
+            rule.run(player)
+
+
+PAIRS = [
+    (old_onset, new_hook("onset")),
+    (old_events, new_hook("events")),
+    (old_illnesses, new_illnesses),
+    (old_work, new_hook("work")),
+]
+
+
+def make_player(seed):
+    "A life in a random state; the same seed gives the same life."
+    player = new_random_life(RecordingRNG(seed))
+    state = random.Random(seed)
+    player.age = state.randint(0, 90)
+    for stat in ("happiness", "health", "smarts", "looks"):
+        setattr(player, stat, state.choice([0, 3, 8, 20, 30, 50, 100]))
+    player.stress = state.randint(50, 100)
+    player.illnesses = state.sample(
+        ["Depression", "High Blood Pressure"], state.randint(0, 2)
+    )
+    player.calls = []
+    player.frontend = HeadlessFrontend(player.calls.append)
+    return player
+
+
+def outcome(func, player):
+    try:
+        func(player)
+    except PlayerDied:
+        pass
+    return (
+        player.alive,
+        player.happiness,
+        player.health,
+        player.smarts,
+        player.looks,
+        player.illnesses,
+        player.calls,
+        player.rng.calls,
+    )
+
+
+def test_rules_draw_what_the_old_code_drew():
+    set_language("en")
+    for seed in range(400):
+        for old, new in PAIRS:
+            assert outcome(new, make_player(seed)) == outcome(old, make_player(seed))
+
+
+def z_score(hits, n, p):
+    return (hits - n * p) / math.sqrt(n * p * (1 - p))
+
+
+def test_batch_rules_agree():
+    n = 20000
+    pop = Population(n, seed=1)
+    pop.age[:] = 30
+    pop.happiness[:] = 5
+    pop.health[:] = 50
+    pop.run_rules("onset")
+    depressed = pop.illness("Depression")
+    assert abs(z_score(depressed.sum(), n, 0.5)) < 5  # happiness 5 < randint(1, 10)
+    assert (pop.happiness[depressed] == 0).all()
+    assert (pop.happiness[~depressed] == 5).all()
+    assert ((pop.health[depressed] >= 42) & (pop.health[depressed] <= 46)).all()
+
+    pop = Population(n, seed=2)
+    pop.age[:] = 30
+    pop.happiness[:] = 30
+    pop.health[:] = 50
+    pop.set_illness("Depression", np.ones(n, dtype=bool), True)
+    for rule in load_rules().illnesses["Depression"]:
+        rule.batch(pop)
+    recovered = ~pop.illness("Depression")
+    assert abs(z_score(recovered.sum(), n, 11 / 16)) < 5  # 30 >= randint(20, 35)
+    assert (pop.happiness[recovered] == 65).all()
+
+
+def test_rules_a_population_cant_run_are_reported():
+    pop = Population(10, seed=3)
+    assert pop.run_rules("work") == ["burnout"]
+    assert "high_blood_pressure" in pop.run_rules("illness")
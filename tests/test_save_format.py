@@ -0,0 +1,70 @@
+import os, pickle, shutil
+
+import pytest
+
+from src.lifesim_lib import manifest
+from src.lifesim_lib.save_format import SaveFormatError, decode, encode
+from src.people.classes.player import Player
+
+DATA = os.path.dirname(__file__) + "/data"
+# Written by the baseline commit: relations pickled before characters had an rng slot
+BASELINE_SAVE = DATA + "/baseline_v1.pickle"
+BASELINE_ID = "b63836a6-72cf-4cc2-bc4c-462232beb781"
+# Written before the binary format: characters share an RNG with a pickled NumPy Generator
+RNG_SAVE = DATA + "/rng_v1.pickle"
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_baseline_pickle_migrates():
+    data = decode(read(BASELINE_SAVE))
+    assert data["ID"] == BASELINE_ID
+    assert data["firstname"] == "Derick" and data["age"] == 25
+    kinds = [r["type"] for r in data["relations"]]
+    assert kinds == ["Parent", "Parent", "Sibling"]
+    assert data["relations"][2]["petulance"] is not None
+    player = Player.load(data)
+    assert [r.rng for r in player.relations] == [player.rng] * 3
+    player.age_up()
+    assert decode(encode(player.to_data()))["age"] == 26
+
+
+def test_list_saves_skips_unreadable(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(manifest, "SAVE_PATH", str(tmp_path))
+    shutil.copy(BASELINE_SAVE, tmp_path / (BASELINE_ID + ".pickle"))
+    (tmp_path / "broken.pickle").write_bytes(b"not a save")
+    entries = manifest.list_saves()
+    assert [e["ID"] for e in entries] == [BASELINE_ID]
+    assert "broken" in capsys.readouterr().err
+
+
+def test_rng_pickle_migrates():
+    data = decode(read(RNG_SAVE))
+    assert data["rng"] is not None
+    player = Player.load(data)
+    assert [r.rng for r in player.relations] == [player.rng] * len(player.relations)
+
+
+class Exploit:
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+
+    def __reduce__(self):
+        return self.func, self.args
+
+
+def test_pickles_cant_call_other_globals(tmp_path):
+    victim = tmp_path / "victim"
+    victim.write_text("")
+    for payload in (
+        Exploit(os.remove, str(victim)),
+        Exploit(eval, "print('hi')"),
+        {"relations": [Exploit(shutil.rmtree, str(tmp_path))]},
+    ):
+        with pytest.raises(SaveFormatError):
+            decode(pickle.dumps(payload))
+    assert victim.exists()
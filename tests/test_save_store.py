@@ -0,0 +1,56 @@
+import pytest
+
+from src.lifesim_lib import manifest, save_store
+from src.lifesim_lib.save_store import SaveStore
+
+
+class MemoryStore(SaveStore):
+    def __init__(self):
+        self.saves = {}
+
+    def list_ids(self):
+        return list(self.saves)
+
+    def list_entries(self):
+        return [entry for entry, data in self.saves.values()]
+
+    def load(self, ID):
+        return self.saves[ID][1]
+
+    def put(self, entry, data):
+        self.saves[entry["ID"]] = (entry, data)
+
+
+def test_backend_missing_a_method_cannot_be_created():
+    with pytest.raises(TypeError, match="delete"):
+        MemoryStore()
+
+
+def test_complete_backend():
+    class CompleteStore(MemoryStore):
+        def delete(self, ID):
+            del self.saves[ID]
+
+    store = CompleteStore()
+    store.put_many([({"ID": "a"}, b"1"), ({"ID": "b"}, b"2")])
+    store.delete("a")
+    assert store.list_ids() == ["b"] and store.load("b") == b"2"
+
+
+def test_file_store_creates_save_path(tmp_path, monkeypatch):
+    path = tmp_path / "missing"
+    monkeypatch.setattr(save_store, "SAVE_PATH", str(path))
+    monkeypatch.setattr(manifest, "SAVE_PATH", str(path))
+    store = save_store.FileSaveStore()
+    store.put(
+        {
+            "ID": "a",
+            "name": "A B",
+            "age": 1,
+            "alive": True,
+            "money": 0,
+            "modified": None,
+        },
+        b"1",
+    )
+    assert store.load("a") == b"1"
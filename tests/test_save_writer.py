@@ -0,0 +1,59 @@
+import pytest
+
+from src.lifesim_lib.save_writer import SaveWriter
+
+
+class Disk:
+    "A job target that fails while full."
+
+    def __init__(self):
+        self.full = False
+        self.written = []
+
+    def job(self, name):
+        def write():
+            if self.full:
+                raise OSError("No space left on device")
+            self.written.append(name)
+
+        return write
+
+
+def test_failures_are_reported_to_their_own_id(capsys):
+    disk = Disk()
+    writer = SaveWriter()
+    disk.full = True
+    writer.submit("a", disk.job("a1"))
+    writer.flush()
+    assert "Saving a failed" in capsys.readouterr().err
+    disk.full = False
+    writer.submit("b", disk.job("b1"))
+    assert writer.flush("b")  # a's failure isn't b's
+    assert sorted(disk.written) == ["a1", "b1"]  # Tried again, not dropped
+    writer.flush("a")
+
+
+def test_failed_job_is_kept_until_written():
+    disk = Disk()
+    writer = SaveWriter()
+    disk.full = True
+    writer.submit("a", disk.job("a1"))
+    with pytest.raises(OSError):
+        writer.flush("a")
+    with pytest.raises(OSError):
+        writer.flush("a")
+    disk.full = False
+    writer.flush("a")
+    assert disk.written == ["a1"]
+
+
+def test_newer_job_replaces_failed_one():
+    disk = Disk()
+    writer = SaveWriter()
+    disk.full = True
+    writer.submit("a", disk.job("a1"))
+    writer.flush()
+    disk.full = False
+    writer.submit("a", disk.job("a2"))
+    writer.flush("a")
+    assert disk.written == ["a2"]
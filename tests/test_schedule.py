@@ -0,0 +1,110 @@
+import pickle
+
+from src.engine.headless import new_random_life
+from src.lifesim_lib.frontend import FixedPolicy, HeadlessFrontend
+from src.lifesim_lib.lifesim_lib import PlayerDied
+from src.lifesim_lib.rng import RNG
+from src.lifesim_lib.schedule import Schedule
+from src.lifesim_lib.translation import _, set_language
+
+POLICY = FixedPolicy({"apply_university": ["yes"], "tuition": ["loan"]})
+
+
+def old_university_and_loans(self):
+    "The university and student loan part of a year as it was written inline in age_up."
+    rng = self.rng
+    if self.uv_years > 0:
+        self.uv_years -= 1
+        if self.uv_years == 0:
+            self.grades = None
+            self.frontend.event(self, _("You graduated from university."))
+            self.change_happiness(rng.randint(14, 20))
+            self.change_smarts(rng.randint(10, 15))
+            if self.chose_student_loan:
+                self.student_loan = rng.randint(20000, 40000)
+                self.frontend.message(
+                    self, _("You now have to start paying back your student loan")
+                )
+        else:
+            if self.grades < rng.randint(10, 45):
+                self.frontend.event(
+                    self,
+                    _("You were expelled from university after earning bad grades."),
+                )
+                self.change_happiness(-rng.randint(30, 50))
+    if self.student_loan > 0:
+        amount = min(rng.randint(1000, 3000) for _ in range(3))
+        amount = min(amount, self.student_loan)
+        self.money -= amount
+        self.student_loan -= amount
+        if self.student_loan == 0:
+            self.frontend.message(self, _("You've fully paid off your student loan"))
+
+
+def enrolled(seed, grades, loan):
+    player = new_random_life(RNG(seed))
+    player.age = 17
+    player.grades = grades
+    player.uv_years = 4
+    player.chose_student_loan = loan
+    player.schedule.add(18, "university_year")
+    return player
+
+
+def state(player):
+    return (
+        player.uv_years,
+        player.grades,
+        player.student_loan,
+        player.money,
+        player.happiness,
+        player.smarts,
+    )
+
+
+def test_schedule_matches_the_old_inline_code():
+    set_language("en")
+    for seed in range(40):
+        player = enrolled(seed, grades=seed * 2, loan=seed % 3 != 0)
+        data = pickle.dumps(player)
+        old, new = pickle.loads(data), pickle.loads(data)
+        old_events, new_events = [], []
+        old.frontend = HeadlessFrontend(old_events.append)
+        new.frontend = HeadlessFrontend(new_events.append)
+        for age in range(18, 50):
+            old.age = new.age = age
+            old_university_and_loans(old)
+            new.run_events("university")
+            new.run_events("loans")
+            assert state(new) == state(old)
+            assert new.rng.random() == old.rng.random()
+        assert new_events == old_events
+        assert new.student_loan == 0 and len(new.schedule) == 0
+
+
+def test_due_events_match_the_life():
+    for seed in range(60):
+        player = new_random_life(RNG(seed))
+        player.frontend = HeadlessFrontend(None, POLICY)
+        try:
+            while True:
+                player.age_up()
+                due = set(player.schedule.to_data())
+                next_year = player.age + 1
+                assert (player.uv_years > 0) == (f"{next_year}:university_year" in due)
+                assert (player.student_loan > 0) == (f"{next_year}:loan_payment" in due)
+        except PlayerDied:
+            pass
+
+
+def test_schedule_order_and_round_trip():
+    schedule = Schedule()
+    schedule.add(20, "loan_payment")
+    schedule.add(20, "university_year")
+    schedule.add(19, "loan_payment")
+    assert list(schedule.pop_due(18, 99)) == []
+    data = schedule.to_data()
+    assert data == ["19:loan_payment", "20:university_year", "20:loan_payment"]
+    assert Schedule.from_data(data).to_data() == data
+    assert list(schedule.pop_due(20, 1)) == ["loan_payment", "university_year"]
+    assert list(schedule.pop_due(20, 2)) == ["loan_payment"]
@@ -0,0 +1,17 @@
+import pytest
+
+from src.engine import sessions
+from src.engine.sessions import SessionCache
+from src.lifesim_lib.save_format import SaveFormatError
+
+
+def test_failed_load_leaves_no_placeholder(monkeypatch):
+    def corrupt(ID):
+        raise SaveFormatError("Corrupt save")
+
+    monkeypatch.setattr(sessions, "load_save", corrupt)
+    cache = SessionCache(max_entries=1)
+    with pytest.raises(SaveFormatError):
+        with cache.use("0000"):
+            pass
+    assert len(cache) == 0 and cache.bytes == 0
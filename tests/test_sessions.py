@@ -0,0 +1,54 @@
+import pytest
+
+from src.engine.api import Transcript
+from src.lifesim_lib.lifesim_lib import close_life, open_life, session
+from src.lifesim_lib.screen import use_screen
+from src.lifesim_lib.translation import set_language
+from src.menus.start import start_menu
+from src.people.classes.player import Player
+
+set_language("en")
+
+
+@pytest.fixture
+def saved_life():
+    player = Player()
+    player.save_game(wait=True)
+    yield player
+    close_life(player.ID)
+
+
+@pytest.fixture
+def answers():
+    "Answers the game's questions with the lines given to the returned function."
+
+    def answer(*lines):
+        use_screen(Transcript(lines))
+
+    yield answer
+    use_screen(None)
+    session.browse_saves = True
+
+
+def test_open_life_is_not_offered(saved_life, answers, capsys):
+    other = Player()
+    other.save_game(wait=True)
+    assert open_life(saved_life.ID)
+    assert not open_life(saved_life.ID)
+    answers("1", "1")  # Load Game, then the first life listed
+    assert start_menu().ID != saved_life.ID
+    listed = capsys.readouterr().out
+    assert other.name in listed and saved_life.name not in listed
+
+
+def test_loading_a_closed_life(saved_life, answers):
+    answers("1", "1")
+    player = start_menu()
+    assert player.ID == saved_life.ID
+
+
+def test_saves_hidden_without_save_browser(saved_life, answers):
+    session.browse_saves = False
+    answers("1")
+    player = start_menu()
+    assert player.ID != saved_life.ID
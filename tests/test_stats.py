@@ -0,0 +1,36 @@
+from collections import Counter
+
+from src.engine.headless import new_random_life
+from src.engine.stats import track_life
+from src.lifesim_lib.frontend import FixedPolicy
+from src.lifesim_lib.rng import RNG
+
+POLICY = FixedPolicy(
+    {"apply_university": ["yes"], "tuition": ["scholarship", "parents", "loan"]}
+)
+
+
+def test_university_outcomes():
+    outcomes = Counter(
+        track_life(new_random_life(RNG(seed)), POLICY).university for seed in range(200)
+    )
+    assert outcomes["graduated"] > 0 and outcomes["none"] > 0
+    assert set(outcomes) <= {"none", "enrolled", "graduated"}
+
+
+def test_high_school_drop_out_doesnt_count_for_university():
+    player = new_random_life(RNG(1))
+    player.age = 21
+    player.health = 100
+    player.grades = 80
+    player.uv_years = 1
+    player.schedule.add(22, "university_year")
+    player.dropped_out = True  # Left over from high school
+    record = track_life(player, POLICY)
+    assert record.age > 22
+    assert record.university == "graduated"
+
+    player = new_random_life(RNG(2))
+    player.age = 20
+    player.dropped_out = True
+    assert track_life(player, POLICY).university == "none"
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from src.lifesim_lib.const import SALARY_TAX_BRACKETS
+from src.lifesim_lib.lifesim_lib import calculate_tax
+from src.lifesim_lib.rng import get_numpy
+from src.lifesim_lib.tax import TaxRegime, load_regimes
+
+
+def walked_tax(salary, brackets=SALARY_TAX_BRACKETS):
+    "calculate_tax as it was before the tax engine."
+    tax = 0
+    prev = 0
+    for i in range(len(brackets) - 1):
+        bound, perc = brackets[i]
+        if salary <= bound:
+            tax += (salary - prev) * perc
+            break
+        else:
+            tax += (bound - prev) * perc
+        prev = bound
+    else:
+        tax += (salary - prev) * brackets[-1]
+    return round(tax)
+
+
+def salaries(brackets, step=1):
+    "Every step-th whole salary up to twice the top bound, every bound and its neighbours, and a sample of others."
+    top = brackets[-2][0] * 2 if len(brackets) > 1 else 10**6
+    bounds = [bound for bound, rate in brackets[:-1]]
+    near = [b + d for b in bounds for d in (-1, -0.5, -1e-9, 0, 1e-9, 0.5, 1)]
+    rng = random.Random(1)
+    extra = [rng.uniform(0, top) for _ in range(2000)]
+    extra += [rng.randint(top, 10**9) for _ in range(2000)]
+    return list(range(0, top + 1, step)) + near + extra
+
+
+def test_calculate_tax_matches_walking_the_brackets():
+    values = salaries(SALARY_TAX_BRACKETS)
+    assert [calculate_tax(s) for s in values] == [walked_tax(s) for s in values]
+
+
+@pytest.mark.parametrize("name", sorted(load_regimes()))
+def test_regimes_match_walking_their_brackets(name):
+    regime = load_regimes()[name]
+    brackets = [[b, r] for b, r in zip(regime.bounds, regime.rates)] + regime.rates[-1:]
+    values = salaries(brackets, step=31)
+    expected = [walked_tax(s, brackets) for s in values]
+    assert [regime.tax(s) for s in values] == expected
+    np = get_numpy()
+    if np is not None:
+        assert regime.taxes(np.array(values)).tolist() == expected
+
+
+def test_array_matches_walking_the_brackets():
+    np = get_numpy()
+    if np is None:
+        pytest.skip("NumPy isn't installed")
+    values = salaries(SALARY_TAX_BRACKETS)
+    taxes = TaxRegime("default", SALARY_TAX_BRACKETS).taxes(np.array(values))
+    assert taxes.tolist() == [walked_tax(s) for s in values]
@@ -0,0 +1,81 @@
+from itertools import combinations
+
+from src.engine.headless import new_random_life
+from src.lifesim_lib.lifesim_lib import (
+    HAPPINESS_SCALE,
+    TRAIT_COMBINATIONS,
+    Trait,
+    TraitBit,
+    mask_conflicts,
+    random_traits,
+    trait_mask,
+    traits_of,
+)
+from src.lifesim_lib.rng import RNG
+
+
+def listed_conflict(a, b):
+    return a.name in b.conflicts or b.name in a.conflicts
+
+
+def largest_combination():
+    return max(
+        size
+        for size in range(len(Trait) + 1)
+        for traits in combinations(Trait, size)
+        if not any(listed_conflict(a, b) for a, b in combinations(traits, 2))
+    )
+
+
+def test_conflicts_apply_both_ways():
+    for a in Trait:
+        for b in Trait:
+            assert a.conflicts_with(b) == listed_conflict(a, b) == b.conflicts_with(a)
+    assert Trait.LAZY.conflicts_with(Trait.FAST_WORKER)
+    assert Trait.FAST_WORKER.conflicts_with(Trait.LAZY)
+    assert not Trait.LAZY.conflicts_with(Trait.SLOW_WORKER)
+
+
+def test_masks():
+    for mask in range(1 << len(Trait)):
+        assert trait_mask(traits_of(mask)) == mask
+        traits = traits_of(mask)
+        assert mask_conflicts(mask) == any(
+            listed_conflict(a, b) for a, b in combinations(traits, 2)
+        )
+    assert TraitBit.MOODY == Trait.MOODY.bit
+
+
+def test_random_traits_never_conflict():
+    largest = largest_combination()
+    assert len(TRAIT_COMBINATIONS) == largest + 1
+    rng = RNG(1)
+    for count in range(len(Trait) + 2):
+        seen = set()
+        for _ in range(500):
+            mask = random_traits(count, rng)
+            assert not mask_conflicts(mask)
+            assert bin(mask).count("1") == min(count, largest)
+            seen.add(mask)
+        assert seen == set(TRAIT_COMBINATIONS[min(count, largest)][0])
+
+
+def test_happiness_scale():
+    for mask in range(1 << len(Trait)):
+        assert HAPPINESS_SCALE[mask] == (1.5 if mask & Trait.MOODY.bit else 1)
+
+
+def test_change_happiness():
+    player = new_random_life(RNG(4))
+    player.traits = trait_mask([Trait.CHEERFUL, Trait.NERD])
+    player.happiness = 50
+    player.change_happiness(7)
+    assert player.happiness == 57
+    player.traits |= Trait.MOODY.bit
+    for _ in range(100):
+        player.happiness = 50
+        player.change_happiness(7)  # 7 * 1.5 = 10.5
+        assert player.happiness in (60, 61)
+        player.happiness = 50
+        player.change_happiness(-4)
+        assert player.happiness == 44